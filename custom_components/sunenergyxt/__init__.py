@@ -4,34 +4,107 @@ SunEnergyXT 500 Series integration for Home Assistant.
 This module handles the setup and configuration of the SunEnergyXT integration,
 including device connection testing, coordinator initialization, and platform setup.
 
+Only what every setup needs is imported eagerly. Optional features are imported
+when a config entry enables them, and Home Assistant imports the platform
+modules when the entry is forwarded to them.
+
 Modules:
+- api: Implements the Home Assistant independent device client
 - const: Contains constant definitions for the integration
 - coordinator: Handles data updates from the SunEnergyXT device
 - sensor: Implements sensor entities
 - number: Implements number entities
+- limits: Contains the parameter metadata and per-model limits
 - button: Implements button entities
 - switch: Implements switch entities
 - text: Implements text entities
+- diagnostics: Provides config entry diagnostics
+- zero_export: Implements the zero-export control loop
+- profiles: Implements the settings profile store
+- services: Registers the integration services
+- scheduler: Implements the setpoint timeline scheduler
+- optimizer: Implements the time-of-use dispatch optimiser
+- export: Implements the raw sample export sink
+- metrics: Implements the Prometheus metrics endpoint
+- analytics: Derives battery pack, PV string and time-to-full/empty values
+- anomaly: Detects PV strings and battery packs deviating from their siblings
+- backfill: Backfills energy statistics across outages
+- stats_import: Imports statistics aggregated from every sample (optional)
+- history: Keeps a compact full-resolution sample history on disk (optional)
+- resolver: Resolves device host names when a device moved to a new address
+- reconciler: Reconciles the desired settings with the reported ones
 """
 
 from __future__ import annotations
 
 import logging
-from http import HTTPStatus
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any
 
-import aiohttp
-import async_timeout
 from homeassistant.const import Platform
 from homeassistant.exceptions import ConfigEntryNotReady
 from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
 
-from .const import DOMAIN
+from .analytics import BatteryEstimator, PackAnalytics
+from .anomaly import AnomalyDetector
+from .api import SunEnergyXTClient
+from .backfill import EnergyBackfill
+from .const import (
+    CONF_ALIGNED_POLLING,
+    CONF_EXPORT_ENABLED,
+    CONF_EXPORT_KEEP,
+    CONF_EXPORT_MAX_AGE,
+    CONF_EXPORT_MAX_SIZE,
+    CONF_HISTORY_DAYS,
+    CONF_HISTORY_ENABLED,
+    CONF_OPTIMIZER_BASE_LOAD,
+    CONF_OPTIMIZER_CAPACITY,
+    CONF_OPTIMIZER_EXPORT_FACTOR,
+    CONF_OPTIMIZER_INTERVAL,
+    CONF_OPTIMIZER_PRICE_ENTITY,
+    CONF_OPTIMIZER_PV_ENTITY,
+    CONF_PUBLISH_INTERVAL,
+    CONF_SAMPLE_INTERVAL,
+    CONF_STALE_GRACE_PERIOD,
+    CONF_STATISTICS_ENABLED,
+    CONF_TIMELINE,
+    CONF_ZERO_EXPORT_DEADBAND,
+    CONF_ZERO_EXPORT_KI,
+    CONF_ZERO_EXPORT_KP,
+    CONF_ZERO_EXPORT_METER,
+    CONF_ZERO_EXPORT_SLEW_RATE,
+    CONF_ZERO_EXPORT_TARGET,
+    DEFAULT_EXPORT_KEEP,
+    DEFAULT_EXPORT_MAX_AGE,
+    DEFAULT_EXPORT_MAX_SIZE,
+    DEFAULT_HISTORY_DAYS,
+    DEFAULT_OPTIMIZER_BASE_LOAD,
+    DEFAULT_OPTIMIZER_CAPACITY,
+    DEFAULT_OPTIMIZER_EXPORT_FACTOR,
+    DEFAULT_OPTIMIZER_INTERVAL,
+    DEFAULT_PUBLISH_INTERVAL,
+    DEFAULT_SAMPLE_INTERVAL,
+    DEFAULT_STALE_GRACE_PERIOD,
+    DEFAULT_ZERO_EXPORT_DEADBAND,
+    DEFAULT_ZERO_EXPORT_KI,
+    DEFAULT_ZERO_EXPORT_KP,
+    DEFAULT_ZERO_EXPORT_SLEW_RATE,
+    DEFAULT_ZERO_EXPORT_TARGET,
+    DOMAIN,
+    EXPORT_DIRECTORY,
+    HISTORY_DIRECTORY,
+)
 from .coordinator import SunlitDataUpdateCoordinator
+from .metrics import SunEnergyXTMetricsView
+from .reconciler import DesiredStateReconciler
+from .resolver import HostResolver
+from .scheduler import SetpointScheduler
+from .services import async_setup_services
 
 if TYPE_CHECKING:
     from homeassistant.config_entries import ConfigEntry
     from homeassistant.core import HomeAssistant
+    from homeassistant.helpers.typing import ConfigType
 
 _LOGGER = logging.getLogger(__name__)
 PLATFORMS: list[Platform] = [
@@ -44,27 +117,118 @@ PLATFORMS: list[Platform] = [
 CONFIG_SCHEMA = cv.empty_config_schema(domain=DOMAIN)
 
 
-async def _test_connection(ip: str) -> None:
+async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:  # noqa: ARG001
+    """
+    Set up the SunEnergyXT integration.
+
+    Args:
+        hass: Home Assistant instance
+        config: Home Assistant configuration
+
+    Returns:
+        True if setup was successful
+
+    """
+    await async_setup_services(hass)
+    hass.http.register_view(SunEnergyXTMetricsView(hass))
+    return True
+
+
+async def _test_connection(hass: HomeAssistant, ip: str) -> None:
     """
     Test connection to the SunEnergyXT device.
 
     Args:
+        hass: Home Assistant instance
         ip: IP address of the device
 
     Raises:
-        RuntimeError: If connection fails or device returns an error
+        SunEnergyXTError: If connection fails or device returns an error
 
     """
-    try:
-        async with async_timeout.timeout(5), aiohttp.ClientSession() as session:
-            async with session.get(f"http://{ip}/read") as resp:
-                if resp.status != HTTPStatus.OK:
-                    msg = f"HTTP status {resp.status}"
-                    raise RuntimeError(msg)
-                await resp.json()
-    except Exception as err:
-        msg = f"Cannot connect to device at {ip}: {err}"
-        raise RuntimeError(msg) from err
+    client = SunEnergyXTClient(async_get_clientsession(hass), ip, read_timeout=5)
+    await client.async_read()
+
+
+async def _async_start_sample_consumers(
+    hass: HomeAssistant, entry: ConfigEntry, coordinator: SunlitDataUpdateCoordinator
+) -> dict[str, Any]:
+    """
+    Start the runtime objects that only consume the samples of a device.
+
+    Args:
+        hass: Home Assistant instance
+        entry: Config entry of the device
+        coordinator: Data update coordinator of the device
+
+    Returns:
+        Dictionary mapping runtime data keys to the started objects, None for
+        optional ones that are disabled
+
+    """
+    analytics = PackAnalytics(coordinator)
+    estimator = BatteryEstimator(coordinator)
+    anomaly = AnomalyDetector(hass, coordinator, entry.entry_id, entry.data.get("sn"))
+    for feature in (analytics, estimator, anomaly):
+        feature.async_start()
+        entry.async_on_unload(feature.async_stop)
+    entry.async_on_unload(anomaly.async_remove_issues)
+    backfill = EnergyBackfill(hass, coordinator, entry.entry_id)
+    await backfill.async_start()
+    entry.async_on_unload(backfill.async_stop)
+    reconciler = DesiredStateReconciler(hass, coordinator, entry.entry_id)
+    await reconciler.async_start()
+    entry.async_on_unload(reconciler.async_stop)
+
+    export = None
+    if entry.options.get(CONF_EXPORT_ENABLED):
+        from .export import ExportSink  # noqa: PLC0415
+
+        options = entry.options
+        export = ExportSink(
+            hass=hass,
+            coordinator=coordinator,
+            sn=entry.data.get("sn"),
+            directory=hass.config.path(EXPORT_DIRECTORY),
+            max_size=options.get(CONF_EXPORT_MAX_SIZE, DEFAULT_EXPORT_MAX_SIZE),
+            max_age=options.get(CONF_EXPORT_MAX_AGE, DEFAULT_EXPORT_MAX_AGE),
+            keep=options.get(CONF_EXPORT_KEEP, DEFAULT_EXPORT_KEEP),
+        )
+        export.async_start()
+        entry.async_on_unload(export.async_stop)
+
+    history = None
+    if entry.options.get(CONF_HISTORY_ENABLED):
+        from .history import HistoryStore  # noqa: PLC0415
+
+        history = HistoryStore(
+            hass=hass,
+            coordinator=coordinator,
+            sn=entry.data.get("sn"),
+            directory=hass.config.path(HISTORY_DIRECTORY),
+            days=entry.options.get(CONF_HISTORY_DAYS, DEFAULT_HISTORY_DAYS),
+        )
+        history.async_start()
+        entry.async_on_unload(history.async_stop)
+
+    statistics = None
+    if entry.options.get(CONF_STATISTICS_ENABLED):
+        from .stats_import import StatisticsImporter  # noqa: PLC0415
+
+        statistics = StatisticsImporter(hass, coordinator, entry.entry_id)
+        statistics.async_start()
+        entry.async_on_unload(statistics.async_stop)
+
+    return {
+        "export": export,
+        "history": history,
+        "analytics": analytics,
+        "estimator": estimator,
+        "anomaly": anomaly,
+        "backfill": backfill,
+        "reconciler": reconciler,
+        "statistics": statistics,
+    }
 
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
@@ -87,27 +251,151 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     ip = entry.data.get("ip")
     model = entry.data.get("model")
 
+    resolver = HostResolver(hass, entry)
     try:
-        await _test_connection(ip)
+        await _test_connection(hass, ip)
     except Exception as err:
-        _LOGGER.warning("Device %s (%s) not ready: %s", sn, ip, err)
-        msg = f"Device not ready: {err}"
-        raise ConfigEntryNotReady(msg) from err
+        if (moved := await resolver.async_refresh()) is None:
+            _LOGGER.warning("Device %s (%s) not ready: %s", sn, ip, err)
+            msg = f"Device not ready: {err}"
+            raise ConfigEntryNotReady(msg) from err
+        ip = moved
 
-    coordinator = SunlitDataUpdateCoordinator(hass=hass, sn=sn, ip=ip)
+    coordinator = SunlitDataUpdateCoordinator(
+        hass=hass,
+        sn=sn,
+        ip=ip,
+        aligned=entry.options.get(CONF_ALIGNED_POLLING, False),
+        resolver=resolver,
+        grace_period=entry.options.get(
+            CONF_STALE_GRACE_PERIOD, DEFAULT_STALE_GRACE_PERIOD
+        ),
+        sample_interval=entry.options.get(
+            CONF_SAMPLE_INTERVAL, DEFAULT_SAMPLE_INTERVAL
+        ),
+        publish_interval=entry.options.get(
+            CONF_PUBLISH_INTERVAL, DEFAULT_PUBLISH_INTERVAL
+        ),
+    )
     await coordinator.async_config_entry_first_refresh()
 
+    scheduler = SetpointScheduler(
+        hass=hass,
+        coordinator=coordinator,
+        entry_id=entry.entry_id,
+        timeline=entry.options.get(CONF_TIMELINE, []),
+    )
+
+    zero_export = None
+    if meter := entry.options.get(CONF_ZERO_EXPORT_METER):
+        from .zero_export import ZeroExportController  # noqa: PLC0415
+
+        options = entry.options
+        zero_export = ZeroExportController(
+            hass=hass,
+            coordinator=coordinator,
+            scheduler=scheduler,
+            model=model,
+            meter_entity_id=meter,
+            target=options.get(CONF_ZERO_EXPORT_TARGET, DEFAULT_ZERO_EXPORT_TARGET),
+            kp=options.get(CONF_ZERO_EXPORT_KP, DEFAULT_ZERO_EXPORT_KP),
+            ki=options.get(CONF_ZERO_EXPORT_KI, DEFAULT_ZERO_EXPORT_KI),
+            deadband=options.get(
+                CONF_ZERO_EXPORT_DEADBAND, DEFAULT_ZERO_EXPORT_DEADBAND
+            ),
+            slew_rate=options.get(
+                CONF_ZERO_EXPORT_SLEW_RATE, DEFAULT_ZERO_EXPORT_SLEW_RATE
+            ),
+        )
+        zero_export.async_start()
+        entry.async_on_unload(zero_export.async_stop)
+
+    consumers = await _async_start_sample_consumers(hass, entry, coordinator)
+
+    optimizer = None
+    if price_entity := entry.options.get(CONF_OPTIMIZER_PRICE_ENTITY):
+        from .optimizer import DispatchOptimizer  # noqa: PLC0415
+
+        options = entry.options
+        optimizer = DispatchOptimizer(
+            hass=hass,
+            coordinator=coordinator,
+            scheduler=scheduler,
+            model=model,
+            price_entity_id=price_entity,
+            pv_entity_id=options.get(CONF_OPTIMIZER_PV_ENTITY),
+            capacity_kwh=options.get(
+                CONF_OPTIMIZER_CAPACITY, DEFAULT_OPTIMIZER_CAPACITY
+            ),
+            base_load=options.get(
+                CONF_OPTIMIZER_BASE_LOAD, DEFAULT_OPTIMIZER_BASE_LOAD
+            ),
+            export_factor=options.get(
+                CONF_OPTIMIZER_EXPORT_FACTOR, DEFAULT_OPTIMIZER_EXPORT_FACTOR
+            ),
+            interval=options.get(CONF_OPTIMIZER_INTERVAL, DEFAULT_OPTIMIZER_INTERVAL),
+        )
+
     hass.data[DOMAIN][entry.entry_id] = {
+        "entry_id": entry.entry_id,
         "sn": sn,
         "ip": ip,
         "model": model,
         "coordinator": coordinator,
+        "zero_export": zero_export,
+        "scheduler": scheduler,
+        "optimizer": optimizer,
+        **consumers,
+        "options": dict(entry.options),
     }
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
 
+    await scheduler.async_start()
+    entry.async_on_unload(scheduler.async_stop)
+    if optimizer is not None:
+        optimizer.async_start()
+        entry.async_on_unload(optimizer.async_stop)
+    entry.async_on_unload(entry.add_update_listener(_async_update_listener))
+
     return True
 
 
+async def _async_update_listener(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """
+    Apply changed options, reloading the config entry only when needed.
+
+    A new device address and timeline changes are applied in place, unless
+    the optimiser owns the timeline; any other option change reloads.
+
+    Args:
+        hass: Home Assistant instance
+        entry: Config entry whose options changed
+
+    """
+    config = hass.data[DOMAIN][entry.entry_id]
+    if (ip := entry.data.get("ip")) != config["ip"]:
+        config["ip"] = ip
+        config["coordinator"].async_set_host(ip)
+
+    previous = config["options"]
+    changed = {
+        key
+        for key in previous.keys() | entry.options.keys()
+        if previous.get(key) != entry.options.get(key)
+    }
+    config["options"] = dict(entry.options)
+
+    if CONF_TIMELINE in changed:
+        if config["optimizer"] is None:
+            config["scheduler"].async_update_timeline(
+                entry.options.get(CONF_TIMELINE, [])
+            )
+        changed.discard(CONF_TIMELINE)
+
+    if changed:
+        await hass.config_entries.async_reload(entry.entry_id)
+
+
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """
     Unload a SunEnergyXT config entry.
@@ -0,0 +1,342 @@
+"""
+Battery pack and PV string analytics for SunEnergyXT 500 Series integration.
+
+This module derives aggregate values, such as pack imbalance and PV string
+mismatch, and battery time-to-full/time-to-empty estimates from the samples of
+a device, so they can be published as sensors instead of being rebuilt by
+template sensors on every state change.
+
+Classes:
+- PackAnalytics: Keeps the derived values of a device up to date
+- BatteryEstimator: Estimates the time until the battery is full or empty
+
+Functions:
+- scaled_number: Gets a reported value scaled to its unit
+- compute_analytics: Derives the aggregate values from one sample
+
+Constants:
+- PACK_KEYS: Reported keys of the battery pack states of charge
+- STRING_KEYS: Reported power, current and voltage keys of each PV string
+"""
+
+from __future__ import annotations
+
+from collections import deque
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.core import CALLBACK_TYPE, callback
+
+from .api import scale_value
+
+if TYPE_CHECKING:
+    from datetime import datetime
+
+    from .coordinator import SunlitDataUpdateCoordinator
+
+PACK_KEYS = ("SC0", "SC1", "SC2", "SC3", "SC4", "SC5")
+STRING_KEYS = (
+    ("PV1", "II1", "VP1"),
+    ("PV2", "II2", "VP2"),
+    ("PV3", "II3", "VP3"),
+    ("PV4", "II4", "VP4"),
+)
+
+# Below this DC voltage a string is treated as not connected
+MIN_STRING_VOLTAGE = 1.0
+# Below this DC power a string efficiency is not meaningful
+MIN_STRING_POWER = 5.0
+
+# Seconds of SOC samples the battery estimator regresses over
+ESTIMATE_WINDOW = 900
+# Minimum samples and seconds in the window before estimating
+ESTIMATE_MIN_SAMPLES = 10
+ESTIMATE_MIN_SPAN = 300
+# Seconds between estimates
+ESTIMATE_INTERVAL = 30
+# Below this net battery power in W the battery is treated as idle
+IDLE_POWER = 10.0
+# Samples after which the regression sums are rebuilt to shed rounding drift
+REBASE_SAMPLES = 1000
+
+
+def scaled_number(reported: dict[str, Any], key: str) -> float | None:
+    """
+    Get a reported value scaled to its unit.
+
+    Args:
+        reported: Raw reported data
+        key: Parameter key
+
+    Returns:
+        Scaled value, or None if it is missing or not numeric
+
+    """
+    try:
+        return float(scale_value(key, reported[key]))
+    except (KeyError, TypeError, ValueError):
+        return None
+
+
+def compute_analytics(reported: dict[str, Any]) -> dict[str, float | int | None]:
+    """
+    Derive the pack and string aggregates from one sample.
+
+    Packs reporting 0 % are treated as not installed, and strings without input
+    voltage as not connected.
+
+    Args:
+        reported: Raw reported data
+
+    Returns:
+        Dictionary mapping derived keys to their values, None where the value
+        cannot be derived
+
+    """
+    values: dict[str, float | int | None] = {}
+
+    packs = [
+        (index, soc)
+        for index, key in enumerate(PACK_KEYS)
+        if (soc := scaled_number(reported, key))
+    ]
+    if packs:
+        weakest, lowest = min(packs, key=lambda pack: pack[1])
+        highest = max(soc for _, soc in packs)
+        values["pack_soc_average"] = round(sum(s for _, s in packs) / len(packs), 1)
+        values["pack_soc_min"] = lowest
+        values["pack_imbalance"] = highest - lowest
+        values["weakest_pack"] = weakest
+    else:
+        values.update(
+            dict.fromkeys(
+                ("pack_soc_average", "pack_soc_min", "pack_imbalance", "weakest_pack")
+            )
+        )
+
+    powers: list[float] = []
+    for number, (power_key, current_key, voltage_key) in enumerate(STRING_KEYS, 1):
+        power = scaled_number(reported, power_key)
+        current = scaled_number(reported, current_key)
+        voltage = scaled_number(reported, voltage_key)
+        efficiency = None
+        if power is not None and voltage is not None and voltage >= MIN_STRING_VOLTAGE:
+            powers.append(power)
+            if current is not None and current * voltage >= MIN_STRING_POWER:
+                efficiency = round(power / (current * voltage) * 100, 1)
+        values[f"pv{number}_efficiency"] = efficiency
+
+    if len(powers) > 1 and max(powers) > 0:
+        values["pv_string_mismatch"] = round(
+            (max(powers) - min(powers)) / max(powers) * 100, 1
+        )
+    else:
+        values["pv_string_mismatch"] = None
+    return values
+
+
+class PackAnalytics:
+    """
+    Derived pack and string values of one device.
+
+    The values are recomputed once per good sample and shared by all derived
+    sensors of the device.
+    """
+
+    def __init__(self, coordinator: SunlitDataUpdateCoordinator) -> None:
+        """
+        Initialize the analytics.
+
+        Args:
+            coordinator: Data update coordinator of the device
+
+        """
+        self._coordinator = coordinator
+        self._unsub: CALLBACK_TYPE | None = None
+        self.values: dict[str, float | int | None] = (
+            compute_analytics(coordinator.data) if coordinator.data else {}
+        )
+
+    @callback
+    def async_start(self) -> None:
+        """Start following the samples of the device."""
+        self._unsub = self._coordinator.async_add_sample_listener(self._async_sample)
+
+    @callback
+    def async_stop(self) -> None:
+        """Stop following the samples of the device."""
+        if self._unsub is not None:
+            self._unsub()
+            self._unsub = None
+
+    @callback
+    def _async_sample(self, reported: dict[str, Any], _sampled_at: datetime) -> None:
+        """
+        Recompute the derived values for a new sample.
+
+        Args:
+            reported: Raw reported data
+            _sampled_at: Time the sample was taken
+
+        """
+        self.values = compute_analytics(reported)
+
+
+class BatteryEstimator:
+    """
+    Time-to-full and time-to-empty estimator for one device.
+
+    A least-squares line is fitted to the state of charge over a sliding
+    window. The running sums are updated in O(1) per sample as samples enter
+    and leave the window. The net battery power implied by IW and OP, or PV,
+    GP and LP, only decides whether the battery is charging, discharging or
+    idle; the rate comes from the fitted slope, so no capacity is needed. The
+    estimates run until SA when charging and SO when discharging.
+    """
+
+    def __init__(self, coordinator: SunlitDataUpdateCoordinator) -> None:
+        """
+        Initialize the estimator.
+
+        Args:
+            coordinator: Data update coordinator of the device
+
+        """
+        self._coordinator = coordinator
+        self._unsub: CALLBACK_TYPE | None = None
+        self._origin: float | None = None
+        self._window: deque[tuple[float, float]] = deque()
+        self._sums = [0.0, 0.0, 0.0, 0.0]
+        self._since_rebase = 0
+        self._estimated_at: float | None = None
+        self.values: dict[str, float | None] = {
+            "time_to_full": None,
+            "time_to_empty": None,
+        }
+
+    @callback
+    def async_start(self) -> None:
+        """Start following the samples of the device."""
+        self._unsub = self._coordinator.async_add_sample_listener(self._async_sample)
+
+    @callback
+    def async_stop(self) -> None:
+        """Stop following the samples of the device."""
+        if self._unsub is not None:
+            self._unsub()
+            self._unsub = None
+
+    def _add(self, t: float, soc: float, sign: int) -> None:
+        """
+        Add a sample to or remove it from the regression sums.
+
+        Args:
+            t: Sample time in seconds since the origin
+            soc: State of charge in %
+            sign: 1 to add, -1 to remove
+
+        """
+        self._sums[0] += sign * t
+        self._sums[1] += sign * soc
+        self._sums[2] += sign * t * t
+        self._sums[3] += sign * t * soc
+
+    def _rebase(self) -> None:
+        """Move the origin to the oldest sample and rebuild the sums."""
+        shift = self._window[0][0]
+        self._origin = (self._origin or 0.0) + shift
+        self._window = deque((t - shift, soc) for t, soc in self._window)
+        self._sums = [0.0, 0.0, 0.0, 0.0]
+        for t, soc in self._window:
+            self._add(t, soc, 1)
+        self._since_rebase = 0
+
+    @callback
+    def _async_sample(self, reported: dict[str, Any], sampled_at: datetime) -> None:
+        """
+        Add a sample to the window and re-estimate when due.
+
+        Args:
+            reported: Raw reported data
+            sampled_at: Time the sample was taken
+
+        """
+        soc = scaled_number(reported, "SC")
+        if soc is None:
+            return
+        now = sampled_at.timestamp()
+        if self._origin is None:
+            self._origin = now
+        t = now - self._origin
+
+        self._window.append((t, soc))
+        self._add(t, soc, 1)
+        while self._window[0][0] < t - ESTIMATE_WINDOW:
+            self._add(*self._window.popleft(), -1)
+
+        self._since_rebase += 1
+        if self._since_rebase >= REBASE_SAMPLES:
+            self._rebase()
+
+        if self._estimated_at is None or now - self._estimated_at >= ESTIMATE_INTERVAL:
+            self._estimated_at = now
+            self.values = self._estimate(reported, soc)
+
+    def _slope(self) -> float | None:
+        """
+        Get the fitted state of charge slope.
+
+        Returns:
+            Slope in % per second, or None if the window is too short
+
+        """
+        n = len(self._window)
+        if (
+            n < ESTIMATE_MIN_SAMPLES
+            or self._window[-1][0] - self._window[0][0] < ESTIMATE_MIN_SPAN
+        ):
+            return None
+        sum_t, sum_soc, sum_tt, sum_tsoc = self._sums
+        denominator = n * sum_tt - sum_t * sum_t
+        if denominator <= 0:
+            return None
+        return (n * sum_tsoc - sum_t * sum_soc) / denominator
+
+    def _estimate(
+        self, reported: dict[str, Any], soc: float
+    ) -> dict[str, float | None]:
+        """
+        Estimate the time until the battery is full or empty.
+
+        Args:
+            reported: Raw reported data of the latest sample
+            soc: Latest state of charge in %
+
+        Returns:
+            Dictionary with the time to full and to empty in minutes, None where
+            the battery is not moving in that direction
+
+        """
+        values: dict[str, float | None] = {"time_to_full": None, "time_to_empty": None}
+        slope = self._slope()
+        if slope is None:
+            return values
+
+        inputs = scaled_number(reported, "IW")
+        outputs = scaled_number(reported, "OP")
+        if inputs is not None and outputs is not None:
+            power = inputs - outputs
+        else:
+            pv = scaled_number(reported, "PV")
+            grid = scaled_number(reported, "GP")
+            load = scaled_number(reported, "LP")
+            if pv is None or grid is None or load is None:
+                return values
+            power = pv - grid - load
+
+        full = scaled_number(reported, "SA")
+        empty = scaled_number(reported, "SO")
+        if power > IDLE_POWER and slope > 0 and full is not None:
+            values["time_to_full"] = round(max(0.0, full - soc) / slope / 60)
+        elif power < -IDLE_POWER and slope < 0 and empty is not None:
+            values["time_to_empty"] = round(max(0.0, soc - empty) / -slope / 60)
+        return values
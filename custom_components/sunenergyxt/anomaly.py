@@ -0,0 +1,281 @@
+"""
+Streaming anomaly detection for SunEnergyXT 500 Series integration.
+
+This module implements a constant-memory, constant-time-per-sample detector
+that compares every PV string and battery pack with its siblings and raises a
+repair issue when one of them deviates persistently from its usual behaviour,
+such as a newly shaded or failed string or a drifting pack.
+
+Classes:
+- AnomalyDetector: Tracks the sibling-normalised residual of each key
+
+Constants:
+- GROUPS: Sibling groups the detector compares
+"""
+
+from __future__ import annotations
+
+import logging
+import math
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers import issue_registry as ir
+
+from .analytics import MIN_STRING_VOLTAGE, PACK_KEYS, scaled_number
+from .const import DOMAIN
+
+if TYPE_CHECKING:
+    from datetime import datetime
+
+    from .coordinator import SunlitDataUpdateCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class _Group:
+    """Sibling group compared by the detector."""
+
+    keys: tuple[str, ...]
+    # Members of string groups are skipped while their string has no voltage,
+    # members of other groups while they report 0
+    strings: bool
+    # Residuals are ratios to the group mean minus 1 when relative, otherwise
+    # differences from the group mean in the key's unit
+    relative: bool
+    # The group is skipped while its mean is below this value
+    min_mean: float
+    # Lower bound of the baseline standard deviation, in residual units
+    min_sd: float
+
+
+GROUPS: dict[str, _Group] = {
+    "pv_power": _Group(
+        ("PV1", "PV2", "PV3", "PV4"),
+        strings=True,
+        relative=True,
+        min_mean=20.0,
+        min_sd=0.02,
+    ),
+    "pv_voltage": _Group(
+        ("VP1", "VP2", "VP3", "VP4"),
+        strings=True,
+        relative=True,
+        min_mean=5.0,
+        min_sd=0.01,
+    ),
+    "pv_current": _Group(
+        ("II1", "II2", "II3", "II4"),
+        strings=True,
+        relative=True,
+        min_mean=0.2,
+        min_sd=0.02,
+    ),
+    "pack_soc": _Group(
+        PACK_KEYS, strings=False, relative=False, min_mean=1.0, min_sd=1.0
+    ),
+}
+
+# Weight of a sample in the slow baseline once warmed up (~2000 samples)
+SLOW_ALPHA = 0.0005
+# Weight of a sample in the fast mean (~100 samples)
+FAST_ALPHA = 0.01
+# Samples before a key's baseline is trusted
+WARMUP_SAMPLES = 500
+# Deviation, in baseline standard deviations, raising and clearing an anomaly
+RAISE_SCORE = 4.0
+CLEAR_SCORE = 2.0
+# Consecutive samples beyond RAISE_SCORE before an anomaly is raised
+PERSIST_SAMPLES = 100
+
+
+@dataclass
+class _KeyState:
+    """Running statistics of one key's residual."""
+
+    count: int = 0
+    mean: float = 0.0
+    var: float = 0.0
+    fast: float = 0.0
+    score: float = 0.0
+    streak: int = 0
+    anomalous: bool = False
+
+
+class AnomalyDetector:
+    """
+    Sibling-normalised anomaly detector for one device.
+
+    For every sample, each member of a group is turned into a residual against
+    the group mean. Per key, a Welford-style baseline (cumulative during warm
+    up, exponentially weighted afterwards) tracks the usual residual and its
+    variance, and a fast exponential mean tracks the current one. A key is
+    anomalous once the fast mean stays more than RAISE_SCORE baseline standard
+    deviations away for PERSIST_SAMPLES samples, and recovers below
+    CLEAR_SCORE. The baseline only learns while a key is within CLEAR_SCORE,
+    so a developing fault is not learned as normal.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        coordinator: SunlitDataUpdateCoordinator,
+        entry_id: str,
+        sn: str,
+    ) -> None:
+        """
+        Initialize the detector.
+
+        Args:
+            hass: Home Assistant instance
+            coordinator: Data update coordinator of the device
+            entry_id: Config entry ID, used in the repair issue IDs
+            sn: Device serial number, shown in the repair issues
+
+        """
+        self._hass = hass
+        self._coordinator = coordinator
+        self._entry_id = entry_id
+        self._sn = sn
+        self._unsub: CALLBACK_TYPE | None = None
+        self._states = {
+            key: _KeyState() for group in GROUPS.values() for key in group.keys
+        }
+        self.values: dict[str, int] = {"anomalies": 0}
+
+    @callback
+    def async_start(self) -> None:
+        """Start following the samples of the device."""
+        self._unsub = self._coordinator.async_add_sample_listener(self._async_sample)
+
+    @callback
+    def async_stop(self) -> None:
+        """Stop following the samples of the device."""
+        if self._unsub is not None:
+            self._unsub()
+            self._unsub = None
+
+    def _issue_id(self, key: str) -> str:
+        """
+        Get the repair issue ID of a key.
+
+        Args:
+            key: Parameter key
+
+        Returns:
+            Repair issue ID
+
+        """
+        return f"anomaly_{self._entry_id}_{key}"
+
+    @callback
+    def async_remove_issues(self) -> None:
+        """Remove the repair issues of this device."""
+        for key in self._states:
+            ir.async_delete_issue(self._hass, DOMAIN, self._issue_id(key))
+
+    @callback
+    def _async_sample(self, reported: dict[str, Any], _sampled_at: datetime) -> None:
+        """
+        Update the statistics of every key with a new sample.
+
+        Args:
+            reported: Raw reported data
+            _sampled_at: Time the sample was taken
+
+        """
+        for name, group in GROUPS.items():
+            members: dict[str, float] = {}
+            for key in group.keys:
+                value = scaled_number(reported, key)
+                if value is None:
+                    continue
+                if group.strings:
+                    voltage = scaled_number(reported, f"VP{key[-1]}")
+                    if voltage is None or voltage < MIN_STRING_VOLTAGE:
+                        continue
+                elif value == 0:
+                    continue
+                members[key] = value
+            if len(members) < 2:  # noqa: PLR2004
+                continue
+            mean = sum(members.values()) / len(members)
+            if mean < group.min_mean:
+                continue
+            for key, value in members.items():
+                residual = value / mean - 1 if group.relative else value - mean
+                self._update(name, group, key, residual)
+
+        self.values = {
+            "anomalies": sum(state.anomalous for state in self._states.values())
+        }
+
+    def _update(self, name: str, group: _Group, key: str, residual: float) -> None:
+        """
+        Update the statistics of one key and raise or clear its anomaly.
+
+        Args:
+            name: Group name
+            group: Group of the key
+            key: Parameter key
+            residual: Sibling-normalised residual of the key
+
+        """
+        state = self._states[key]
+        state.fast += FAST_ALPHA * (residual - state.fast) if state.count else residual
+
+        if state.count >= WARMUP_SAMPLES:
+            sd = max(math.sqrt(state.var), group.min_sd)
+            state.score = (state.fast - state.mean) / sd
+        deviating = abs(state.score) > RAISE_SCORE
+
+        if abs(state.score) <= CLEAR_SCORE and not state.anomalous:
+            state.count += 1
+            alpha = max(1 / state.count, SLOW_ALPHA)
+            delta = residual - state.mean
+            state.mean += alpha * delta
+            state.var = (1 - alpha) * (state.var + alpha * delta * delta)
+
+        state.streak = state.streak + 1 if deviating else 0
+        if not state.anomalous and state.streak >= PERSIST_SAMPLES:
+            state.anomalous = True
+            _LOGGER.warning(
+                "%s of %s deviates from its siblings (score %.1f)",
+                key,
+                self._sn,
+                state.score,
+            )
+            ir.async_create_issue(
+                self._hass,
+                DOMAIN,
+                self._issue_id(key),
+                is_fixable=False,
+                severity=ir.IssueSeverity.WARNING,
+                translation_key=f"anomaly_{name}",
+                translation_placeholders={"device": self._sn, "key": key},
+            )
+        elif state.anomalous and abs(state.score) < CLEAR_SCORE:
+            state.anomalous = False
+            ir.async_delete_issue(self._hass, DOMAIN, self._issue_id(key))
+
+    def get_diagnostics(self) -> dict[str, Any]:
+        """
+        Get detector state for diagnostics.
+
+        Returns:
+            Dictionary describing the statistics of every key
+
+        """
+        return {
+            key: {
+                "count": state.count,
+                "mean": state.mean,
+                "sd": math.sqrt(state.var),
+                "fast": state.fast,
+                "score": state.score,
+                "anomalous": state.anomalous,
+            }
+            for key, state in self._states.items()
+        }
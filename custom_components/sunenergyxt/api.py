@@ -0,0 +1,449 @@
+"""
+Async client for the SunEnergyXT 500 Series local HTTP API.
+
+This module implements the device protocol without any Home Assistant
+dependency, so it can be used by the integration, ingestion jobs and tests
+alike. It has no relative imports and can be run directly as a CLI that polls
+many devices concurrently and streams NDJSON samples to stdout:
+
+    python3 custom_components/sunenergyxt/api.py 192.168.1.20 192.168.1.21
+
+Classes:
+- SunEnergyXTClient: Reads from and writes to one device
+- SunEnergyXTError: Exception raised when the device cannot be read or written
+
+Functions:
+- scale_value: Converts a raw reported value to its physical unit
+- scale_reported: Converts all raw reported values to their physical units
+- main: Command line entry point
+
+Constants:
+- SCALE: Factor converting raw reported values to their physical unit
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import math
+import sys
+from collections import deque
+from datetime import UTC, datetime
+from http import HTTPStatus
+from time import monotonic
+from typing import TYPE_CHECKING, Any
+
+import aiohttp
+
+if TYPE_CHECKING:
+    import argparse
+    from collections.abc import Mapping
+
+_LOGGER = logging.getLogger(__name__)
+
+READ_TIMEOUT = 10
+WRITE_TIMEOUT = 5
+
+# Latencies kept per device and request type
+LATENCY_WINDOW = 256
+# Latencies needed before the timeouts are derived from them
+LATENCY_MIN_SAMPLES = 20
+# Multiple of the 99th percentile latency a request is allowed
+LATENCY_FACTOR = 3
+# Shortest timeout derived from the latencies, in seconds
+MIN_TIMEOUT = 0.5
+
+SCALE: dict[str, float] = {
+    "II1": 0.1,
+    "II2": 0.1,
+    "II3": 0.1,
+    "II4": 0.1,
+    "VP1": 0.1,
+    "VP2": 0.1,
+    "VP3": 0.1,
+    "VP4": 0.1,
+    "GD1": 0.001,
+    "GD2": 0.001,
+    "LD": 0.001,
+}
+
+
+class SunEnergyXTError(RuntimeError):
+    """Error to indicate the device could not be read or written."""
+
+
+def scale_value(key: str, raw: Any) -> Any:
+    """
+    Convert a raw reported value to its physical unit.
+
+    Args:
+        key: Parameter key
+        raw: Raw reported value
+
+    Returns:
+        Scaled value rounded to the resolution of the scale, or the raw value
+        if the key is not scaled or the value is not numeric
+
+    """
+    scale = SCALE.get(key)
+    if scale is None:
+        return raw
+    try:
+        return round(float(raw) * scale, -math.floor(math.log10(scale)))
+    except (TypeError, ValueError):
+        return raw
+
+
+def scale_reported(reported: Mapping[str, Any]) -> dict[str, Any]:
+    """
+    Convert all raw reported values to their physical units.
+
+    Args:
+        reported: Raw reported device data
+
+    Returns:
+        Dictionary mapping parameter keys to scaled values
+
+    """
+    return {key: scale_value(key, raw) for key, raw in reported.items()}
+
+
+class _LatencyWindow:
+    """Rolling latency distribution of one phase of one type of request."""
+
+    def __init__(self, ceiling: float) -> None:
+        """
+        Initialize the window.
+
+        Args:
+            ceiling: Longest timeout, used until enough latencies are known
+
+        """
+        self._latencies: deque[float] = deque(maxlen=LATENCY_WINDOW)
+        self._ceiling = ceiling
+        self.timeout_count = 0
+
+    def add(self, latency: float) -> None:
+        """
+        Add a latency.
+
+        Args:
+            latency: Seconds the phase took
+
+        """
+        self._latencies.append(latency)
+
+    def add_timeout(self, waited: float) -> None:
+        """
+        Add a phase that timed out.
+
+        The time waited is only the budget the phase was given, so it is
+        recorded as at most the current 99th percentile latency. Timeouts
+        during an outage thus keep the budget instead of inflating it, and are
+        not recorded at all before the budget is derived from latencies.
+
+        Args:
+            waited: Seconds waited before the timeout
+
+        """
+        self.timeout_count += 1
+        if (p99 := self.percentile(0.99)) is not None:
+            self._latencies.append(min(waited, p99))
+
+    def percentile(self, fraction: float) -> float | None:
+        """
+        Get a percentile of the latencies.
+
+        Args:
+            fraction: Percentile as a fraction, e.g. 0.99
+
+        Returns:
+            Latency in seconds, or None if too few latencies are known
+
+        """
+        if len(self._latencies) < LATENCY_MIN_SAMPLES:
+            return None
+        ordered = sorted(self._latencies)
+        return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+    def timeout(self) -> float:
+        """
+        Get the timeout derived from the latencies.
+
+        Returns:
+            The 99th percentile latency times LATENCY_FACTOR, limited to
+            MIN_TIMEOUT and the ceiling
+
+        """
+        if (p99 := self.percentile(0.99)) is None:
+            return self._ceiling
+        return min(self._ceiling, max(MIN_TIMEOUT, p99 * LATENCY_FACTOR))
+
+    def stats(self) -> dict[str, float | None]:
+        """
+        Get the latency distribution and the timeout.
+
+        Returns:
+            Median and 99th percentile latency and the timeout in seconds,
+            and the number of timeouts
+
+        """
+        return {
+            "p50": self.percentile(0.5),
+            "p99": self.percentile(0.99),
+            "timeout": self.timeout(),
+            "timeouts": self.timeout_count,
+        }
+
+
+class SunEnergyXTClient:
+    """
+    Async client for one SunEnergyXT device.
+
+    The aiohttp session is owned by the caller and may be shared by many
+    clients.
+
+    Timeouts adapt to the device: the latencies of the last LATENCY_WINDOW
+    reads and writes are kept, separately for the wait up to the response
+    headers, which covers connecting and the device preparing its response, and
+    for the whole request including the body. Each phase is allowed
+    LATENCY_FACTOR times its 99th percentile latency, at least MIN_TIMEOUT and
+    at most the configured timeout, so an unreachable device fails fast while
+    a device on a slow link is not cut off. A timeout counts as a latency of
+    at most the 99th percentile, so an outage does not inflate the budgets,
+    while responses that get slower within the budget still raise them.
+    """
+
+    def __init__(
+        self,
+        session: aiohttp.ClientSession,
+        host: str,
+        read_timeout: float = READ_TIMEOUT,
+        write_timeout: float = WRITE_TIMEOUT,
+    ) -> None:
+        """
+        Initialize the client.
+
+        Args:
+            session: aiohttp session used for requests
+            host: IP address or host name of the device
+            read_timeout: Longest time allowed for a read, in seconds
+            write_timeout: Longest time allowed for a write, in seconds
+
+        """
+        self._session = session
+        self.host = host
+        self._latency = {
+            "read": (_LatencyWindow(read_timeout), _LatencyWindow(read_timeout)),
+            "write": (_LatencyWindow(write_timeout), _LatencyWindow(write_timeout)),
+        }
+
+    async def _async_request(
+        self, kind: str, method: str, path: str, **kwargs: Any
+    ) -> tuple[int, str]:
+        """
+        Send a request within the adaptive timeouts and record its latency.
+
+        Args:
+            kind: Type of request, "read" or "write"
+            method: HTTP method
+            path: Path of the request
+            **kwargs: Further arguments of the aiohttp request
+
+        Returns:
+            HTTP status and body of the response
+
+        Raises:
+            aiohttp.ClientError: If the request fails
+            TimeoutError: If the response headers or the whole response time out
+
+        """
+        headers, total = self._latency[kind]
+        started = monotonic()
+        headers_at: float | None = None
+        try:
+            async with asyncio.timeout(total.timeout()):
+                async with asyncio.timeout(headers.timeout()):
+                    resp = await self._session.request(
+                        method, f"http://{self.host}{path}", **kwargs
+                    )
+                headers_at = monotonic()
+                async with resp:
+                    text = await resp.text()
+        except TimeoutError:
+            waited = monotonic() - started
+            total.add_timeout(waited)
+            if headers_at is None:
+                headers.add_timeout(waited)
+            raise
+        headers.add(headers_at - started)
+        total.add(monotonic() - started)
+        return resp.status, text
+
+    def latency_stats(self) -> dict[str, dict[str, dict[str, float | None]]]:
+        """
+        Get the latency distributions and timeouts of the requests.
+
+        Returns:
+            Statistics of the headers and total phase of reads and writes
+
+        """
+        return {
+            kind: {"headers": headers.stats(), "total": total.stats()}
+            for kind, (headers, total) in self._latency.items()
+        }
+
+    async def async_read(self) -> dict[str, Any]:
+        """
+        Read the reported state of the device.
+
+        Returns:
+            Dictionary mapping parameter keys to raw reported values
+
+        Raises:
+            SunEnergyXTError: If the device cannot be read or the response is
+                malformed
+
+        """
+        try:
+            status, text = await self._async_request("read", "GET", "/read")
+            if status != HTTPStatus.OK:
+                msg = f"HTTP status {status}"
+                raise SunEnergyXTError(msg)
+            data = json.loads(text)
+        except (aiohttp.ClientError, TimeoutError, ValueError) as err:
+            msg = f"Cannot read {self.host}: {err!r}"
+            raise SunEnergyXTError(msg) from err
+
+        _LOGGER.debug("Get raw data: %s", data)
+        reported = data.get("state", {}).get("reported", {})
+        if not isinstance(reported, dict):
+            msg = "Invalid 'reported' structure in JSON"
+            raise SunEnergyXTError(msg)
+        return reported
+
+    async def async_write(self, values: Mapping[str, int | str]) -> None:
+        """
+        Write values to the device in a single request.
+
+        Args:
+            values: Dictionary mapping parameter keys to the values to write
+
+        Raises:
+            SunEnergyXTError: If the device cannot be reached or rejects the write
+
+        """
+        payload = {"state": dict(values)}
+        try:
+            status, text = await self._async_request(
+                "write", "POST", "/write", json=payload
+            )
+        except (aiohttp.ClientError, TimeoutError) as err:
+            msg = f"Cannot write {self.host}: {err!r}"
+            raise SunEnergyXTError(msg) from err
+        if status != HTTPStatus.OK:
+            msg = f"HTTP {status}: {text}"
+            raise SunEnergyXTError(msg)
+
+
+async def _async_poll(
+    client: SunEnergyXTClient, *, raw: bool, lock: asyncio.Lock
+) -> None:
+    """
+    Read one device and write the sample as one NDJSON line.
+
+    Args:
+        client: Client of the device
+        raw: Whether to emit raw values instead of scaled ones
+        lock: Lock serialising writes to stdout
+
+    """
+    sample: dict[str, Any] = {"host": client.host}
+    try:
+        reported = await client.async_read()
+    except SunEnergyXTError as err:
+        sample["error"] = str(err)
+    else:
+        sample["data"] = reported if raw else scale_reported(reported)
+    sample["time"] = datetime.now(UTC).isoformat()
+
+    async with lock:
+        sys.stdout.write(json.dumps(sample, separators=(",", ":")) + "\n")
+        sys.stdout.flush()
+
+
+async def _async_main(args: argparse.Namespace) -> None:
+    """
+    Poll the devices until the requested number of rounds is done.
+
+    Args:
+        args: Parsed command line arguments
+
+    """
+    lock = asyncio.Lock()
+    loop = asyncio.get_running_loop()
+    connector = aiohttp.TCPConnector(limit=args.concurrency)
+    async with aiohttp.ClientSession(connector=connector) as session:
+        clients = [
+            SunEnergyXTClient(session, host, read_timeout=args.timeout)
+            for host in args.hosts
+        ]
+        rounds = 0
+        while args.count is None or rounds < args.count:
+            started = loop.time()
+            await asyncio.gather(
+                *(_async_poll(client, raw=args.raw, lock=lock) for client in clients)
+            )
+            rounds += 1
+            if args.count is None or rounds < args.count:
+                await asyncio.sleep(max(0.0, args.interval - (loop.time() - started)))
+
+
+def main(argv: list[str] | None = None) -> int:
+    """
+    Run the command line client.
+
+    Args:
+        argv: Command line arguments, defaults to sys.argv
+
+    Returns:
+        Process exit code
+
+    """
+    import argparse  # noqa: PLC0415
+
+    parser = argparse.ArgumentParser(
+        description="Poll SunEnergyXT devices and stream NDJSON samples."
+    )
+    parser.add_argument("hosts", nargs="+", help="device IP addresses or host names")
+    parser.add_argument(
+        "-i", "--interval", type=float, default=3, help="seconds between rounds"
+    )
+    parser.add_argument(
+        "-n",
+        "--count",
+        type=int,
+        default=None,
+        help="number of rounds, default no limit",
+    )
+    parser.add_argument(
+        "-t", "--timeout", type=float, default=READ_TIMEOUT, help="longest read timeout"
+    )
+    parser.add_argument(
+        "-c", "--concurrency", type=int, default=50, help="maximum open connections"
+    )
+    parser.add_argument(
+        "--raw", action="store_true", help="emit raw values instead of scaled ones"
+    )
+    args = parser.parse_args(argv)
+
+    try:
+        asyncio.run(_async_main(args))
+    except KeyboardInterrupt:
+        return 130
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,322 @@
+"""
+Energy statistics backfill for SunEnergyXT 500 Series integration.
+
+This module fills the long-term statistics of the cumulative energy counters
+after an outage of Home Assistant or of the device. Instead of letting the
+whole counter delta land in the hour the device is back, the delta is spread
+across the missed hours and imported in bulk, so hourly energy stays correct.
+
+Classes:
+- EnergyBackfill: Detects gaps between samples and backfills the statistics
+
+Constants:
+- BACKFILL_KEYS: Cumulative energy counters that are backfilled
+"""
+
+from __future__ import annotations
+
+import logging
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from functools import partial
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.const import ATTR_UNIT_OF_MEASUREMENT
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers import entity_registry as er
+from homeassistant.helpers.event import async_call_later
+from homeassistant.helpers.storage import Store
+from homeassistant.util import dt as dt_util
+
+from .analytics import scaled_number
+from .const import DOMAIN
+
+if TYPE_CHECKING:
+    from .coordinator import SunlitDataUpdateCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+STORAGE_VERSION = 1
+# Seconds between writes of the last sample to storage
+SAVE_INTERVAL = timedelta(seconds=60)
+
+BACKFILL_KEYS = ("GD1", "GD2", "LD")
+
+# Shortest gap between two samples that is backfilled
+MIN_GAP = timedelta(minutes=15)
+# Time after an hour ends before its statistics are compiled by the recorder
+# and can be overwritten
+COMPILE_DELAY = timedelta(minutes=15)
+HOUR = timedelta(hours=1)
+
+
+@dataclass
+class _Gap:
+    """Samples around a gap."""
+
+    start: datetime
+    end: datetime
+    start_values: dict[str, float]
+    end_values: dict[str, float]
+
+
+def _hour(moment: datetime) -> datetime:
+    """
+    Get the start of the hour of a moment.
+
+    Args:
+        moment: Time zone aware time
+
+    Returns:
+        Start of the hour
+
+    """
+    return moment.replace(minute=0, second=0, microsecond=0)
+
+
+class EnergyBackfill:
+    """
+    Energy statistics backfill for one device.
+
+    The last sample is persisted, so gaps spanning a restart are detected too.
+    When a sample follows the previous one by at least MIN_GAP across an hour
+    boundary, the counter deltas are interpolated linearly over the gap. The
+    hourly statistics from the hour of the last sample before the gap up to
+    the hour before the first sample after it are then rewritten in one
+    import per counter. The import is deferred until the recorder has
+    compiled the last of these hours. Sums continue from the hour before the
+    gap, so the hour the device is back only keeps its own share.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        coordinator: SunlitDataUpdateCoordinator,
+        entry_id: str,
+    ) -> None:
+        """
+        Initialize the backfill.
+
+        Args:
+            hass: Home Assistant instance
+            coordinator: Data update coordinator of the device
+            entry_id: Config entry ID, used for the persisted state and to
+                find the counter entities
+
+        """
+        self._hass = hass
+        self._coordinator = coordinator
+        self._entry_id = entry_id
+        self._store: Store[dict[str, Any]] = Store(
+            hass, STORAGE_VERSION, f"{DOMAIN}.backfill.{entry_id}"
+        )
+        self._last: tuple[datetime, dict[str, float]] | None = None
+        self._saved_at: datetime | None = None
+        self._unsub: CALLBACK_TYPE | None = None
+        self._pending: dict[int, CALLBACK_TYPE] = {}
+        self._next_id = 0
+
+        self.gap_count = 0
+        self.row_count = 0
+        self.last_gap: _Gap | None = None
+
+    async def async_start(self) -> None:
+        """Load the last sample and start following the samples."""
+        stored = await self._store.async_load() or {}
+        if (sampled_at := dt_util.parse_datetime(stored.get("time") or "")) and (
+            values := stored.get("values")
+        ):
+            self._last = (sampled_at, values)
+        self._unsub = self._coordinator.async_add_sample_listener(self._async_sample)
+
+    async def async_stop(self) -> None:
+        """Stop following the samples, cancel pending imports and save."""
+        if self._unsub is not None:
+            self._unsub()
+            self._unsub = None
+        for unsub in self._pending.values():
+            unsub()
+        self._pending.clear()
+        await self._store.async_save(self._data_to_save())
+
+    def _data_to_save(self) -> dict[str, Any]:
+        """
+        Get the persisted state.
+
+        Returns:
+            Time and counter values of the last sample
+
+        """
+        if self._last is None:
+            return {}
+        return {"time": self._last[0].isoformat(), "values": self._last[1]}
+
+    @callback
+    def _async_sample(self, reported: dict[str, Any], sampled_at: datetime) -> None:
+        """
+        Remember the counters of a sample and backfill a preceding gap.
+
+        Args:
+            reported: Raw reported data
+            sampled_at: Time the sample was taken
+
+        """
+        values = {
+            key: value
+            for key in BACKFILL_KEYS
+            if (value := scaled_number(reported, key)) is not None
+        }
+        if not values:
+            return
+
+        if self._last is not None:
+            last_at, last_values = self._last
+            if sampled_at - last_at >= MIN_GAP and _hour(last_at) < _hour(sampled_at):
+                self._async_schedule(_Gap(last_at, sampled_at, last_values, values))
+
+        self._last = (sampled_at, values)
+        if self._saved_at is None or sampled_at - self._saved_at >= SAVE_INTERVAL:
+            self._saved_at = sampled_at
+            self._store.async_delay_save(self._data_to_save)
+
+    @callback
+    def _async_schedule(self, gap: _Gap) -> None:
+        """
+        Schedule the backfill of a gap once its hours are compiled.
+
+        Args:
+            gap: Samples around the gap
+
+        """
+        self.gap_count += 1
+        self.last_gap = gap
+        _LOGGER.debug("Energy counters gap from %s to %s", gap.start, gap.end)
+        delay = _hour(gap.end) + COMPILE_DELAY - dt_util.utcnow()
+        gap_id = self._next_id
+        self._next_id += 1
+        self._pending[gap_id] = async_call_later(
+            self._hass,
+            max(0.0, delay.total_seconds()),
+            partial(self._async_backfill, gap_id, gap),
+        )
+
+    async def _async_backfill(self, gap_id: int, gap: _Gap, _now: datetime) -> None:
+        """
+        Import the interpolated hourly statistics of a gap.
+
+        Args:
+            gap_id: ID of the pending backfill
+            gap: Samples around the gap
+            _now: Time the backfill was triggered
+
+        """
+        self._pending.pop(gap_id, None)
+        if "recorder" not in self._hass.config.components:
+            return
+
+        # The recorder is an optional dependency
+        from homeassistant.components.recorder import get_instance  # noqa: PLC0415
+        from homeassistant.components.recorder.models import (  # noqa: PLC0415
+            StatisticData,
+            StatisticMetaData,
+        )
+        from homeassistant.components.recorder.statistics import (  # noqa: PLC0415
+            async_import_statistics,
+            statistics_during_period,
+        )
+
+        registry = er.async_get(self._hass)
+        first_hour = _hour(gap.start)
+        span = (gap.end - gap.start).total_seconds()
+        hours = int((_hour(gap.end) - first_hour) / HOUR)
+
+        for key in BACKFILL_KEYS:
+            entity_id = registry.async_get_entity_id(
+                "sensor", DOMAIN, f"{DOMAIN}_{self._entry_id}_{key}"
+            )
+            start_value = gap.start_values.get(key)
+            end_value = gap.end_values.get(key)
+            if (
+                entity_id is None
+                or (state := self._hass.states.get(entity_id)) is None
+                or start_value is None
+                or end_value is None
+            ):
+                continue
+            delta = end_value - start_value
+            if delta < 0:
+                _LOGGER.debug("%s dropped during the gap, not backfilled", entity_id)
+                continue
+
+            before = await get_instance(self._hass).async_add_executor_job(
+                statistics_during_period,
+                self._hass,
+                first_hour - HOUR,
+                first_hour,
+                {entity_id},
+                "hour",
+                None,
+                {"state", "sum"},
+            )
+            if not (rows := before.get(entity_id)):
+                continue
+            base_state = rows[-1].get("state")
+            base_sum = rows[-1].get("sum")
+            if base_state is None or base_sum is None:
+                continue
+
+            statistics: list[StatisticData] = []
+            for hour in range(hours):
+                start = first_hour + hour * HOUR
+                elapsed = (start + HOUR - gap.start).total_seconds()
+                value = start_value + delta * elapsed / span
+                statistics.append(
+                    StatisticData(
+                        start=start,
+                        state=round(value, 3),
+                        sum=base_sum + value - base_state,
+                    )
+                )
+            async_import_statistics(
+                self._hass,
+                StatisticMetaData(
+                    has_mean=False,
+                    has_sum=True,
+                    name=None,
+                    source="recorder",
+                    statistic_id=entity_id,
+                    unit_of_measurement=state.attributes.get(ATTR_UNIT_OF_MEASUREMENT),
+                ),
+                statistics,
+            )
+            self.row_count += len(statistics)
+            _LOGGER.info(
+                "Backfilled %d hours of %s from %s to %s",
+                len(statistics),
+                entity_id,
+                gap.start,
+                gap.end,
+            )
+
+    def get_diagnostics(self) -> dict[str, Any]:
+        """
+        Get backfill state for diagnostics.
+
+        Returns:
+            Dictionary describing the backfill
+
+        """
+        return {
+            "last_sample": self._last[0].isoformat() if self._last else None,
+            "gap_count": self.gap_count,
+            "row_count": self.row_count,
+            "pending": len(self._pending),
+            "last_gap": (
+                {
+                    "start": self.last_gap.start.isoformat(),
+                    "end": self.last_gap.end.isoformat(),
+                }
+                if self.last_gap
+                else None
+            ),
+        }
@@ -12,14 +12,11 @@ Constants:
 """
 
 import logging
-from http import HTTPStatus
 from typing import Any
 
-import async_timeout
 from homeassistant.components.button import ButtonDeviceClass, ButtonEntity
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
-from homeassistant.helpers.aiohttp_client import async_get_clientsession
 from homeassistant.helpers.entity import DeviceInfo
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
@@ -80,7 +77,6 @@ async def async_setup_entry(
                 sn=sn,
                 ip=ip,
                 device_info=device_info,
-                hass=hass,
             )
         )
 
@@ -105,7 +101,6 @@ class SunlitButton(CoordinatorEntity[SunlitDataUpdateCoordinator], ButtonEntity)
         sn: str,
         ip: str,
         device_info: DeviceInfo,
-        hass: HomeAssistant,
     ) -> None:
         """
         Initialize the button entity.
@@ -117,14 +112,12 @@ class SunlitButton(CoordinatorEntity[SunlitDataUpdateCoordinator], ButtonEntity)
             sn: Device serial number
             ip: Device IP address
             device_info: Device information
-            hass: Home Assistant instance
 
         """
         super().__init__(coordinator)
         self._key = key
         self._sn = sn
         self._ip = ip
-        self._session = async_get_clientsession(hass)
 
         meta = BUTTON_META.get(key, {})
 
@@ -145,24 +138,17 @@ class SunlitButton(CoordinatorEntity[SunlitDataUpdateCoordinator], ButtonEntity)
         Handle button press event.
 
         Sends a request to the device to perform the action associated with this button.
+        After a restart the coordinator tracks the reboot.
 
         Raises:
             RuntimeError: If there's an error pressing the button
 
         """
-        payload = {"state": {self._key: 1}}
+        values = {self._key: 1}
         try:
-            async with (
-                async_timeout.timeout(5),
-                self._session.post(
-                    f"http://{self._ip}/write",
-                    json=payload,
-                ) as resp,
-            ):
-                if resp.status != HTTPStatus.OK:
-                    text = await resp.text()
-                    msg = f"HTTP {resp.status}: {text}"
-                    raise RuntimeError(msg)
+            await self.coordinator.async_write(values)
         except Exception as err:
             _LOGGER.exception("Error pressing button %s: %s", self._key, err)
             raise
+        if self._key == "RT":
+            self.coordinator.async_expect_restart()
@@ -7,32 +7,110 @@ information retrieval.
 
 Classes:
 - SunlitConfigFlow: Main configuration flow handler for the integration
+- SunlitOptionsFlow: Options flow handler for the integration
 - InvalidIP: Exception raised for invalid IP addresses
 - CannotConnect: Exception raised when unable to connect to the device
 - CannotGetSN: Exception raised when unable to retrieve device serial number
 - CannotGetModel: Exception raised when unable to retrieve device model
+- InvalidDeadband: Exception raised for malformed deadband overrides
+- InvalidRange: Exception raised for malformed or oversized scan ranges
 
 Functions:
 - _validate_input: Validates the provided IP address
-- _get_device_info: Retrieves device information from the given host
+- _get_device_info: Retrieves device information, cached, from the given host
+- _async_probe: Reads device information from the given host
+- _parse_scan_hosts: Parses the addresses and CIDR ranges to scan
+- _async_scan: Probes many addresses concurrently for devices
+- _parse_deadbands: Parses deadband overrides entered in the options flow
+- _format_deadbands: Formats stored deadband overrides for the options flow
 """
 
+import asyncio
 import ipaddress
 import logging
-from http import HTTPStatus
+from dataclasses import dataclass, field
+from time import monotonic
 from typing import Any
 
-import aiohttp
-import async_timeout
 import voluptuous as vol
 from homeassistant import config_entries, exceptions
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.data_entry_flow import AbortFlow, FlowResult
+from homeassistant.helpers import selector
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
 from homeassistant.helpers.service_info.zeroconf import ZeroconfServiceInfo
 
-from .const import DOMAIN, HOST_PREFIX, HOST_SUFFIX
+from .api import SunEnergyXTClient, SunEnergyXTError
+from .const import (
+    CONF_ALIGNED_POLLING,
+    CONF_DEADBAND_MAX_AGE,
+    CONF_DEADBANDS,
+    CONF_EXPORT_ENABLED,
+    CONF_EXPORT_KEEP,
+    CONF_EXPORT_MAX_AGE,
+    CONF_EXPORT_MAX_SIZE,
+    CONF_HISTORY_DAYS,
+    CONF_HISTORY_ENABLED,
+    CONF_OPTIMIZER_BASE_LOAD,
+    CONF_OPTIMIZER_CAPACITY,
+    CONF_OPTIMIZER_EXPORT_FACTOR,
+    CONF_OPTIMIZER_INTERVAL,
+    CONF_OPTIMIZER_PRICE_ENTITY,
+    CONF_OPTIMIZER_PV_ENTITY,
+    CONF_PUBLISH_INTERVAL,
+    CONF_SAMPLE_INTERVAL,
+    CONF_STALE_GRACE_PERIOD,
+    CONF_STATISTICS_ENABLED,
+    CONF_ZERO_EXPORT_DEADBAND,
+    CONF_ZERO_EXPORT_KI,
+    CONF_ZERO_EXPORT_KP,
+    CONF_ZERO_EXPORT_METER,
+    CONF_ZERO_EXPORT_SLEW_RATE,
+    CONF_ZERO_EXPORT_TARGET,
+    DEFAULT_DEADBAND_MAX_AGE,
+    DEFAULT_EXPORT_KEEP,
+    DEFAULT_EXPORT_MAX_AGE,
+    DEFAULT_EXPORT_MAX_SIZE,
+    DEFAULT_HISTORY_DAYS,
+    DEFAULT_OPTIMIZER_BASE_LOAD,
+    DEFAULT_OPTIMIZER_CAPACITY,
+    DEFAULT_OPTIMIZER_EXPORT_FACTOR,
+    DEFAULT_OPTIMIZER_INTERVAL,
+    DEFAULT_PUBLISH_INTERVAL,
+    DEFAULT_SAMPLE_INTERVAL,
+    DEFAULT_STALE_GRACE_PERIOD,
+    DEFAULT_ZERO_EXPORT_DEADBAND,
+    DEFAULT_ZERO_EXPORT_KI,
+    DEFAULT_ZERO_EXPORT_KP,
+    DEFAULT_ZERO_EXPORT_SLEW_RATE,
+    DEFAULT_ZERO_EXPORT_TARGET,
+    DOMAIN,
+    HOST_PREFIX,
+    HOST_SUFFIX,
+)
 
 _LOGGER = logging.getLogger(__name__)
 
+# Most addresses a scan may probe, a /22 network
+MAX_SCAN_HOSTS = 1024
+# Addresses probed at the same time and seconds allowed per probe
+SCAN_WORKERS = 32
+SCAN_TIMEOUT = 2
+# Seconds a successful probe of a host is reused, so repeated announcements
+# and confirmations of the same device cost one read
+PROBE_CACHE_TTL = 60
+PROBE_CACHE = f"{DOMAIN}_probe_cache"
+
+
+@dataclass
+class _ProbeCache:
+    """Recent and running probes, shared by all flows."""
+
+    # Host to the time of the probe and the device information it returned
+    results: dict[str, tuple[float, dict[str, Any]]] = field(default_factory=dict)
+    # Host to the probe running for it
+    running: dict[str, asyncio.Task[dict[str, Any]]] = field(default_factory=dict)
+
 
 async def _validate_input(ip: str) -> None:
     """
@@ -51,12 +129,70 @@ async def _validate_input(ip: str) -> None:
         raise InvalidIP from err
 
 
-async def _get_device_info(host: str) -> dict[str, Any]:
+async def _get_device_info(
+    hass: HomeAssistant,
+    host: str,
+    read_timeout: float = 5,
+    sn: str | None = None,
+) -> dict[str, Any]:
     """
     Retrieve device information from the given host.
 
+    A successful probe of the host within PROBE_CACHE_TTL is reused, unless
+    it found another serial number than expected, and concurrent calls for
+    the same host share one probe. Failures are not cached.
+
+    Args:
+        hass: Home Assistant instance
+        host: Hostname or IP address of the device
+        read_timeout: Seconds allowed for reading the device
+        sn: Serial number expected at the host, if known
+
+    Returns:
+        Dictionary containing device serial number and model
+
+    Raises:
+        CannotConnect: If unable to connect to the device
+        CannotGetSN: If unable to retrieve device serial number
+        CannotGetModel: If unable to retrieve device model
+
+    """
+    cache: _ProbeCache = hass.data.setdefault(PROBE_CACHE, _ProbeCache())
+    if (cached := cache.results.get(host)) is not None:
+        probed_at, info = cached
+        if monotonic() - probed_at < PROBE_CACHE_TTL and sn in (None, info["sn"]):
+            return info
+        del cache.results[host]
+
+    if (task := cache.running.get(host)) is None:
+        task = hass.async_create_task(
+            _async_probe(hass, host, read_timeout), f"{DOMAIN} probe {host}"
+        )
+        cache.running[host] = task
+
+        def done(task: asyncio.Task[dict[str, Any]]) -> None:
+            cache.running.pop(host, None)
+            # Retrieved here as well, in case every waiting flow went away
+            if not task.cancelled():
+                task.exception()
+
+        task.add_done_callback(done)
+    # A flow that is abandoned does not cancel the probe other flows wait for
+    info = await asyncio.shield(task)
+    cache.results[host] = (monotonic(), info)
+    return info
+
+
+async def _async_probe(
+    hass: HomeAssistant, host: str, read_timeout: float
+) -> dict[str, Any]:
+    """
+    Read device information from the given host.
+
     Args:
+        hass: Home Assistant instance
         host: Hostname or IP address of the device
+        read_timeout: Seconds allowed for reading the device
 
     Returns:
         Dictionary containing device serial number and model
@@ -67,22 +203,150 @@ async def _get_device_info(host: str) -> dict[str, Any]:
         CannotGetModel: If unable to retrieve device model
 
     """
+    client = SunEnergyXTClient(
+        async_get_clientsession(hass), host, read_timeout=read_timeout
+    )
     try:
-        async with async_timeout.timeout(5), aiohttp.ClientSession() as session:
-            async with session.get(f"http://{host}/read") as resp:
-                if resp.status != HTTPStatus.OK:
-                    raise CannotConnect
-                data = await resp.json()
-                sn = data.get("state", {}).get("reported", {}).get("SN")
-                model = data.get("state", {}).get("reported", {}).get("DevType")
-                if not isinstance(sn, str):
-                    raise CannotGetSN
-                if not isinstance(model, str):
-                    raise CannotGetModel
-                return {"sn": sn, "model": model}
-    except Exception:  # noqa: BLE001
+        reported = await client.async_read()
+    except SunEnergyXTError:
         raise CannotConnect from None
 
+    sn = reported.get("SN")
+    model = reported.get("DevType")
+    if not isinstance(sn, str):
+        raise CannotGetSN
+    if not isinstance(model, str):
+        raise CannotGetModel
+    return {"sn": sn, "model": model}
+
+
+def _parse_scan_hosts(text: str) -> list[str]:
+    """
+    Parse the addresses and CIDR ranges to scan.
+
+    Args:
+        text: Comma or whitespace separated IPv4 addresses and CIDR ranges,
+            e.g. ``192.168.1.0/24, 10.0.0.5``
+
+    Returns:
+        Addresses to probe, without duplicates, in the order entered
+
+    Raises:
+        InvalidRange: If an item is malformed, nothing was entered or more
+            than MAX_SCAN_HOSTS addresses would be probed
+
+    """
+    hosts: dict[str, None] = {}
+    for item in text.replace(",", " ").split():
+        try:
+            network = ipaddress.IPv4Network(item, strict=False)
+        except ValueError as err:
+            raise InvalidRange from err
+        if network.num_addresses > MAX_SCAN_HOSTS:
+            raise InvalidRange
+        addresses = network.hosts() if network.num_addresses > 1 else [network[0]]
+        hosts.update(dict.fromkeys(str(address) for address in addresses))
+        if len(hosts) > MAX_SCAN_HOSTS:
+            raise InvalidRange
+    if not hosts:
+        raise InvalidRange
+    return list(hosts)
+
+
+async def _async_scan(
+    hass: HomeAssistant, hosts: list[str]
+) -> dict[str, dict[str, Any]]:
+    """
+    Probe many addresses concurrently for devices.
+
+    At most SCAN_WORKERS addresses are probed at the same time, each with a
+    SCAN_TIMEOUT read timeout.
+
+    Args:
+        hass: Home Assistant instance
+        hosts: Addresses to probe
+
+    Returns:
+        Dictionary mapping the serial number of every device found to its
+        IP address, serial number and model
+
+    """
+    semaphore = asyncio.Semaphore(SCAN_WORKERS)
+
+    async def probe(host: str) -> dict[str, Any] | None:
+        async with semaphore:
+            try:
+                info = await _get_device_info(hass, host, SCAN_TIMEOUT)
+            except (CannotConnect, CannotGetSN, CannotGetModel):
+                return None
+        return {"ip": host, **info}
+
+    found: dict[str, dict[str, Any]] = {}
+    for device in await asyncio.gather(*(probe(host) for host in hosts)):
+        if device is not None:
+            found.setdefault(device["sn"], device)
+    return found
+
+
+def _parse_deadbands(text: str) -> dict[str, dict[str, float]]:
+    """
+    Parse deadband overrides entered in the options flow.
+
+    Overrides are comma separated ``KEY=VALUE`` pairs. A value ending in ``%``
+    is a deadband relative to the last published value, anything else is an
+    absolute deadband in the sensor's unit, e.g. ``PV1=2%, GP=5, VP1=0.5``.
+
+    Args:
+        text: Raw overrides as entered by the user
+
+    Returns:
+        Dictionary mapping sensor keys to their deadband settings
+
+    Raises:
+        InvalidDeadband: If an override is malformed
+
+    """
+    deadbands: dict[str, dict[str, float]] = {}
+    for item in text.split(","):
+        if not item.strip():
+            continue
+        key, sep, value = item.partition("=")
+        key = key.strip().upper()
+        value = value.strip()
+        if not sep or not key:
+            raise InvalidDeadband
+        try:
+            if value.endswith("%"):
+                deadband = {"deadband_rel": float(value[:-1]) / 100}
+            else:
+                deadband = {"deadband": float(value)}
+        except ValueError as err:
+            raise InvalidDeadband from err
+        if next(iter(deadband.values())) < 0:
+            raise InvalidDeadband
+        deadbands[key] = deadband
+    return deadbands
+
+
+def _format_deadbands(deadbands: dict[str, dict[str, float]]) -> str:
+    """
+    Format stored deadband overrides for display in the options flow.
+
+    Args:
+        deadbands: Dictionary mapping sensor keys to their deadband settings
+
+    Returns:
+        Overrides as comma separated ``KEY=VALUE`` pairs
+
+    """
+    items = []
+    for key, deadband in deadbands.items():
+        if "deadband_rel" in deadband:
+            items.append(f"{key}={deadband['deadband_rel'] * 100:g}%")
+        elif "deadband" in deadband:
+            items.append(f"{key}={deadband['deadband']:g}")
+    return ", ".join(items)
+
 
 class SunlitConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     """
@@ -92,6 +356,7 @@ class SunlitConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     including:
     - User input validation for IP addresses
     - Device discovery via Zeroconf
+    - Scans of address ranges adding every device found
     - Device information retrieval
     - Configuration entry creation
     - Error handling for various failure scenarios
@@ -110,7 +375,40 @@ class SunlitConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         self._discovered_ip: str | None = None
         self._discovered_model: str | None = None
 
+    @staticmethod
+    @callback
+    def async_get_options_flow(
+        config_entry: config_entries.ConfigEntry,  # noqa: ARG004
+    ) -> config_entries.OptionsFlow:
+        """
+        Get the options flow for this handler.
+
+        Args:
+            config_entry: Config entry to configure
+
+        Returns:
+            Options flow handler
+
+        """
+        return SunlitOptionsFlow()
+
     async def async_step_user(
+        self,
+        user_input: dict[str, Any] | None = None,  # noqa: ARG002
+    ) -> FlowResult:
+        """
+        Let the user add one device by address or scan for devices.
+
+        Args:
+            user_input: Dictionary containing user input
+
+        Returns:
+            FlowResult showing the setup menu
+
+        """
+        return self.async_show_menu(step_id="user", menu_options=["manual", "scan"])
+
+    async def async_step_manual(
         self, user_input: dict[str, Any] | None = None
     ) -> FlowResult:
         """
@@ -130,13 +428,15 @@ class SunlitConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                 ip = user_input["IP"]
                 _LOGGER.debug("user input ip: %s", ip)
                 await _validate_input(ip)
-                info = await _get_device_info(ip)
+                info = await _get_device_info(self.hass, ip)
                 sn = info["sn"]
                 model = info["model"]
                 _LOGGER.debug("get sn: %s, model: %s", sn, model)
 
                 await self.async_set_unique_id(sn)
-                self._abort_if_unique_id_configured(updates={"ip": ip})
+                self._abort_if_unique_id_configured(
+                    updates={"ip": ip}, reload_on_update=False
+                )
 
             except InvalidIP:
                 errors["base"] = "invalid_ip"
@@ -174,11 +474,108 @@ class SunlitConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                 )
 
         return self.async_show_form(
-            step_id="user",
+            step_id="manual",
             data_schema=vol.Schema({vol.Required("IP"): str}),
             errors=errors,
         )
 
+    async def async_step_scan(
+        self, user_input: dict[str, Any] | None = None
+    ) -> FlowResult:
+        """
+        Scan addresses for devices and add every new one.
+
+        The first new device is added by this flow, the others through an
+        import flow each.
+
+        Args:
+            user_input: Dictionary containing user input
+
+        Returns:
+            FlowResult indicating the next step in the configuration flow
+
+        """
+        errors: dict[str, str] = {}
+
+        if user_input is not None:
+            try:
+                hosts = _parse_scan_hosts(user_input["hosts"])
+            except InvalidRange:
+                errors["base"] = "invalid_range"
+            else:
+                found = await _async_scan(self.hass, hosts)
+                _LOGGER.debug("Scanned %d addresses, found %s", len(hosts), found)
+                configured = self._async_current_ids(include_ignore=False)
+                new = [info for sn, info in found.items() if sn not in configured]
+                if not new:
+                    errors["base"] = "no_devices_found"
+                else:
+                    return await self._async_add_scanned(new)
+
+        return self.async_show_form(
+            step_id="scan",
+            data_schema=vol.Schema({vol.Required("hosts"): str}),
+            errors=errors,
+        )
+
+    async def _async_add_scanned(self, new: list[dict[str, Any]]) -> FlowResult:
+        """
+        Add the scanned new devices.
+
+        This flow claims the first device no other flow is adding before the
+        import flows for the remaining ones are started.
+
+        Args:
+            new: IP address, serial number and model of each new device
+
+        Returns:
+            FlowResult creating the config entry of the claimed device
+
+        """
+        for index, info in enumerate(new):
+            try:
+                await self.async_set_unique_id(info["sn"])
+            except AbortFlow:
+                # Another flow, such as a zeroconf discovery, is adding it
+                continue
+            self._abort_if_unique_id_configured(
+                updates={"ip": info["ip"]}, reload_on_update=False
+            )
+            for other in new[index + 1 :]:
+                self.hass.async_create_task(
+                    self.hass.config_entries.flow.async_init(
+                        DOMAIN,
+                        context={"source": config_entries.SOURCE_IMPORT},
+                        data=other,
+                    )
+                )
+            return self.async_create_entry(title=info["model"], data=info)
+        return self.async_abort(reason="already_in_progress")
+
+    async def async_step_import(self, import_data: dict[str, Any]) -> FlowResult:
+        """
+        Add a device found by a scan.
+
+        Args:
+            import_data: IP address, serial number and model of the device
+
+        Returns:
+            FlowResult creating the config entry
+
+        """
+        await self.async_set_unique_id(import_data["sn"])
+        self._abort_if_unique_id_configured(
+            updates={"ip": import_data["ip"]}, reload_on_update=False
+        )
+        return self.async_create_entry(
+            title=import_data["model"],
+            data={
+                "ip": import_data["ip"],
+                "sn": import_data["sn"],
+                "model": import_data["model"],
+            },
+        )
+
     async def async_step_zeroconf(
         self, discovery_info: ZeroconfServiceInfo
     ) -> FlowResult:
@@ -200,8 +597,14 @@ class SunlitConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         ip = str(discovery_info.host)
         model = discovery_info.properties["model"]
 
+        # Announcements repeat constantly; a device that is set up at this
+        # address needs no further work
+        for entry in self._async_current_entries(include_ignore=False):
+            if entry.unique_id == sn and entry.data.get("ip") == ip:
+                return self.async_abort(reason="already_configured")
+
         await self.async_set_unique_id(sn)
-        self._abort_if_unique_id_configured(updates={"ip": ip})
+        self._abort_if_unique_id_configured(updates={"ip": ip}, reload_on_update=False)
 
         _LOGGER.debug("Zeroconf discovery: %s", discovery_info)
 
@@ -236,13 +639,15 @@ class SunlitConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             try:
                 _LOGGER.debug("zeroconf discover ip: %s", ip)
                 await _validate_input(ip)
-                info = await _get_device_info(ip)
+                info = await _get_device_info(self.hass, ip, sn=sn)
                 sn = info["sn"]
                 model = info["model"]
                 _LOGGER.debug("get sn: %s, model: %s", sn, model)
 
                 await self.async_set_unique_id(sn)
-                self._abort_if_unique_id_configured(updates={"ip": ip})
+                self._abort_if_unique_id_configured(
+                    updates={"ip": ip}, reload_on_update=False
+                )
 
             except CannotConnect:
                 return self.async_abort(reason="cannot_connect")
@@ -279,6 +684,364 @@ class SunlitConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         )
 
 
+class SunlitOptionsFlow(config_entries.OptionsFlow):
+    """
+    Options flow handler for SunEnergyXT integration.
+
+    Lets the user tune runtime behaviour of an existing device, such as how long
+    the last good data is kept after the device stops answering, and configure
+    the zero-export control loop, the time-of-use optimiser and the raw sample
+    export.
+    """
+
+    async def async_step_init(
+        self,
+        user_input: dict[str, Any] | None = None,  # noqa: ARG002
+    ) -> FlowResult:
+        """
+        Show the options menu.
+
+        Args:
+            user_input: Dictionary containing user input
+
+        Returns:
+            FlowResult showing the options menu
+
+        """
+        return self.async_show_menu(
+            step_id="init",
+            menu_options=[
+                "general",
+                "zero_export",
+                "optimizer",
+                "export",
+                "statistics",
+                "history",
+            ],
+        )
+
+    async def async_step_general(
+        self, user_input: dict[str, Any] | None = None
+    ) -> FlowResult:
+        """
+        Manage the polling and publishing options.
+
+        Args:
+            user_input: Dictionary containing user input
+
+        Returns:
+            FlowResult indicating the next step in the options flow
+
+        """
+        errors: dict[str, str] = {}
+        options = self.config_entry.options
+
+        if user_input is not None:
+            try:
+                # A cleared field is left out of the input and removes the overrides
+                deadbands = _parse_deadbands(user_input.get(CONF_DEADBANDS, ""))
+            except InvalidDeadband:
+                errors[CONF_DEADBANDS] = "invalid_deadbands"
+            else:
+                return self.async_create_entry(
+                    title="",
+                    data={**options, **user_input, CONF_DEADBANDS: deadbands},
+                )
+
+        return self.async_show_form(
+            step_id="general",
+            data_schema=vol.Schema(
+                {
+                    vol.Optional(
+                        CONF_SAMPLE_INTERVAL,
+                        default=options.get(
+                            CONF_SAMPLE_INTERVAL, DEFAULT_SAMPLE_INTERVAL
+                        ),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=1, max=300)),
+                    vol.Optional(
+                        CONF_ALIGNED_POLLING,
+                        default=options.get(CONF_ALIGNED_POLLING, False),
+                    ): bool,
+                    vol.Optional(
+                        CONF_PUBLISH_INTERVAL,
+                        default=options.get(
+                            CONF_PUBLISH_INTERVAL, DEFAULT_PUBLISH_INTERVAL
+                        ),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=1, max=3600)),
+                    vol.Optional(
+                        CONF_STALE_GRACE_PERIOD,
+                        default=options.get(
+                            CONF_STALE_GRACE_PERIOD, DEFAULT_STALE_GRACE_PERIOD
+                        ),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=0, max=3600)),
+                    vol.Optional(
+                        CONF_DEADBANDS,
+                        description={
+                            "suggested_value": _format_deadbands(
+                                options.get(CONF_DEADBANDS, {})
+                            )
+                        },
+                    ): str,
+                    vol.Optional(
+                        CONF_DEADBAND_MAX_AGE,
+                        default=options.get(
+                            CONF_DEADBAND_MAX_AGE, DEFAULT_DEADBAND_MAX_AGE
+                        ),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=1, max=3600)),
+                }
+            ),
+            errors=errors,
+        )
+
+    async def async_step_zero_export(
+        self, user_input: dict[str, Any] | None = None
+    ) -> FlowResult:
+        """
+        Manage the zero-export control loop options.
+
+        Args:
+            user_input: Dictionary containing user input
+
+        Returns:
+            FlowResult indicating the next step in the options flow
+
+        """
+        options = self.config_entry.options
+
+        if user_input is not None:
+            data = {**options, **user_input}
+            if CONF_ZERO_EXPORT_METER not in user_input:
+                data.pop(CONF_ZERO_EXPORT_METER, None)
+            return self.async_create_entry(title="", data=data)
+
+        return self.async_show_form(
+            step_id="zero_export",
+            data_schema=vol.Schema(
+                {
+                    vol.Optional(
+                        CONF_ZERO_EXPORT_METER,
+                        description={
+                            "suggested_value": options.get(CONF_ZERO_EXPORT_METER)
+                        },
+                    ): selector.EntitySelector(
+                        selector.EntitySelectorConfig(domain="sensor")
+                    ),
+                    vol.Optional(
+                        CONF_ZERO_EXPORT_TARGET,
+                        default=options.get(
+                            CONF_ZERO_EXPORT_TARGET, DEFAULT_ZERO_EXPORT_TARGET
+                        ),
+                    ): vol.All(vol.Coerce(float), vol.Range(min=-2400, max=2400)),
+                    vol.Optional(
+                        CONF_ZERO_EXPORT_KP,
+                        default=options.get(
+                            CONF_ZERO_EXPORT_KP, DEFAULT_ZERO_EXPORT_KP
+                        ),
+                    ): vol.All(vol.Coerce(float), vol.Range(min=0, max=10)),
+                    vol.Optional(
+                        CONF_ZERO_EXPORT_KI,
+                        default=options.get(
+                            CONF_ZERO_EXPORT_KI, DEFAULT_ZERO_EXPORT_KI
+                        ),
+                    ): vol.All(vol.Coerce(float), vol.Range(min=0, max=10)),
+                    vol.Optional(
+                        CONF_ZERO_EXPORT_DEADBAND,
+                        default=options.get(
+                            CONF_ZERO_EXPORT_DEADBAND, DEFAULT_ZERO_EXPORT_DEADBAND
+                        ),
+                    ): vol.All(vol.Coerce(float), vol.Range(min=0, max=500)),
+                    vol.Optional(
+                        CONF_ZERO_EXPORT_SLEW_RATE,
+                        default=options.get(
+                            CONF_ZERO_EXPORT_SLEW_RATE, DEFAULT_ZERO_EXPORT_SLEW_RATE
+                        ),
+                    ): vol.All(vol.Coerce(float), vol.Range(min=1, max=5000)),
+                }
+            ),
+        )
+
+    async def async_step_optimizer(
+        self, user_input: dict[str, Any] | None = None
+    ) -> FlowResult:
+        """
+        Manage the time-of-use optimiser options.
+
+        Args:
+            user_input: Dictionary containing user input
+
+        Returns:
+            FlowResult indicating the next step in the options flow
+
+        """
+        options = self.config_entry.options
+
+        if user_input is not None:
+            data = {**options, **user_input}
+            for key in (CONF_OPTIMIZER_PRICE_ENTITY, CONF_OPTIMIZER_PV_ENTITY):
+                if key not in user_input:
+                    data.pop(key, None)
+            return self.async_create_entry(title="", data=data)
+
+        return self.async_show_form(
+            step_id="optimizer",
+            data_schema=vol.Schema(
+                {
+                    vol.Optional(
+                        CONF_OPTIMIZER_PRICE_ENTITY,
+                        description={
+                            "suggested_value": options.get(CONF_OPTIMIZER_PRICE_ENTITY)
+                        },
+                    ): selector.EntitySelector(
+                        selector.EntitySelectorConfig(domain="sensor")
+                    ),
+                    vol.Optional(
+                        CONF_OPTIMIZER_PV_ENTITY,
+                        description={
+                            "suggested_value": options.get(CONF_OPTIMIZER_PV_ENTITY)
+                        },
+                    ): selector.EntitySelector(
+                        selector.EntitySelectorConfig(domain="sensor")
+                    ),
+                    vol.Optional(
+                        CONF_OPTIMIZER_CAPACITY,
+                        default=options.get(
+                            CONF_OPTIMIZER_CAPACITY, DEFAULT_OPTIMIZER_CAPACITY
+                        ),
+                    ): vol.All(vol.Coerce(float), vol.Range(min=0.1, max=100)),
+                    vol.Optional(
+                        CONF_OPTIMIZER_BASE_LOAD,
+                        default=options.get(
+                            CONF_OPTIMIZER_BASE_LOAD, DEFAULT_OPTIMIZER_BASE_LOAD
+                        ),
+                    ): vol.All(vol.Coerce(float), vol.Range(min=0, max=10000)),
+                    vol.Optional(
+                        CONF_OPTIMIZER_EXPORT_FACTOR,
+                        default=options.get(
+                            CONF_OPTIMIZER_EXPORT_FACTOR,
+                            DEFAULT_OPTIMIZER_EXPORT_FACTOR,
+                        ),
+                    ): vol.All(vol.Coerce(float), vol.Range(min=0, max=1)),
+                    vol.Optional(
+                        CONF_OPTIMIZER_INTERVAL,
+                        default=options.get(
+                            CONF_OPTIMIZER_INTERVAL, DEFAULT_OPTIMIZER_INTERVAL
+                        ),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=1, max=1440)),
+                }
+            ),
+        )
+
+    async def async_step_export(
+        self, user_input: dict[str, Any] | None = None
+    ) -> FlowResult:
+        """
+        Manage the raw sample export options.
+
+        Args:
+            user_input: Dictionary containing user input
+
+        Returns:
+            FlowResult indicating the next step in the options flow
+
+        """
+        options = self.config_entry.options
+
+        if user_input is not None:
+            return self.async_create_entry(title="", data={**options, **user_input})
+
+        return self.async_show_form(
+            step_id="export",
+            data_schema=vol.Schema(
+                {
+                    vol.Optional(
+                        CONF_EXPORT_ENABLED,
+                        default=options.get(CONF_EXPORT_ENABLED, False),
+                    ): bool,
+                    vol.Optional(
+                        CONF_EXPORT_MAX_SIZE,
+                        default=options.get(
+                            CONF_EXPORT_MAX_SIZE, DEFAULT_EXPORT_MAX_SIZE
+                        ),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=1, max=1024)),
+                    vol.Optional(
+                        CONF_EXPORT_MAX_AGE,
+                        default=options.get(
+                            CONF_EXPORT_MAX_AGE, DEFAULT_EXPORT_MAX_AGE
+                        ),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=1, max=720)),
+                    vol.Optional(
+                        CONF_EXPORT_KEEP,
+                        default=options.get(CONF_EXPORT_KEEP, DEFAULT_EXPORT_KEEP),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=1, max=1000)),
+                }
+            ),
+        )
+
+    async def async_step_statistics(
+        self, user_input: dict[str, Any] | None = None
+    ) -> FlowResult:
+        """
+        Manage the direct statistics import option.
+
+        Args:
+            user_input: Dictionary containing user input
+
+        Returns:
+            FlowResult indicating the next step in the options flow
+
+        """
+        options = self.config_entry.options
+
+        if user_input is not None:
+            return self.async_create_entry(title="", data={**options, **user_input})
+
+        return self.async_show_form(
+            step_id="statistics",
+            data_schema=vol.Schema(
+                {
+                    vol.Optional(
+                        CONF_STATISTICS_ENABLED,
+                        default=options.get(CONF_STATISTICS_ENABLED, False),
+                    ): bool,
+                }
+            ),
+        )
+
+    async def async_step_history(
+        self, user_input: dict[str, Any] | None = None
+    ) -> FlowResult:
+        """
+        Manage the sample history options.
+
+        Args:
+            user_input: Dictionary containing user input
+
+        Returns:
+            FlowResult indicating the next step in the options flow
+
+        """
+        options = self.config_entry.options
+
+        if user_input is not None:
+            return self.async_create_entry(title="", data={**options, **user_input})
+
+        return self.async_show_form(
+            step_id="history",
+            data_schema=vol.Schema(
+                {
+                    vol.Optional(
+                        CONF_HISTORY_ENABLED,
+                        default=options.get(CONF_HISTORY_ENABLED, False),
+                    ): bool,
+                    vol.Optional(
+                        CONF_HISTORY_DAYS,
+                        default=options.get(CONF_HISTORY_DAYS, DEFAULT_HISTORY_DAYS),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=1, max=90)),
+                }
+            ),
+        )
+
+
 class InvalidIP(exceptions.HomeAssistantError):
     """Input invalid IP."""
 
@@ -293,3 +1056,11 @@ class CannotGetSN(exceptions.HomeAssistantError):
 
 class CannotGetModel(exceptions.HomeAssistantError):
     """Error to indicate we cannot get Model."""
+
+
+class InvalidDeadband(exceptions.HomeAssistantError):
+    """Error to indicate a malformed deadband override."""
+
+
+class InvalidRange(exceptions.HomeAssistantError):
+    """Error to indicate malformed or oversized scan ranges."""
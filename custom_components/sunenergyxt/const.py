@@ -7,8 +7,84 @@ Constants:
 - DOMAIN: The integration domain name
 - HOST_PREFIX: Prefix for SunEnergyXT device hostnames
 - HOST_SUFFIX: Suffix for SunEnergyXT device hostnames
+- CONF_STALE_GRACE_PERIOD: Option key for the stale data grace period
+- DEFAULT_STALE_GRACE_PERIOD: Default stale data grace period in seconds
+- CONF_DEADBANDS: Option key for per-sensor deadband overrides
+- CONF_DEADBAND_MAX_AGE: Option key for the deadband max-age timer
+- DEFAULT_DEADBAND_MAX_AGE: Default deadband max-age in seconds
+- CONF_SAMPLE_INTERVAL: Option key for the device sampling interval
+- CONF_PUBLISH_INTERVAL: Option key for the entity state publish interval
+- DEFAULT_SAMPLE_INTERVAL: Default sampling interval in seconds
+- DEFAULT_PUBLISH_INTERVAL: Default publish interval in seconds
+- CONF_ALIGNED_POLLING: Option key for polling on a fixed wall-clock grid
+- CONF_ZERO_EXPORT_*: Option keys for the zero-export control loop
+- DEFAULT_ZERO_EXPORT_*: Defaults for the zero-export control loop
+- CONF_TIMELINE: Option key for the daily setpoint timeline
+- CONF_OPTIMIZER_*: Option keys for the time-of-use dispatch optimiser
+- DEFAULT_OPTIMIZER_*: Defaults for the time-of-use dispatch optimiser
+- CONF_EXPORT_*: Option keys for the raw sample export sink
+- DEFAULT_EXPORT_*: Defaults for the raw sample export sink
+- EXPORT_DIRECTORY: Directory below the config directory for exported samples
+- CONF_STATISTICS_ENABLED: Option key enabling the direct statistics import
+- CONF_HISTORY_*: Option keys for the compact sample history store
+- DEFAULT_HISTORY_DAYS: Default number of days of sample history to keep
+- HISTORY_DIRECTORY: Directory below the config directory for sample history
 """
 
 DOMAIN = "sunenergyxt"
 HOST_PREFIX = "SunEnergyXT_AIO_"
 HOST_SUFFIX = ".local"
+
+CONF_STALE_GRACE_PERIOD = "stale_grace_period"
+DEFAULT_STALE_GRACE_PERIOD = 30
+
+CONF_DEADBANDS = "deadbands"
+CONF_DEADBAND_MAX_AGE = "deadband_max_age"
+DEFAULT_DEADBAND_MAX_AGE = 300
+
+CONF_SAMPLE_INTERVAL = "sample_interval"
+CONF_PUBLISH_INTERVAL = "publish_interval"
+DEFAULT_SAMPLE_INTERVAL = 3
+DEFAULT_PUBLISH_INTERVAL = 3
+CONF_ALIGNED_POLLING = "aligned_polling"
+
+CONF_ZERO_EXPORT_METER = "zero_export_meter"
+CONF_ZERO_EXPORT_TARGET = "zero_export_target"
+CONF_ZERO_EXPORT_KP = "zero_export_kp"
+CONF_ZERO_EXPORT_KI = "zero_export_ki"
+CONF_ZERO_EXPORT_DEADBAND = "zero_export_deadband"
+CONF_ZERO_EXPORT_SLEW_RATE = "zero_export_slew_rate"
+DEFAULT_ZERO_EXPORT_TARGET = 0
+DEFAULT_ZERO_EXPORT_KP = 0.3
+DEFAULT_ZERO_EXPORT_KI = 0.5
+DEFAULT_ZERO_EXPORT_DEADBAND = 20
+DEFAULT_ZERO_EXPORT_SLEW_RATE = 200
+
+CONF_TIMELINE = "timeline"
+
+CONF_OPTIMIZER_PRICE_ENTITY = "optimizer_price_entity"
+CONF_OPTIMIZER_PV_ENTITY = "optimizer_pv_entity"
+CONF_OPTIMIZER_CAPACITY = "optimizer_capacity"
+CONF_OPTIMIZER_BASE_LOAD = "optimizer_base_load"
+CONF_OPTIMIZER_EXPORT_FACTOR = "optimizer_export_factor"
+CONF_OPTIMIZER_INTERVAL = "optimizer_interval"
+DEFAULT_OPTIMIZER_CAPACITY = 2.0
+DEFAULT_OPTIMIZER_BASE_LOAD = 200
+DEFAULT_OPTIMIZER_EXPORT_FACTOR = 0.0
+DEFAULT_OPTIMIZER_INTERVAL = 15
+
+CONF_EXPORT_ENABLED = "export_enabled"
+CONF_EXPORT_MAX_SIZE = "export_max_size"
+CONF_EXPORT_MAX_AGE = "export_max_age"
+CONF_EXPORT_KEEP = "export_keep"
+DEFAULT_EXPORT_MAX_SIZE = 10
+DEFAULT_EXPORT_MAX_AGE = 24
+DEFAULT_EXPORT_KEEP = 14
+EXPORT_DIRECTORY = "sunenergyxt_export"
+
+CONF_STATISTICS_ENABLED = "statistics_enabled"
+
+CONF_HISTORY_ENABLED = "history_enabled"
+CONF_HISTORY_DAYS = "history_days"
+DEFAULT_HISTORY_DAYS = 7
+HISTORY_DIRECTORY = "sunenergyxt_history"
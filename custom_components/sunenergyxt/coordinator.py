@@ -8,29 +8,91 @@ Classes:
 - SunlitDataUpdateCoordinator: Handles data updates from SunEnergyXT devices
 """
 
+from __future__ import annotations
+
+import asyncio
 import logging
+from collections.abc import Awaitable, Callable
 from datetime import UTC, datetime, timedelta
-from http import HTTPStatus
-from typing import Any
+from functools import partial
+from time import monotonic, time
+from typing import TYPE_CHECKING, Any
 
-import async_timeout
-from homeassistant.core import HomeAssistant
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
 from homeassistant.helpers.update_coordinator import (
     DataUpdateCoordinator,
 )
 
+from .api import SunEnergyXTClient, SunEnergyXTError
+from .const import (
+    DEFAULT_PUBLISH_INTERVAL,
+    DEFAULT_SAMPLE_INTERVAL,
+    DEFAULT_STALE_GRACE_PERIOD,
+)
+
+if TYPE_CHECKING:
+    from .resolver import HostResolver
+
 _LOGGER = logging.getLogger(__name__)
 
+SampleListener = Callable[[dict[str, Any], datetime], None]
+WriteListener = Callable[[dict[str, Any], bool, bool], None]
+
+# Longest expected reboot after a restart command; read errors within it are
+# not logged and do not make the entities unavailable
+RESTART_WINDOW = timedelta(seconds=120)
+# Seconds between probes and seconds allowed per probe while restarting
+RESTART_PROBE_INTERVAL = 1
+RESTART_PROBE_TIMEOUT = 1
+# A good read this soon after the restart command, before any read failed,
+# is taken as the device not having gone down yet
+RESTART_SETTLE = timedelta(seconds=10)
+
 
 class SunlitDataUpdateCoordinator(DataUpdateCoordinator[dict[str, Any]]):
     """
     Data update coordinator for SunEnergyXT devices.
 
     Handles fetching and updating data from the device at regular intervals.
+
+    When a read fails, the last good snapshot keeps being served and is marked
+    stale until the grace period runs out; only then does the update fail and
+    the entities become unavailable.
+
+    The device is sampled at the sample interval and every good sample is
+    handed to the sample listeners (derived energy, aggregates, control loops).
+    Entity listeners are only notified at the slower publish interval, or right
+    away when availability or staleness changes.
+
+    After a restart command the coordinator tracks the reboot: it probes the
+    device at a tight interval with short timeouts, serves the last snapshot
+    without logging errors for up to RESTART_WINDOW, and returns to the sample
+    interval on the first good read after the device went down.
+
+    In aligned mode, polls start on a fixed wall-clock grid of the sample
+    interval instead of one interval after the previous poll ended, so slow
+    responses do not push later polls back. Polls never overlap: grid ticks a
+    slow poll has overrun are skipped and counted, and the spacing of good
+    samples is recorded.
+
+    When a request cannot reach the device, its host name is resolved again
+    through the resolver; if the device moved, the request is retried once at
+    the new address.
     """
 
-    def __init__(self, hass: HomeAssistant, sn: str, ip: str) -> None:
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        sn: str,
+        ip: str,
+        grace_period: int = DEFAULT_STALE_GRACE_PERIOD,
+        sample_interval: int = DEFAULT_SAMPLE_INTERVAL,
+        publish_interval: int = DEFAULT_PUBLISH_INTERVAL,
+        *,
+        aligned: bool = False,
+        resolver: HostResolver | None = None,
+    ) -> None:
         """
         Initialize the data update coordinator.
 
@@ -38,47 +100,439 @@ class SunlitDataUpdateCoordinator(DataUpdateCoordinator[dict[str, Any]]):
             hass: Home Assistant instance
             sn: Device serial number
             ip: Device IP address
+            grace_period: Seconds the last good snapshot is served after reads fail
+            sample_interval: Seconds between reads from the device
+            publish_interval: Seconds between entity state publishes
+            aligned: Whether polls start on a wall-clock grid
+            resolver: Resolver of the device host name, used when the device
+                cannot be reached
 
         """
         self._sn = sn
         self._ip = ip
-        self._session = async_get_clientsession(hass)
+        self.client = SunEnergyXTClient(async_get_clientsession(hass), ip)
+        self._resolver = resolver
+        self._grace_period = timedelta(seconds=grace_period)
+        self.last_success_time: datetime | None = None
+        self.stale = False
+        self._publish_interval = publish_interval
+        self._published: tuple[bool, bool] | None = None
+        self._published_at = 0.0
+        self._sample_listeners: list[SampleListener] = []
+        self._write_listeners: list[WriteListener] = []
+        self.sample_count = 0
+        self.publish_count = 0
+        self.poll_count = 0
+        self.poll_error_count = 0
+        self.poll_duration_total = 0.0
+        self.write_count = 0
+        self.write_error_count = 0
+        self.write_duration_total = 0.0
+        self._sample_interval = timedelta(seconds=sample_interval)
+        self._aligned = aligned
+        # Wall-clock time of the grid tick the next poll is scheduled for
+        self._next_tick: float | None = None
+        self.skipped_tick_count = 0
+        self.last_sample_spacing: float | None = None
+        self.max_sample_spacing = 0.0
+        # Time the restart being tracked was requested, and whether the
+        # device has gone down since
+        self._restart_started: datetime | None = None
+        self._restart_down = False
+        self.restart_count = 0
+        self.last_restart_duration: float | None = None
         super().__init__(
             hass,
             _LOGGER,
             name=f"SunlitMonitor-{sn}",
-            update_interval=timedelta(seconds=3),
+            update_interval=self._sample_interval,
         )
 
+    @property
+    def sample_interval(self) -> timedelta:
+        """Return the configured time between reads from the device."""
+        return self._sample_interval
+
+    @property
+    def restarting(self) -> bool:
+        """Return whether a restart of the device is being tracked."""
+        return self._restart_started is not None
+
     async def _async_update_data(self) -> dict[str, Any]:
         """
         Fetch data from the SunEnergyXT device.
 
         Returns:
-            Dictionary containing the reported device data
+            Dictionary containing the reported device data, or the last good
+            snapshot while within the stale grace period
 
         Raises:
-            RuntimeError: If there's an error fetching or processing the data
+            SunEnergyXTError: If there's an error fetching or processing the
+                data and the grace period has run out
 
         """
+        started = monotonic()
         try:
-            async with async_timeout.timeout(10):
-                async with self._session.get(f"http://{self._ip}/read") as resp:
-                    if resp.status != HTTPStatus.OK:
-                        msg = f"HTTP status {resp.status}"
-                        raise RuntimeError(msg)
+            async with asyncio.timeout(
+                RESTART_PROBE_TIMEOUT if self.restarting else None
+            ):
+                reported = await self._async_request(self.client.async_read)
+        except Exception as err:
+            self.poll_error_count += 1
+            if self._within_restart_window():
+                self._restart_down = True
+                self.stale = self.data is not None
+                return self.data
+            if self._within_grace_period():
+                if not self.stale:
+                    _LOGGER.warning(
+                        "Error updating SunEnergyXT Monitor data, serving stale "
+                        "snapshot: %s",
+                        err,
+                    )
+                self.stale = True
+                return self.data
+            _LOGGER.exception("Error updating SunEnergyXT Monitor data: %s", err)
+            raise
+        finally:
+            self.poll_count += 1
+            self.poll_duration_total += monotonic() - started
 
-                    data = await resp.json()
+        sampled_at = datetime.now(UTC)
+        if self.last_success_time is not None:
+            spacing = (sampled_at - self.last_success_time).total_seconds()
+            self.last_sample_spacing = spacing
+            self.max_sample_spacing = max(self.max_sample_spacing, spacing)
+        self.last_success_time = sampled_at
+        self.stale = False
+        if self.restarting and (
+            self._restart_down
+            or self.last_success_time - self._restart_started >= RESTART_SETTLE
+        ):
+            self._async_restart_complete()
+        self._async_dispatch_sample(reported, self.last_success_time)
+        return reported
 
-                    reported = data.get("state", {}).get("reported", {})
+    @callback
+    def _schedule_refresh(self) -> None:
+        """Schedule the next poll, on the next free grid tick in aligned mode."""
+        if not self._aligned or self.update_interval is None:
+            super()._schedule_refresh()
+            return
+        if self.config_entry and self.config_entry.pref_disable_polling:
+            return
+        self._async_unsub_refresh()
 
-                    if not isinstance(reported, dict):
-                        msg = "Invalid 'reported' structure in JSON"
-                        raise TypeError(msg)
+        interval = self.update_interval.total_seconds()
+        now = time()
+        tick = (now // interval + 1) * interval
+        if self._next_tick is not None:
+            # Once the scheduled tick has passed, the poll that just ended
+            # was its poll and the tick after it is due next
+            due = self._next_tick + (interval if now >= self._next_tick else 0)
+            if (skipped := round((tick - due) / interval)) > 0:
+                self.skipped_tick_count += skipped
+                _LOGGER.debug("Poll overran, skipping %d ticks", skipped)
+        self._next_tick = tick
 
-                    self.last_success_time = datetime.now(UTC)
-                    _LOGGER.debug("Get raw data: %s", str(data))
-                    return reported
-        except Exception as err:
-            _LOGGER.exception("Error updating SunEnergyXT Monitor data: %s", err)
+        loop = self.hass.loop
+        self._unsub_refresh = loop.call_at(
+            loop.time() + tick - now, self._handle_aligned_tick
+        ).cancel
+
+    @callback
+    def _handle_aligned_tick(self) -> None:
+        """Start the poll of a grid tick, as the base class does for its ticks."""
+        if self.config_entry:
+            self.config_entry.async_create_background_task(
+                self.hass,
+                self._handle_refresh_interval(),
+                name=f"{self.name} - {self.config_entry.title} - aligned refresh",
+                eager_start=True,
+            )
+        else:
+            self.hass.async_create_background_task(
+                self._handle_refresh_interval(),
+                name=f"{self.name} - aligned refresh",
+                eager_start=True,
+            )
+
+    @callback
+    def async_expect_restart(self) -> None:
+        """Track the reboot following a restart command sent to the device."""
+        self._restart_started = datetime.now(UTC)
+        self._restart_down = False
+        self.update_interval = timedelta(seconds=RESTART_PROBE_INTERVAL)
+        _LOGGER.debug("Tracking restart of SunEnergyXT device %s", self._sn)
+
+    @callback
+    def _async_restart_complete(self) -> None:
+        """Record a completed restart and return to the sample interval."""
+        if self._restart_started is None:
+            return
+        duration = (datetime.now(UTC) - self._restart_started).total_seconds()
+        self._restart_started = None
+        self.update_interval = self._sample_interval
+        self.restart_count += 1
+        self.last_restart_duration = duration
+        _LOGGER.info(
+            "SunEnergyXT device %s is back after restarting in %.1f s",
+            self._sn,
+            duration,
+        )
+
+    def _within_restart_window(self) -> bool:
+        """
+        Check whether read errors are expected because the device restarts.
+
+        Stops tracking the restart once the window has run out, so later
+        errors are handled as usual.
+
+        Returns:
+            True if a restart is tracked and its window has not run out
+
+        """
+        if self._restart_started is None:
+            return False
+        if datetime.now(UTC) - self._restart_started < RESTART_WINDOW:
+            return True
+        _LOGGER.warning(
+            "SunEnergyXT device %s did not come back within %s after restarting",
+            self._sn,
+            RESTART_WINDOW,
+        )
+        self._restart_started = None
+        self.update_interval = self._sample_interval
+        return False
+
+    def _within_grace_period(self) -> bool:
+        """
+        Check whether the last good snapshot may still be served.
+
+        Returns:
+            True if a snapshot exists and the grace period has not run out
+
+        """
+        if self.data is None or self.last_success_time is None:
+            return False
+        return datetime.now(UTC) - self.last_success_time < self._grace_period
+
+    async def async_write(
+        self, values: dict[str, Any], *, control: bool = False
+    ) -> None:
+        """
+        Write values to the SunEnergyXT device in a single request.
+
+        On success the written values of reported keys are merged into the
+        current snapshot so entities reflect them before the next read. The
+        write listeners are told about every attempt, successful or not.
+
+        Args:
+            values: Dictionary mapping parameter keys to the values to write
+            control: Whether the values come from the timeline or a control
+                loop, which keeps writing them, rather than from a user
+
+        Raises:
+            SunEnergyXTError: If the device cannot be reached or rejects the write
+
+        """
+        started = monotonic()
+        try:
+            await self._async_request(partial(self.client.async_write, values))
+        except Exception:
+            self.write_error_count += 1
+            self._async_dispatch_write(values, success=False, control=control)
             raise
+        finally:
+            self.write_count += 1
+            self.write_duration_total += monotonic() - started
+        self._async_dispatch_write(values, success=True, control=control)
+
+        if isinstance(self.data, dict):
+            self.data.update({k: v for k, v in values.items() if k in self.data})
+
+    async def _async_request(self, request: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Send a request, retrying once if the device moved to a new address.
+
+        Args:
+            request: Coroutine function sending the request
+
+        Returns:
+            Result of the request
+
+        Raises:
+            SunEnergyXTError: If the device cannot be reached at its current
+                or resolved address
+
+        """
+        try:
+            return await request()
+        except SunEnergyXTError:
+            if self.restarting or self._resolver is None:
+                raise
+            if (address := await self._resolver.async_refresh()) is None:
+                raise
+        self.async_set_host(address)
+        return await request()
+
+    @callback
+    def async_set_host(self, ip: str) -> None:
+        """
+        Send later requests to a new address of the device.
+
+        Args:
+            ip: New IP address of the device
+
+        """
+        if ip == self.client.host:
+            return
+        _LOGGER.info("SunEnergyXT device %s is now at %s", self._sn, ip)
+        self._ip = ip
+        self.client.host = ip
+
+    @callback
+    def async_add_sample_listener(self, listener: SampleListener) -> CALLBACK_TYPE:
+        """
+        Register a listener called with every good sample.
+
+        Args:
+            listener: Callback receiving the reported data and the sample time
+
+        Returns:
+            Callback that removes the listener
+
+        """
+        self._sample_listeners.append(listener)
+
+        @callback
+        def remove_listener() -> None:
+            self._sample_listeners.remove(listener)
+
+        return remove_listener
+
+    @callback
+    def _async_dispatch_sample(
+        self, reported: dict[str, Any], sampled_at: datetime
+    ) -> None:
+        """
+        Hand a good sample to every sample listener.
+
+        Args:
+            reported: Reported device data
+            sampled_at: Time the sample was taken
+
+        """
+        self.sample_count += 1
+        for listener in list(self._sample_listeners):
+            try:
+                listener(reported, sampled_at)
+            except Exception:
+                _LOGGER.exception("Error in SunEnergyXT sample listener")
+
+    @callback
+    def async_add_write_listener(self, listener: WriteListener) -> CALLBACK_TYPE:
+        """
+        Register a listener called after every write attempt.
+
+        Args:
+            listener: Callback receiving the written values, whether the write
+                succeeded and whether it came from the timeline or a control
+                loop
+
+        Returns:
+            Callback that removes the listener
+
+        """
+        self._write_listeners.append(listener)
+
+        @callback
+        def remove_listener() -> None:
+            self._write_listeners.remove(listener)
+
+        return remove_listener
+
+    @callback
+    def _async_dispatch_write(
+        self, values: dict[str, Any], *, success: bool, control: bool
+    ) -> None:
+        """
+        Hand a write attempt to every write listener.
+
+        Args:
+            values: Values that were written
+            success: Whether the write succeeded
+            control: Whether the timeline or a control loop wrote the values
+
+        """
+        for listener in list(self._write_listeners):
+            try:
+                listener(values, success, control)
+            except Exception:
+                _LOGGER.exception("Error in SunEnergyXT write listener")
+
+    @callback
+    def async_update_listeners(self) -> None:
+        """
+        Notify entity listeners at the publish interval or on status change.
+
+        Poll completion times jitter around the sample grid, so a publish is
+        due half a sample interval early; a publish interval no longer than
+        the sample interval publishes every sample.
+        """
+        now = monotonic()
+        current = (self.last_update_success, self.stale)
+        due = self._publish_interval - self._sample_interval.total_seconds() / 2
+        if current == self._published and now - self._published_at < due:
+            return
+
+        self._published = current
+        self._published_at = now
+        self.publish_count += 1
+        super().async_update_listeners()
+
+    @callback
+    def async_publish(self) -> None:
+        """Notify entity listeners right away, regardless of the publish interval."""
+        self._published = None
+        self.async_update_listeners()
+
+    def get_diagnostics(self) -> dict[str, Any]:
+        """
+        Get runtime information for diagnostics.
+
+        Returns:
+            Dictionary describing the coordinator state
+
+        """
+        return {
+            "sample_interval": self._sample_interval.total_seconds(),
+            "poll_interval": (
+                self.update_interval.total_seconds() if self.update_interval else None
+            ),
+            "publish_interval": self._publish_interval,
+            "sample_count": self.sample_count,
+            "publish_count": self.publish_count,
+            "poll_count": self.poll_count,
+            "poll_error_count": self.poll_error_count,
+            "poll_duration_total": self.poll_duration_total,
+            "write_count": self.write_count,
+            "write_error_count": self.write_error_count,
+            "write_duration_total": self.write_duration_total,
+            "sample_listeners": len(self._sample_listeners),
+            "aligned": self._aligned,
+            "skipped_tick_count": self.skipped_tick_count,
+            "last_sample_spacing": self.last_sample_spacing,
+            "max_sample_spacing": self.max_sample_spacing,
+            "host": self.client.host,
+            "latency": self.client.latency_stats(),
+            "resolver": self._resolver.get_diagnostics() if self._resolver else None,
+            "stale": self.stale,
+            "restarting": self.restarting,
+            "restart_count": self.restart_count,
+            "last_restart_duration": self.last_restart_duration,
+            "last_update_success": self.last_update_success,
+            "last_success_time": (
+                self.last_success_time.isoformat() if self.last_success_time else None
+            ),
+        }
@@ -0,0 +1,65 @@
+"""
+Diagnostics support for SunEnergyXT 500 Series integration.
+
+This module provides config entry diagnostics for the SunEnergyXT integration,
+including the coordinator's sampling and publishing state, the zero-export
+control loop metrics, the setpoint timeline state and the latest reported
+device data.
+
+Functions:
+- async_get_config_entry_diagnostics: Returns diagnostics for a config entry
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.components.diagnostics import async_redact_data
+
+from .const import DOMAIN
+
+if TYPE_CHECKING:
+    from homeassistant.config_entries import ConfigEntry
+    from homeassistant.core import HomeAssistant
+
+TO_REDACT = {"ip", "host", "WS"}
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """
+    Get diagnostics for a SunEnergyXT config entry.
+
+    Args:
+        hass: Home Assistant instance
+        entry: Config entry to report on
+
+    Returns:
+        Dictionary containing the diagnostics data
+
+    """
+    config = hass.data[DOMAIN][entry.entry_id]
+    coordinator = config["coordinator"]
+    zero_export = config["zero_export"]
+    optimizer = config["optimizer"]
+    export = config["export"]
+    statistics = config["statistics"]
+    history = config["history"]
+
+    return {
+        "entry": async_redact_data(
+            {"data": dict(entry.data), "options": dict(entry.options)}, TO_REDACT
+        ),
+        "coordinator": async_redact_data(coordinator.get_diagnostics(), TO_REDACT),
+        "zero_export": zero_export.get_diagnostics() if zero_export else None,
+        "scheduler": config["scheduler"].get_diagnostics(),
+        "optimizer": optimizer.get_diagnostics() if optimizer else None,
+        "export": export.get_diagnostics() if export else None,
+        "anomaly": config["anomaly"].get_diagnostics(),
+        "backfill": config["backfill"].get_diagnostics(),
+        "reconciler": config["reconciler"].get_diagnostics(),
+        "statistics": statistics.get_diagnostics() if statistics else None,
+        "history": history.get_diagnostics() if history else None,
+        "reported": async_redact_data(coordinator.data or {}, TO_REDACT),
+    }
@@ -0,0 +1,247 @@
+"""
+Raw sample export sink for SunEnergyXT 500 Series integration.
+
+This module implements an optional sink that records every raw sample of a
+device, independent of the recorder and of entity publishing, to rotating
+gzip-compressed CSV files for offline analysis.
+
+Classes:
+- ExportSink: Buffers samples and flushes them to rotating files
+"""
+
+from __future__ import annotations
+
+import csv
+import gzip
+import logging
+import re
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.const import EVENT_HOMEASSISTANT_STOP
+from homeassistant.core import CALLBACK_TYPE, Event, HomeAssistant, callback
+from homeassistant.helpers.event import async_track_time_interval
+
+if TYPE_CHECKING:
+    from .coordinator import SunlitDataUpdateCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+FLUSH_INTERVAL = timedelta(seconds=60)
+FLUSH_SIZE = 1000
+
+
+class ExportSink:
+    """
+    Export sink for the raw samples of one device.
+
+    Samples are buffered in memory and written in bulk by the executor, every
+    FLUSH_INTERVAL or once FLUSH_SIZE samples are buffered, so the poll loop
+    never waits for disk I/O. A new file is started when the current one
+    exceeds the size or age limit, or when the set of reported keys changes;
+    only the newest files are kept.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        coordinator: SunlitDataUpdateCoordinator,
+        sn: str,
+        directory: str,
+        max_size: int,
+        max_age: int,
+        keep: int,
+    ) -> None:
+        """
+        Initialize the export sink.
+
+        Args:
+            hass: Home Assistant instance
+            coordinator: Data update coordinator of the device
+            sn: Device serial number, used in the file names
+            directory: Directory the files are written to
+            max_size: Size in MB after which a new file is started
+            max_age: Hours after which a new file is started
+            keep: Number of files to keep
+
+        """
+        self._hass = hass
+        self._coordinator = coordinator
+        self._prefix = re.sub(r"[^A-Za-z0-9_-]", "_", sn)
+        self._directory = Path(directory)
+        self._max_size = max_size * 1024 * 1024
+        self._max_age = timedelta(hours=max_age)
+        self._keep = keep
+
+        self._buffer: list[tuple[datetime, dict[str, Any]]] = []
+        self._flushing = False
+        self._unsubs: list[CALLBACK_TYPE] = []
+        self._unsub_stop: CALLBACK_TYPE | None = None
+
+        self._path: Path | None = None
+        self._opened: datetime | None = None
+        self._columns: list[str] = []
+
+        self.sample_count = 0
+        self.row_count = 0
+        self.flush_count = 0
+        self.error_count = 0
+        self.last_flush_duration: float | None = None
+
+    @callback
+    def async_start(self) -> None:
+        """Start receiving samples and flushing them periodically."""
+        self._unsubs.append(
+            self._coordinator.async_add_sample_listener(self._async_add_sample)
+        )
+        self._unsubs.append(
+            async_track_time_interval(self._hass, self._async_flush, FLUSH_INTERVAL)
+        )
+        self._unsub_stop = self._hass.bus.async_listen_once(
+            EVENT_HOMEASSISTANT_STOP, self._async_handle_stop
+        )
+
+    async def async_stop(self) -> None:
+        """Stop receiving samples and flush the buffer."""
+        for unsub in self._unsubs:
+            unsub()
+        self._unsubs.clear()
+        if self._unsub_stop is not None:
+            self._unsub_stop()
+            self._unsub_stop = None
+        await self._async_flush()
+
+    async def _async_handle_stop(self, _event: Event) -> None:
+        """Flush the buffer when Home Assistant stops."""
+        self._unsub_stop = None
+        await self._async_flush()
+
+    @callback
+    def _async_add_sample(self, reported: dict[str, Any], sampled_at: datetime) -> None:
+        """
+        Buffer a sample.
+
+        Args:
+            reported: Raw reported data
+            sampled_at: Time the sample was taken
+
+        """
+        self._buffer.append((sampled_at, dict(reported)))
+        self.sample_count += 1
+        if len(self._buffer) >= FLUSH_SIZE and not self._flushing:
+            self._hass.async_create_task(
+                self._async_flush(), f"sunenergyxt export {self._prefix}"
+            )
+
+    async def _async_flush(self, _now: datetime | None = None) -> None:
+        """Hand the buffered samples to the executor for writing."""
+        if self._flushing or not self._buffer:
+            return
+        rows, self._buffer = self._buffer, []
+        self._flushing = True
+        started = self._hass.loop.time()
+        try:
+            await self._hass.async_add_executor_job(self._write, rows)
+        except OSError as err:
+            self.error_count += 1
+            _LOGGER.warning("Error exporting SunEnergyXT samples: %s", err)
+        finally:
+            self._flushing = False
+        self.last_flush_duration = self._hass.loop.time() - started
+        self.flush_count += 1
+
+    def _write(self, rows: list[tuple[datetime, dict[str, Any]]]) -> None:
+        """
+        Append samples to the current file, rotating it as needed.
+
+        Runs in the executor.
+
+        Args:
+            rows: Buffered samples with their sample times
+
+        """
+        self._directory.mkdir(parents=True, exist_ok=True)
+        start = 0
+        while start < len(rows):
+            keys = rows[start][1].keys()
+            end = start + 1
+            while end < len(rows) and rows[end][1].keys() == keys:
+                end += 1
+
+            columns = sorted(keys)
+            path = self._path
+            if path is None or self._needs_rotation(path, columns):
+                path = self._rotate(columns)
+
+            write_header = not path.exists()
+            with gzip.open(path, "at", newline="", encoding="utf-8") as file:
+                writer = csv.writer(file)
+                if write_header:
+                    writer.writerow(["time", *columns])
+                writer.writerows(
+                    [at.isoformat(), *(reported.get(key) for key in columns)]
+                    for at, reported in rows[start:end]
+                )
+            self.row_count += end - start
+            start = end
+
+    def _needs_rotation(self, path: Path, columns: list[str]) -> bool:
+        """
+        Check whether a new file must be started.
+
+        Args:
+            path: Current file
+            columns: Reported keys of the samples about to be written
+
+        Returns:
+            True if the current file is gone, too large, too old, or has
+            different columns
+
+        """
+        if self._opened is None or not path.exists():
+            return True
+        return (
+            columns != self._columns
+            or path.stat().st_size >= self._max_size
+            or datetime.now(UTC) - self._opened >= self._max_age
+        )
+
+    def _rotate(self, columns: list[str]) -> Path:
+        """
+        Start a new file and delete the oldest files beyond the limit.
+
+        Args:
+            columns: Reported keys of the samples of the new file
+
+        Returns:
+            Path of the new file
+
+        """
+        self._opened = datetime.now(UTC)
+        self._columns = columns
+        self._path = self._directory / (
+            f"{self._prefix}_{self._opened:%Y%m%dT%H%M%S%f}.csv.gz"
+        )
+        files = sorted(self._directory.glob(f"{self._prefix}_*.csv.gz"))
+        for old in files[: max(0, len(files) - self._keep + 1)]:
+            old.unlink(missing_ok=True)
+        return self._path
+
+    def get_diagnostics(self) -> dict[str, Any]:
+        """
+        Get export sink state for diagnostics.
+
+        Returns:
+            Dictionary describing the export sink
+
+        """
+        return {
+            "buffered": len(self._buffer),
+            "sample_count": self.sample_count,
+            "row_count": self.row_count,
+            "flush_count": self.flush_count,
+            "error_count": self.error_count,
+            "last_flush_duration": self.last_flush_duration,
+            "file": self._path.name if self._path else None,
+        }
@@ -0,0 +1,490 @@
+"""
+Compact sample history store for SunEnergyXT 500 Series integration.
+
+This module implements an optional on-disk store of the recent numeric samples
+of a device at full poll resolution. Samples are delta encoded per key and
+written as zigzag varints in append-only chunks, one file per UTC day, so a
+week of 3 s samples takes a few megabytes instead of millions of recorder rows.
+Files are only read when history is queried.
+
+Classes:
+- HistoryStore: Buffers samples, appends them as chunks and answers queries
+
+Functions:
+- encode_chunk: Encodes samples sharing the same keys into one chunk
+- decode_chunks: Decodes all intact chunks of a file
+"""
+
+from __future__ import annotations
+
+import logging
+import re
+import struct
+import zlib
+from datetime import UTC, date, datetime, timedelta
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.const import EVENT_HOMEASSISTANT_STOP
+from homeassistant.core import CALLBACK_TYPE, Event, HomeAssistant, callback
+from homeassistant.helpers.event import async_track_time_interval
+
+from .api import scale_value
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+    from .coordinator import SunlitDataUpdateCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+FLUSH_INTERVAL = timedelta(minutes=5)
+FLUSH_SIZE = 1000
+
+# Chunk marker and format version, followed by the payload length and, after
+# the payload, its CRC32
+CHUNK_MAGIC = b"\xa5\x01"
+CHUNK_HEADER = struct.Struct("<2sI")
+CHUNK_CRC = struct.Struct("<I")
+
+Sample = tuple[int, dict[str, int]]
+
+
+def _write_varint(out: bytearray, value: int) -> None:
+    """
+    Append a signed integer as a zigzag varint.
+
+    Args:
+        out: Buffer to append to
+        value: Integer to append
+
+    """
+    value = (value << 1) ^ (value >> 63)
+    while value > 0x7F:  # noqa: PLR2004
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def _read_varint(data: bytes | memoryview, pos: int) -> tuple[int, int]:
+    """
+    Read a signed zigzag varint.
+
+    Args:
+        data: Buffer to read from
+        pos: Position of the varint
+
+    Returns:
+        Decoded integer and the position after it
+
+    """
+    result = 0
+    shift = 0
+    while True:
+        byte = data[pos]
+        pos += 1
+        result |= (byte & 0x7F) << shift
+        if not byte & 0x80:
+            break
+        shift += 7
+    return (result >> 1) ^ -(result & 1), pos
+
+
+def encode_chunk(samples: list[Sample]) -> bytes:
+    """
+    Encode samples sharing the same keys into one chunk.
+
+    Times and the values of each key are stored as the first value followed by
+    the differences between consecutive values.
+
+    Args:
+        samples: Sample times in milliseconds since the epoch with their
+            integer raw values, all with the same keys
+
+    Returns:
+        Encoded chunk including header and checksum
+
+    """
+    keys = sorted(samples[0][1])
+    payload = bytearray()
+    _write_varint(payload, len(samples))
+    _write_varint(payload, len(keys))
+    for key in keys:
+        name = key.encode()
+        _write_varint(payload, len(name))
+        payload += name
+
+    previous = 0
+    for at, _ in samples:
+        _write_varint(payload, at - previous)
+        previous = at
+    for key in keys:
+        previous = 0
+        for _, values in samples:
+            _write_varint(payload, values[key] - previous)
+            previous = values[key]
+
+    return (
+        CHUNK_HEADER.pack(CHUNK_MAGIC, len(payload))
+        + payload
+        + CHUNK_CRC.pack(zlib.crc32(payload))
+    )
+
+
+def decode_chunks(data: bytes) -> Iterator[tuple[list[int], dict[str, list[int]]]]:
+    """
+    Decode all intact chunks of a file.
+
+    A truncated or corrupt chunk, such as one torn by a crash while it was
+    appended, is skipped by resuming at the next chunk marker whose checksum
+    matches.
+
+    Args:
+        data: File content
+
+    Yields:
+        Sample times in milliseconds since the epoch, and the raw values of
+        each key, of one chunk
+
+    """
+    view = memoryview(data)
+    pos = 0
+    while pos + CHUNK_HEADER.size <= len(data):
+        magic, length = CHUNK_HEADER.unpack_from(data, pos)
+        start = pos + CHUNK_HEADER.size
+        end = start + length
+        if (
+            magic != CHUNK_MAGIC
+            or end + CHUNK_CRC.size > len(data)
+            or CHUNK_CRC.unpack_from(data, end)[0] != zlib.crc32(view[start:end])
+        ):
+            pos = data.find(CHUNK_MAGIC, pos + 1)
+            if pos < 0:
+                return
+            continue
+        payload = view[start:end]
+        pos = end + CHUNK_CRC.size
+
+        count, offset = _read_varint(payload, 0)
+        key_count, offset = _read_varint(payload, offset)
+        keys: list[str] = []
+        for _ in range(key_count):
+            size, offset = _read_varint(payload, offset)
+            keys.append(bytes(payload[offset : offset + size]).decode())
+            offset += size
+
+        columns: list[list[int]] = []
+        for _ in range(key_count + 1):
+            column: list[int] = []
+            value = 0
+            for _ in range(count):
+                delta, offset = _read_varint(payload, offset)
+                value += delta
+                column.append(value)
+            columns.append(column)
+        yield columns[0], dict(zip(keys, columns[1:], strict=True))
+
+
+def _utc_date(at: int) -> date:
+    """
+    Get the UTC date of a sample time.
+
+    Args:
+        at: Milliseconds since the epoch
+
+    Returns:
+        UTC date
+
+    """
+    return datetime.fromtimestamp(at / 1000, UTC).date()
+
+
+def _integers(reported: dict[str, Any]) -> dict[str, int]:
+    """
+    Get the integer raw values of a sample.
+
+    Args:
+        reported: Raw reported data
+
+    Returns:
+        Dictionary mapping keys to integer raw values
+
+    """
+    values: dict[str, int] = {}
+    for key, raw in reported.items():
+        if isinstance(raw, bool):
+            continue
+        if isinstance(raw, int):
+            values[key] = raw
+        elif isinstance(raw, float) and raw.is_integer():
+            values[key] = int(raw)
+    return values
+
+
+class HistoryStore:
+    """
+    Compact sample history of one device.
+
+    Samples are buffered in memory and appended by the executor every
+    FLUSH_INTERVAL or once FLUSH_SIZE samples are buffered. Each run of
+    samples with the same keys becomes one chunk of the file of its UTC day.
+    Chunks carry a checksum, so a chunk torn by a crash only loses that
+    chunk. Day files older than the retention are deleted after each flush.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        coordinator: SunlitDataUpdateCoordinator,
+        sn: str,
+        directory: str,
+        days: int,
+    ) -> None:
+        """
+        Initialize the history store.
+
+        Args:
+            hass: Home Assistant instance
+            coordinator: Data update coordinator of the device
+            sn: Device serial number, used in the file names
+            directory: Directory the files are written to
+            days: Number of days of history to keep
+
+        """
+        self._hass = hass
+        self._coordinator = coordinator
+        self._prefix = re.sub(r"[^A-Za-z0-9_-]", "_", sn)
+        self._directory = Path(directory)
+        self._days = days
+
+        self._buffer: list[Sample] = []
+        self._flushing = False
+        self._unsubs: list[CALLBACK_TYPE] = []
+        self._unsub_stop: CALLBACK_TYPE | None = None
+
+        self.sample_count = 0
+        self.chunk_count = 0
+        self.bytes_written = 0
+        self.error_count = 0
+
+    @callback
+    def async_start(self) -> None:
+        """Start receiving samples and flushing them periodically."""
+        self._unsubs.append(
+            self._coordinator.async_add_sample_listener(self._async_add_sample)
+        )
+        self._unsubs.append(
+            async_track_time_interval(self._hass, self._async_flush, FLUSH_INTERVAL)
+        )
+        self._unsub_stop = self._hass.bus.async_listen_once(
+            EVENT_HOMEASSISTANT_STOP, self._async_handle_stop
+        )
+
+    async def async_stop(self) -> None:
+        """Stop receiving samples and flush the buffer."""
+        for unsub in self._unsubs:
+            unsub()
+        self._unsubs.clear()
+        if self._unsub_stop is not None:
+            self._unsub_stop()
+            self._unsub_stop = None
+        await self._async_flush()
+
+    async def _async_handle_stop(self, _event: Event) -> None:
+        """Flush the buffer when Home Assistant stops."""
+        self._unsub_stop = None
+        await self._async_flush()
+
+    @callback
+    def _async_add_sample(self, reported: dict[str, Any], sampled_at: datetime) -> None:
+        """
+        Buffer a sample.
+
+        Args:
+            reported: Raw reported data
+            sampled_at: Time the sample was taken
+
+        """
+        if not (values := _integers(reported)):
+            return
+        self._buffer.append((int(sampled_at.timestamp() * 1000), values))
+        self.sample_count += 1
+        if len(self._buffer) >= FLUSH_SIZE and not self._flushing:
+            self._hass.async_create_task(
+                self._async_flush(), f"sunenergyxt history {self._prefix}"
+            )
+
+    async def _async_flush(self, _now: datetime | None = None) -> None:
+        """Hand the buffered samples to the executor for writing."""
+        if self._flushing or not self._buffer:
+            return
+        samples, self._buffer = self._buffer, []
+        self._flushing = True
+        try:
+            await self._hass.async_add_executor_job(self._write, samples)
+        except OSError as err:
+            self.error_count += 1
+            _LOGGER.warning("Error writing SunEnergyXT history: %s", err)
+        finally:
+            self._flushing = False
+
+    def _path(self, day: date) -> Path:
+        """
+        Get the file of a UTC day.
+
+        Args:
+            day: UTC date
+
+        Returns:
+            Path of the day file
+
+        """
+        return self._directory / f"{self._prefix}_{day:%Y%m%d}.bin"
+
+    def _write(self, samples: list[Sample]) -> None:
+        """
+        Append samples as chunks and delete expired files.
+
+        Runs in the executor.
+
+        Args:
+            samples: Buffered samples
+
+        """
+        self._directory.mkdir(parents=True, exist_ok=True)
+        days = [_utc_date(at) for at, _ in samples]
+        start = 0
+        while start < len(samples):
+            keys = samples[start][1].keys()
+            end = start + 1
+            while (
+                end < len(samples)
+                and samples[end][1].keys() == keys
+                and days[end] == days[start]
+            ):
+                end += 1
+
+            chunk = encode_chunk(samples[start:end])
+            with self._path(days[start]).open("ab") as file:
+                file.write(chunk)
+            self.chunk_count += 1
+            self.bytes_written += len(chunk)
+            start = end
+
+        oldest = self._path(datetime.now(UTC).date() - timedelta(days=self._days)).name
+        for path in self._directory.glob(f"{self._prefix}_*.bin"):
+            if path.name < oldest:
+                path.unlink(missing_ok=True)
+
+    def _read(
+        self, start_ms: int, end_ms: int, keys: set[str] | None
+    ) -> list[tuple[list[int], dict[str, list[int]]]]:
+        """
+        Read the chunks of the day files overlapping a range.
+
+        Runs in the executor.
+
+        Args:
+            start_ms: Start of the range in milliseconds since the epoch
+            end_ms: End of the range in milliseconds since the epoch
+            keys: Keys to return, None for all
+
+        Returns:
+            Times and values of each chunk, limited to the range and keys
+
+        """
+        chunks: list[tuple[list[int], dict[str, list[int]]]] = []
+        day = _utc_date(start_ms)
+        last = _utc_date(end_ms)
+        while day <= last:
+            path = self._path(day)
+            day += timedelta(days=1)
+            if not path.exists():
+                continue
+            for times, columns in decode_chunks(path.read_bytes()):
+                indexes = [
+                    index for index, at in enumerate(times) if start_ms <= at <= end_ms
+                ]
+                if not indexes:
+                    continue
+                chunks.append(
+                    (
+                        [times[index] for index in indexes],
+                        {
+                            key: [column[index] for index in indexes]
+                            for key, column in columns.items()
+                            if keys is None or key in keys
+                        },
+                    )
+                )
+        return chunks
+
+    async def async_query(
+        self, start: datetime, end: datetime, keys: list[str] | None = None
+    ) -> dict[str, Any]:
+        """
+        Get the samples of a time range.
+
+        Args:
+            start: Start of the range
+            end: End of the range
+            keys: Keys to return, None for all
+
+        Returns:
+            Dictionary with the sample times and, per key, the scaled values
+            aligned with them, None where a sample lacks the key
+
+        """
+        start_ms = int(start.timestamp() * 1000)
+        end_ms = int(end.timestamp() * 1000)
+        wanted = set(keys) if keys else None
+        chunks = await self._hass.async_add_executor_job(
+            self._read, start_ms, end_ms, wanted
+        )
+        for at, values in self._buffer:
+            if start_ms <= at <= end_ms:
+                chunks.append(
+                    (
+                        [at],
+                        {
+                            key: [value]
+                            for key, value in values.items()
+                            if wanted is None or key in wanted
+                        },
+                    )
+                )
+
+        times: list[int] = []
+        columns: dict[str, list[Any]] = {}
+        for chunk_times, chunk_columns in chunks:
+            for key in chunk_columns.keys() - columns.keys():
+                columns[key] = [None] * len(times)
+            for key, column in columns.items():
+                if key in chunk_columns:
+                    column.extend(scale_value(key, raw) for raw in chunk_columns[key])
+                else:
+                    column.extend([None] * len(chunk_times))
+            times.extend(chunk_times)
+
+        return {
+            "time": [
+                datetime.fromtimestamp(at / 1000, UTC).isoformat() for at in times
+            ],
+            "values": dict(sorted(columns.items())),
+        }
+
+    def get_diagnostics(self) -> dict[str, Any]:
+        """
+        Get history store state for diagnostics.
+
+        Returns:
+            Dictionary describing the history store
+
+        """
+        return {
+            "buffered": len(self._buffer),
+            "sample_count": self.sample_count,
+            "chunk_count": self.chunk_count,
+            "bytes_written": self.bytes_written,
+            "error_count": self.error_count,
+        }
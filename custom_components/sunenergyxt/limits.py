@@ -0,0 +1,85 @@
+"""
+Parameter limits for SunEnergyXT 500 Series integration.
+
+This module holds the metadata and allowed ranges of the writable numeric
+parameters. It has no Home Assistant imports, so services and control loops
+can validate setpoints without loading the number platform.
+
+Functions:
+- get_number_range: Returns the allowed range of a parameter for a device model
+
+Constants:
+- NUMBER_META: Metadata configuration for number entities, including min/max values,
+  steps, and units
+- MODEL_LIMITS: Per-model overrides of the NUMBER_META ranges
+"""
+
+from typing import Any
+
+NUMBER_META: dict[str, dict[str, Any]] = {
+    "GS": {
+        "min_value": -2400,
+        "max_value": 2400,
+        "step": 10,
+        "unit": "W",
+        "icon": "mdi:transmission-tower",
+    },
+    "IS": {
+        "min_value": 1,
+        "max_value": 2400,
+        "step": 10,
+        "unit": "W",
+        "icon": "mdi:flash",
+    },
+    "SI": {
+        "min_value": 1,
+        "max_value": 30,
+        "step": 1,
+        "unit": "%",
+        "icon": "mdi:battery-low",
+    },
+    "SA": {
+        "min_value": 70,
+        "max_value": 100,
+        "step": 1,
+        "unit": "%",
+        "icon": "mdi:battery-high",
+    },
+    "SO": {
+        "min_value": 1,
+        "max_value": 30,
+        "step": 1,
+        "unit": "%",
+        "icon": "mdi:battery-arrow-down-outline",
+    },
+    "PT": {
+        "min_value": 30,
+        "max_value": 1440,
+        "step": 1,
+        "unit": "min",
+        "icon": "mdi:timer-outline",
+    },
+}
+
+MODEL_LIMITS: dict[str, dict[str, dict[str, Any]]] = {
+    "SunEnergyXT 500": {
+        "GS": {"max_value": 800},
+        "IS": {"max_value": 800},
+    },
+}
+
+
+def get_number_range(key: str, model: str | None) -> tuple[float, float]:
+    """
+    Get the allowed range of a number parameter for a device model.
+
+    Args:
+        key: Parameter key
+        model: Device model
+
+    Returns:
+        Tuple of the minimum and maximum allowed value
+
+    """
+    meta = {**NUMBER_META.get(key, {}), **MODEL_LIMITS.get(model, {}).get(key, {})}
+    return meta["min_value"], meta["max_value"]
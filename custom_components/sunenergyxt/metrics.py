@@ -0,0 +1,198 @@
+"""
+Prometheus metrics endpoint for SunEnergyXT 500 Series integration.
+
+This module implements an HTTP view that renders the latest reported values of
+all loaded devices, together with the integration's own poll and write
+counters, in the Prometheus text exposition format. Values are taken straight
+from the coordinator snapshots, so one scrape covers the whole fleet without
+going through the entity states.
+
+Classes:
+- SunEnergyXTMetricsView: Serves the metrics at METRICS_URL
+
+Functions:
+- render_metrics: Renders the metrics of all loaded devices
+
+Constants:
+- METRICS_URL: Path of the metrics endpoint
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+
+from aiohttp import web
+from homeassistant.components.http import HomeAssistantView
+from homeassistant.const import CONTENT_TYPE_TEXT_PLAIN
+
+from .api import scale_value
+from .const import DOMAIN
+
+if TYPE_CHECKING:
+    from homeassistant.core import HomeAssistant
+
+METRICS_URL = f"/api/{DOMAIN}/metrics"
+
+# Metric name, type, help text and the coordinator attribute it is read from
+COORDINATOR_METRICS = (
+    ("poll_total", "counter", "Reads attempted", "poll_count"),
+    ("poll_errors_total", "counter", "Reads that failed", "poll_error_count"),
+    (
+        "poll_duration_seconds_total",
+        "counter",
+        "Time spent reading",
+        "poll_duration_total",
+    ),
+    ("write_total", "counter", "Writes attempted", "write_count"),
+    ("write_errors_total", "counter", "Writes that failed", "write_error_count"),
+    (
+        "write_duration_seconds_total",
+        "counter",
+        "Time spent writing",
+        "write_duration_total",
+    ),
+    ("samples_total", "counter", "Good samples received", "sample_count"),
+    ("publish_total", "counter", "Entity state publishes", "publish_count"),
+    ("restart_total", "counter", "Restarts completed", "restart_count"),
+    (
+        "skipped_ticks_total",
+        "counter",
+        "Aligned poll ticks skipped because a poll overran",
+        "skipped_tick_count",
+    ),
+)
+
+
+def _escape(value: Any) -> str:
+    """
+    Escape a label value for the text exposition format.
+
+    Args:
+        value: Label value
+
+    Returns:
+        Escaped label value
+
+    """
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def render_metrics(hass: HomeAssistant) -> str:
+    """
+    Render the metrics of all loaded devices.
+
+    Args:
+        hass: Home Assistant instance
+
+    Returns:
+        Metrics in the Prometheus text exposition format
+
+    """
+    families: dict[str, tuple[str, str, list[str]]] = {}
+
+    def add(name: str, kind: str, help_text: str, labels: str, value: float) -> None:
+        family = families.setdefault(f"{DOMAIN}_{name}", (kind, help_text, []))
+        family[2].append(f"{DOMAIN}_{name}{{{labels}}} {value}")
+
+    for config in hass.data.get(DOMAIN, {}).values():
+        coordinator = config["coordinator"]
+        labels = f'sn="{_escape(config["sn"])}",model="{_escape(config["model"])}"'
+
+        add(
+            "up",
+            "gauge",
+            "Last read succeeded",
+            labels,
+            int(coordinator.last_update_success),
+        )
+        add(
+            "stale",
+            "gauge",
+            "Serving the last good snapshot",
+            labels,
+            int(coordinator.stale),
+        )
+        if coordinator.last_success_time is not None:
+            add(
+                "last_success_timestamp_seconds",
+                "gauge",
+                "Time of the last good read",
+                labels,
+                coordinator.last_success_time.timestamp(),
+            )
+        add(
+            "restarting",
+            "gauge",
+            "Tracking a restart of the device",
+            labels,
+            int(coordinator.restarting),
+        )
+        if coordinator.last_sample_spacing is not None:
+            add(
+                "sample_spacing_seconds",
+                "gauge",
+                "Time between the last two good samples",
+                labels,
+                coordinator.last_sample_spacing,
+            )
+        if coordinator.last_restart_duration is not None:
+            add(
+                "last_restart_duration_seconds",
+                "gauge",
+                "Time from the restart command to the first good read",
+                labels,
+                coordinator.last_restart_duration,
+            )
+        for name, kind, help_text, attribute in COORDINATOR_METRICS:
+            add(name, kind, help_text, labels, getattr(coordinator, attribute))
+
+        for key, raw in (coordinator.data or {}).items():
+            value = scale_value(key, raw)
+            if isinstance(value, bool) or not isinstance(value, int | float):
+                continue
+            add(
+                "reported",
+                "gauge",
+                "Reported device value, scaled to its unit",
+                f'{labels},key="{_escape(key)}"',
+                value,
+            )
+
+    lines: list[str] = []
+    for name, (kind, help_text, samples) in families.items():
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} {kind}")
+        lines.extend(samples)
+    return "\n".join(lines) + "\n"
+
+
+class SunEnergyXTMetricsView(HomeAssistantView):
+    """Serve the metrics of all loaded devices in the Prometheus format."""
+
+    url = METRICS_URL
+    name = f"api:{DOMAIN}:metrics"
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """
+        Initialize the view.
+
+        Args:
+            hass: Home Assistant instance
+
+        """
+        self._hass = hass
+
+    async def get(self, request: web.Request) -> web.Response:  # noqa: ARG002
+        """
+        Handle a scrape.
+
+        Args:
+            request: HTTP request
+
+        Returns:
+            Response containing the metrics
+
+        """
+        return web.Response(
+            text=render_metrics(self._hass), content_type=CONTENT_TYPE_TEXT_PLAIN
+        )
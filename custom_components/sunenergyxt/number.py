@@ -7,74 +7,25 @@ allowing control of various device parameters such as power limits and percentag
 Classes:
 - SunlitNumber: Represents a number entity for controlling SunEnergyXT device parameters
 
-Constants:
-- NUMBER_META: Metadata configuration for number entities, including min/max values,
-  steps, and units
+The parameter metadata and per-model limits live in the limits module, so
+services and control loops can use them without loading this platform.
 """
 
 import logging
-from http import HTTPStatus
-from typing import Any
 
-import async_timeout
 from homeassistant.components.number import NumberEntity, NumberMode
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
-from homeassistant.helpers.aiohttp_client import async_get_clientsession
 from homeassistant.helpers.entity import DeviceInfo
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from .const import DOMAIN
 from .coordinator import SunlitDataUpdateCoordinator
+from .limits import NUMBER_META, get_number_range
 
 _LOGGER = logging.getLogger(__name__)
 
-NUMBER_META: dict[str, dict[str, Any]] = {
-    "GS": {
-        "min_value": -2400,
-        "max_value": 2400,
-        "step": 10,
-        "unit": "W",
-        "icon": "mdi:transmission-tower",
-    },
-    "IS": {
-        "min_value": 1,
-        "max_value": 2400,
-        "step": 10,
-        "unit": "W",
-        "icon": "mdi:flash",
-    },
-    "SI": {
-        "min_value": 1,
-        "max_value": 30,
-        "step": 1,
-        "unit": "%",
-        "icon": "mdi:battery-low",
-    },
-    "SA": {
-        "min_value": 70,
-        "max_value": 100,
-        "step": 1,
-        "unit": "%",
-        "icon": "mdi:battery-high",
-    },
-    "SO": {
-        "min_value": 1,
-        "max_value": 30,
-        "step": 1,
-        "unit": "%",
-        "icon": "mdi:battery-arrow-down-outline",
-    },
-    "PT": {
-        "min_value": 30,
-        "max_value": 1440,
-        "step": 1,
-        "unit": "min",
-        "icon": "mdi:timer-outline",
-    },
-}
-
 
 async def async_setup_entry(
     hass: HomeAssistant,
@@ -124,7 +75,6 @@ async def async_setup_entry(
                 sn=sn,
                 ip=ip,
                 device_info=device_info,
-                hass=hass,
             )
         )
 
@@ -150,7 +100,6 @@ class SunlitNumber(CoordinatorEntity[SunlitDataUpdateCoordinator], NumberEntity)
         sn: str,
         ip: str,
         device_info: DeviceInfo,
-        hass: HomeAssistant,
     ) -> None:
         """
         Initialize the number entity.
@@ -162,14 +111,12 @@ class SunlitNumber(CoordinatorEntity[SunlitDataUpdateCoordinator], NumberEntity)
             sn: Device serial number
             ip: Device IP address
             device_info: Device information
-            hass: Home Assistant instance
 
         """
         super().__init__(coordinator)
         self._key = key
         self._sn = sn
         self._ip = ip
-        self._session = async_get_clientsession(hass)
 
         meta = NUMBER_META.get(key, {})
 
@@ -177,19 +124,9 @@ class SunlitNumber(CoordinatorEntity[SunlitDataUpdateCoordinator], NumberEntity)
         self._attr_translation_key = key.lower()
         self._attr_device_info = device_info
 
-        min_value = meta.get("min_value")
-        if min_value:
-            self._attr_native_min_value = min_value
-
-        max_value = meta.get("max_value")
-        if max_value:
-            self._attr_native_max_value = max_value
-
-        if device_info["model"] == "SunEnergyXT 500":
-            if self._key == "GS":
-                self._attr_native_max_value = 800
-            if self._key == "IS":
-                self._attr_native_max_value = 800
+        min_value, max_value = get_number_range(key, device_info["model"])
+        self._attr_native_min_value = min_value
+        self._attr_native_max_value = max_value
 
         step = meta.get("step")
         if step:
@@ -237,25 +174,12 @@ class SunlitNumber(CoordinatorEntity[SunlitDataUpdateCoordinator], NumberEntity)
         value_int = int(
             max(self._attr_native_min_value, min(self._attr_native_max_value, value))
         )
-        payload = {"state": {self._key: value_int}}
+        values = {self._key: value_int}
 
         try:
-            async with (
-                async_timeout.timeout(5),
-                self._session.post(
-                    f"http://{self._ip}/write",
-                    json=payload,
-                ) as resp,
-            ):
-                if resp.status != HTTPStatus.OK:
-                    text = await resp.text()
-                    msg = f"HTTP {resp.status}: {text}"
-                    raise RuntimeError(msg)
+            await self.coordinator.async_write(values)
         except Exception as err:
             _LOGGER.exception(err)
             raise
 
-        if isinstance(self.coordinator.data, dict):
-            self.coordinator.data[self._key] = value_int
-
         self.async_write_ha_state()
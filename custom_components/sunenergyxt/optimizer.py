@@ -0,0 +1,431 @@
+"""
+Time-of-use dispatch optimiser for SunEnergyXT 500 Series integration.
+
+This module computes the cost-minimising 24-hour schedule of grid port power
+setpoints (GS) from a tariff price forecast, a PV forecast, the battery
+capacity and the SA/SO state-of-charge limits, and feeds it into the device's
+setpoint timeline.
+
+GS is the power the device delivers at its grid port: PV production minus the
+AC power used to charge the battery, or plus the power discharged from it. The
+household grid import is the base load minus GS.
+
+Classes:
+- DispatchOptimizer: Re-plans the schedule when its inputs change
+
+Functions:
+- plan_dispatch: Vectorised dynamic program over a discretised SoC grid
+- hourly_series: Extracts an hourly forecast from an entity state
+"""
+
+from __future__ import annotations
+
+import logging
+import math
+from datetime import datetime, timedelta
+from time import monotonic
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.const import STATE_UNAVAILABLE, STATE_UNKNOWN
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, State, callback
+from homeassistant.exceptions import ServiceValidationError
+from homeassistant.helpers.event import (
+    async_call_later,
+    async_track_state_change_event,
+    async_track_time_interval,
+)
+from homeassistant.util import dt as dt_util
+
+from .limits import NUMBER_META, get_number_range
+from .scheduler import validate_timeline
+
+if TYPE_CHECKING:
+    from homeassistant.core import Event, EventStateChangedData
+
+    from .coordinator import SunlitDataUpdateCoordinator
+    from .scheduler import SetpointScheduler
+
+_LOGGER = logging.getLogger(__name__)
+
+HORIZON = 24
+SOC_STEPS = 101
+EFFICIENCY = 0.95
+REPLAN_DELAY = 5
+
+FORECAST_ATTRIBUTES = (
+    "raw_today",
+    "raw_tomorrow",
+    "prices",
+    "forecast",
+    "detailedHourly",
+    "detailedForecast",
+    "today",
+    "tomorrow",
+)
+START_KEYS = ("start", "startsAt", "period_start", "datetime", "time")
+VALUE_KEYS = ("value", "price", "total", "pv_estimate", "power")
+
+
+def plan_dispatch(
+    prices: list[float],
+    pv: list[float],
+    load: list[float],
+    capacity_wh: float,
+    soc: float,
+    soc_min: float,
+    soc_max: float,
+    gs_min: float,
+    gs_max: float,
+    max_charge_w: float,
+    max_discharge_w: float,
+    export_factor: float = 0.0,
+) -> tuple[list[float], float]:
+    """
+    Compute the cost-minimising hourly GS schedule.
+
+    Backward dynamic program over a discretised state-of-charge grid. Each stage
+    evaluates every (from, to) SoC transition at once as a NumPy matrix, so the
+    cost is HORIZON x SOC_STEPS^2 vectorised operations.
+
+    Args:
+        prices: Import price per kWh for each hour
+        pv: Expected PV power in W for each hour
+        load: Expected household load in W for each hour
+        capacity_wh: Usable battery capacity in Wh
+        soc: Current state of charge in %
+        soc_min: Lowest state of charge allowed (SO) in %
+        soc_max: Highest state of charge allowed (SA) in %
+        gs_min: Lowest GS setpoint allowed in W
+        gs_max: Highest GS setpoint allowed in W
+        max_charge_w: Maximum AC charging power in W
+        max_discharge_w: Maximum AC discharging power in W
+        export_factor: Fraction of the import price paid for exported energy
+
+    Returns:
+        Tuple of the GS setpoint per hour in W, clamped to the GS limits, and
+        the expected cost, which is infinite if no schedule keeps within the
+        limits
+
+    """
+    import numpy as np  # noqa: PLC0415
+
+    hours = len(prices)
+    price = np.asarray(prices, dtype=float)
+    net_pv = np.asarray(pv, dtype=float)
+    base = np.asarray(load, dtype=float)
+
+    grid = np.linspace(0.0, 100.0, SOC_STEPS)
+    allowed = (grid >= soc_min) & (grid <= soc_max)
+    start = int(np.abs(np.where(allowed, grid, np.inf) - soc).argmin())
+
+    step_wh = capacity_wh / (SOC_STEPS - 1)
+    battery = (np.arange(SOC_STEPS)[None, :] - np.arange(SOC_STEPS)[:, None]) * step_wh
+    ac = np.where(battery > 0, battery / EFFICIENCY, battery * EFFICIENCY)
+    feasible = (
+        allowed[:, None]
+        & allowed[None, :]
+        & (ac <= max_charge_w)
+        & (-ac <= max_discharge_w)
+    )
+
+    value = -(grid / 100.0 * capacity_wh) * EFFICIENCY * price.mean() / 1000.0
+    policy = np.empty((hours, SOC_STEPS), dtype=np.intp)
+    for hour in range(hours - 1, -1, -1):
+        gs = np.minimum(net_pv[hour] - ac, gs_max)
+        import_w = base[hour] - gs
+        cost = np.where(import_w > 0, 1.0, export_factor) * import_w * price[hour]
+        total = cost / 1000.0 + value[None, :]
+        total[~(feasible & (net_pv[hour] - ac >= gs_min))] = np.inf
+        policy[hour] = total.argmin(axis=1)
+        value = total[np.arange(SOC_STEPS), policy[hour]]
+
+    setpoints: list[float] = []
+    state = start
+    for hour in range(hours):
+        target = policy[hour, state]
+        gs = net_pv[hour] - ac[state, target]
+        setpoints.append(float(max(gs_min, min(gs, gs_max))))
+        state = target
+    return setpoints, float(value[start])
+
+
+def hourly_series(
+    state: State | None, start: datetime, hours: int, scale: float = 1.0
+) -> list[float] | None:
+    """
+    Extract an hourly forecast from an entity state.
+
+    Forecast lists in common attributes (e.g. ``raw_today``/``raw_tomorrow``,
+    ``forecast`` or ``detailedHourly``) are averaged per hour. Hours without a
+    forecast fall back to the entity's current state.
+
+    Args:
+        state: Entity state, or None if the entity does not exist
+        start: Start of the first hour
+        hours: Number of hours
+        scale: Factor applied to every value
+
+    Returns:
+        Value for each hour, or None if nothing usable is available
+
+    """
+    if state is None or state.state in (STATE_UNAVAILABLE, STATE_UNKNOWN):
+        return None
+
+    sums = [0.0] * hours
+    counts = [0] * hours
+    for attribute in FORECAST_ATTRIBUTES:
+        items = state.attributes.get(attribute)
+        if not isinstance(items, list):
+            continue
+        for item in items:
+            if not isinstance(item, dict):
+                continue
+            at = next((item[k] for k in START_KEYS if k in item), None)
+            raw = next((item[k] for k in VALUE_KEYS if k in item), None)
+            if not isinstance(at, datetime):
+                at = dt_util.parse_datetime(str(at)) if at is not None else None
+            if at is None or raw is None:
+                continue
+            index = int((at - start).total_seconds() // 3600)
+            if 0 <= index < hours:
+                try:
+                    sums[index] += float(raw)
+                except (TypeError, ValueError):
+                    continue
+                counts[index] += 1
+
+    try:
+        fallback: float | None = float(state.state)
+    except ValueError:
+        fallback = None
+    if fallback is None and not any(counts):
+        return None
+
+    return [
+        (sums[i] / counts[i] if counts[i] else (fallback or 0.0)) * scale
+        for i in range(hours)
+    ]
+
+
+class DispatchOptimizer:
+    """
+    Time-of-use optimiser for one device.
+
+    Plans are recomputed in the executor when the price or PV forecast changes
+    and at a fixed interval, but only when the rounded inputs differ from those
+    of the previous plan. Each new plan replaces the device's setpoint timeline.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        coordinator: SunlitDataUpdateCoordinator,
+        scheduler: SetpointScheduler,
+        model: str | None,
+        price_entity_id: str,
+        pv_entity_id: str | None,
+        capacity_kwh: float,
+        base_load: float,
+        export_factor: float,
+        interval: int,
+    ) -> None:
+        """
+        Initialize the optimiser.
+
+        Args:
+            hass: Home Assistant instance
+            coordinator: Data update coordinator of the device
+            scheduler: Setpoint scheduler receiving the plan
+            model: Device model, used for the GS limits
+            price_entity_id: Entity with the current price and its forecast
+            pv_entity_id: Entity with the PV power forecast, if any
+            capacity_kwh: Usable battery capacity in kWh
+            base_load: Expected household load in W
+            export_factor: Fraction of the import price paid for exported energy
+            interval: Minutes between periodic re-plans
+
+        """
+        self._hass = hass
+        self._coordinator = coordinator
+        self._scheduler = scheduler
+        self._model = model
+        self._price_entity_id = price_entity_id
+        self._pv_entity_id = pv_entity_id
+        self._capacity_wh = capacity_kwh * 1000
+        self._base_load = base_load
+        self._export_factor = export_factor
+        self._interval = timedelta(minutes=interval)
+        self._unsubs: list[CALLBACK_TYPE] = []
+        self._unsub_delay: CALLBACK_TYPE | None = None
+        self._last_inputs: tuple | None = None
+
+        self.plan_count = 0
+        self.skipped_count = 0
+        self.last_duration: float | None = None
+        self.last_plan: list[float] = []
+        self.last_cost: float | None = None
+        self.last_planned: datetime | None = None
+
+    @callback
+    def async_start(self) -> None:
+        """Follow the inputs and plan for the first time."""
+        entities = [self._price_entity_id]
+        if self._pv_entity_id:
+            entities.append(self._pv_entity_id)
+        self._unsubs.append(
+            async_track_state_change_event(
+                self._hass, entities, self._async_input_changed
+            )
+        )
+        self._unsubs.append(
+            async_track_time_interval(
+                self._hass, self._async_replan_now, self._interval
+            )
+        )
+        self._async_schedule_replan()
+
+    @callback
+    def async_stop(self) -> None:
+        """Stop following the inputs."""
+        for unsub in self._unsubs:
+            unsub()
+        self._unsubs.clear()
+        if self._unsub_delay is not None:
+            self._unsub_delay()
+            self._unsub_delay = None
+
+    @callback
+    def _async_input_changed(self, _event: Event[EventStateChangedData]) -> None:
+        """Re-plan shortly after an input changed."""
+        self._async_schedule_replan()
+
+    @callback
+    def _async_schedule_replan(self) -> None:
+        """Re-plan after a short delay, coalescing bursts of input changes."""
+        if self._unsub_delay is None:
+            self._unsub_delay = async_call_later(
+                self._hass, REPLAN_DELAY, self._async_replan_now
+            )
+
+    async def _async_replan_now(self, _now: datetime | None = None) -> None:
+        """Re-plan if the inputs changed since the last plan."""
+        self._unsub_delay = None
+        inputs = self._collect_inputs()
+        if inputs is None:
+            return
+        if inputs == self._last_inputs:
+            self.skipped_count += 1
+            return
+
+        started = monotonic()
+        try:
+            setpoints, cost = await self._hass.async_add_executor_job(
+                plan_dispatch, *inputs[1:]
+            )
+        except Exception:
+            _LOGGER.exception("Error planning SunEnergyXT dispatch")
+            return
+        self.last_duration = monotonic() - started
+        self._last_inputs = inputs
+        if not math.isfinite(cost):
+            _LOGGER.warning(
+                "No dispatch plan keeps within the SoC and GS limits, "
+                "keeping the current timeline"
+            )
+            return
+
+        step = NUMBER_META["GS"]["step"]
+        start: datetime = inputs[0]
+        gs_min, gs_max = inputs[8], inputs[9]
+        self.last_plan = [
+            max(gs_min, min(round(gs / step) * step, gs_max)) for gs in setpoints
+        ]
+        self.last_cost = cost
+        self.last_planned = dt_util.now()
+        self.plan_count += 1
+
+        # Hours are counted in UTC; when clocks go back, the repeated local
+        # hour keeps its first setpoint
+        transitions: dict[str, dict[str, Any]] = {}
+        for hour, gs in enumerate(self.last_plan):
+            at = dt_util.as_local(dt_util.as_utc(start) + timedelta(hours=hour))
+            transitions.setdefault(
+                at.time().isoformat(), {"time": at.time(), "settings": {"GS": gs}}
+            )
+        try:
+            timeline = validate_timeline(list(transitions.values()), self._model)
+        except ServiceValidationError as err:
+            _LOGGER.warning("Invalid SunEnergyXT dispatch plan: %s", err)
+            return
+        self._scheduler.async_update_timeline(timeline)
+
+    def _collect_inputs(self) -> tuple | None:
+        """
+        Gather and round the planning inputs.
+
+        Returns:
+            Tuple of the plan start followed by the plan_dispatch arguments, or
+            None if the price or device data is not available
+
+        """
+        start = dt_util.now().replace(minute=0, second=0, microsecond=0)
+        prices = hourly_series(
+            self._hass.states.get(self._price_entity_id), start, HORIZON
+        )
+        if prices is None:
+            return None
+
+        pv: list[float] | None = None
+        if self._pv_entity_id:
+            state = self._hass.states.get(self._pv_entity_id)
+            unit = state.attributes.get("unit_of_measurement") if state else None
+            scale = 1000.0 if unit in ("kW", "kWh") else 1.0
+            pv = hourly_series(state, start, HORIZON, scale)
+
+        data = self._coordinator.data or {}
+        try:
+            soc = float(data["SC"])
+            soc_min = float(data["SO"])
+            soc_max = float(data["SA"])
+            inverter_max = float(data.get("IS", NUMBER_META["IS"]["max_value"]))
+        except (KeyError, TypeError, ValueError):
+            return None
+
+        gs_min, gs_max = get_number_range("GS", self._model)
+        return (
+            start,
+            tuple(round(p, 4) for p in prices),
+            tuple(round(p) for p in (pv or [0.0] * HORIZON)),
+            (self._base_load,) * HORIZON,
+            self._capacity_wh,
+            round(soc),
+            soc_min,
+            soc_max,
+            gs_min,
+            gs_max,
+            -gs_min,
+            min(gs_max, inverter_max),
+            self._export_factor,
+        )
+
+    def get_diagnostics(self) -> dict[str, Any]:
+        """
+        Get optimiser state for diagnostics.
+
+        Returns:
+            Dictionary describing the optimiser
+
+        """
+        return {
+            "price_entity_id": self._price_entity_id,
+            "pv_entity_id": self._pv_entity_id,
+            "plan_count": self.plan_count,
+            "skipped_count": self.skipped_count,
+            "last_duration": self.last_duration,
+            "last_cost": self.last_cost,
+            "last_planned": (
+                self.last_planned.isoformat() if self.last_planned else None
+            ),
+            "last_plan": self.last_plan,
+        }
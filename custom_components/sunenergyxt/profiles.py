@@ -0,0 +1,176 @@
+"""
+Settings profiles for SunEnergyXT 500 Series integration.
+
+This module implements a persistent store of named settings profiles, such as
+summer, winter or time-of-use configurations, and the validation used before a
+profile is written to a device.
+
+Classes:
+- ProfileStore: Persistent store of named settings profiles
+
+Functions:
+- validate_settings: Validates settings against the ranges of a device model
+
+Constants:
+- PROFILE_KEYS: Parameter keys a profile may contain
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.exceptions import ServiceValidationError
+from homeassistant.helpers.storage import Store
+
+from .const import DOMAIN
+from .limits import NUMBER_META, get_number_range
+
+if TYPE_CHECKING:
+    from homeassistant.core import HomeAssistant
+
+STORAGE_VERSION = 1
+STORAGE_KEY = f"{DOMAIN}.profiles"
+
+SWITCH_KEYS = ("LM", "MM", "PM")
+TEXT_KEYS = ("MD", "TZ")
+PROFILE_KEYS = (*NUMBER_META, *SWITCH_KEYS, *TEXT_KEYS)
+
+
+def validate_settings(
+    settings: dict[str, Any], model: str | None
+) -> dict[str, int | str]:
+    """
+    Validate settings against the NUMBER_META ranges and per-model limits.
+
+    Numbers must be integral multiples of their NUMBER_META step.
+
+    Args:
+        settings: Dictionary mapping parameter keys to values
+        model: Device model, or None to check the generic ranges only
+
+    Returns:
+        Dictionary mapping parameter keys to validated values; setting MD also
+        sets MM the same way the text entity does
+
+    Raises:
+        ServiceValidationError: If a key is unknown or a value is out of range
+            or not a multiple of its step
+
+    """
+    validated: dict[str, int | str] = {}
+    for key, raw in settings.items():
+        key_upper = str(key).upper()
+        if key_upper not in PROFILE_KEYS:
+            msg = f"Unsupported setting {key}"
+            raise ServiceValidationError(msg)
+
+        if key_upper in TEXT_KEYS:
+            validated[key_upper] = str(raw)
+            if key_upper == "MD":
+                validated["MM"] = 0 if str(raw).strip() == "" else 1
+            continue
+
+        if key_upper in SWITCH_KEYS:
+            try:
+                value = int(raw)
+            except (TypeError, ValueError):
+                value = None
+            if value not in (0, 1):
+                msg = f"{key_upper} must be 0 or 1, got {raw}"
+                raise ServiceValidationError(msg)
+            validated[key_upper] = value
+            continue
+
+        try:
+            value = float(raw)
+        except (TypeError, ValueError) as err:
+            msg = f"{key_upper} must be a number, got {raw}"
+            raise ServiceValidationError(msg) from err
+        min_value, max_value = get_number_range(key_upper, model)
+        if not min_value <= value <= max_value:
+            msg = f"{key_upper}={raw} is outside {min_value}..{max_value}"
+            raise ServiceValidationError(msg)
+        step = NUMBER_META[key_upper]["step"]
+        if not value.is_integer() or value % step:
+            msg = f"{key_upper}={raw} is not a multiple of {step}"
+            raise ServiceValidationError(msg)
+        validated[key_upper] = int(value)
+    return validated
+
+
+class ProfileStore:
+    """
+    Persistent store of named settings profiles.
+
+    Profiles are shared by all devices and loaded from storage on first use.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """
+        Initialize the profile store.
+
+        Args:
+            hass: Home Assistant instance
+
+        """
+        self._store: Store[dict[str, dict[str, int | str]]] = Store(
+            hass, STORAGE_VERSION, STORAGE_KEY
+        )
+        self._profiles: dict[str, dict[str, int | str]] | None = None
+
+    async def _async_load(self) -> dict[str, dict[str, int | str]]:
+        """
+        Load the profiles from storage if not loaded yet.
+
+        Returns:
+            Dictionary mapping profile names to their settings
+
+        """
+        if self._profiles is None:
+            self._profiles = await self._store.async_load() or {}
+        return self._profiles
+
+    async def async_get(self, name: str) -> dict[str, int | str]:
+        """
+        Get a profile.
+
+        Args:
+            name: Profile name
+
+        Returns:
+            Settings of the profile
+
+        Raises:
+            ServiceValidationError: If the profile does not exist
+
+        """
+        profiles = await self._async_load()
+        if name not in profiles:
+            msg = f"Unknown profile {name}"
+            raise ServiceValidationError(msg)
+        return profiles[name]
+
+    async def async_save(self, name: str, settings: dict[str, Any]) -> None:
+        """
+        Validate and save a profile, replacing any profile of the same name.
+
+        Args:
+            name: Profile name
+            settings: Dictionary mapping parameter keys to values
+
+        """
+        profiles = await self._async_load()
+        profiles[name] = validate_settings(settings, None)
+        await self._store.async_save(profiles)
+
+    async def async_delete(self, name: str) -> None:
+        """
+        Delete a profile.
+
+        Args:
+            name: Profile name
+
+        """
+        profiles = await self._async_load()
+        if profiles.pop(name, None) is not None:
+            await self._store.async_save(profiles)
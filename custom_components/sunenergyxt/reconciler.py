@@ -0,0 +1,293 @@
+"""
+Desired-state reconciler for SunEnergyXT 500 Series integration.
+
+This module keeps the settings last written to a device by an entity or a
+service as a persisted desired state, and writes them again when the device
+does not report them, such as after a failed write while the device was offline
+or after the device rebooted. Settings written by the timeline or a control
+loop are left to them, since they keep writing their own values.
+
+Classes:
+- DesiredStateReconciler: Reconciles the desired state with the reported one
+
+Constants:
+- ENFORCE: Conflict policy re-applying the desired value
+- ADOPT: Conflict policy adopting a value changed on the device
+- CONFLICT_POLICIES: Conflict policy of each key, ENFORCE when not listed
+"""
+
+from __future__ import annotations
+
+import logging
+from datetime import datetime, timedelta
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+
+from .const import DOMAIN
+from .profiles import PROFILE_KEYS
+
+if TYPE_CHECKING:
+    from .coordinator import SunlitDataUpdateCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+STORAGE_VERSION = 1
+# Seconds a change of the desired state is kept in memory before it is saved
+SAVE_DELAY = 30
+
+ENFORCE = "enforce"
+ADOPT = "adopt"
+# Settings usually changed on the device itself or by an installer follow the
+# device; everything the integration controls is enforced
+CONFLICT_POLICIES = {"PT": ADOPT, "PM": ADOPT, "TZ": ADOPT}
+
+# A pause between samples longer than this many sample intervals, and at least
+# MIN_OFFLINE_GAP, is treated as the device having been offline or rebooted, so
+# drift is never taken for a change made on the device
+OFFLINE_INTERVALS = 3
+MIN_OFFLINE_GAP = timedelta(seconds=30)
+# Minimum time between reconciling writes
+RETRY_INTERVAL = timedelta(seconds=30)
+# Reconciling writes per key after which a value the device keeps reporting
+# differently is given up
+MAX_ATTEMPTS = 5
+
+
+def _matches(reported: Any, desired: int | str) -> bool:
+    """
+    Check whether a reported value matches a desired one.
+
+    Args:
+        reported: Raw reported value
+        desired: Desired value
+
+    Returns:
+        True if the values are equal
+
+    """
+    if isinstance(desired, str):
+        return str(reported) == desired
+    try:
+        return int(float(reported)) == desired
+    except (TypeError, ValueError):
+        return False
+
+
+class DesiredStateReconciler:
+    """
+    Desired-state reconciler for one device.
+
+    Every write attempt is recorded per key, the last value winning, and saved
+    to storage, so intents survive failed writes and restarts. Each sample is
+    compared with the desired state: a key is confirmed once the device
+    reports it, and drifted keys are written again together in one request.
+    A confirmed key the device changes while it stayed reachable is a change
+    made on the device; its CONFLICT_POLICIES entry decides whether it is
+    overwritten (ENFORCE) or becomes the new desired value (ADOPT). A key the
+    device never confirms within MAX_ATTEMPTS writes is dropped.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        coordinator: SunlitDataUpdateCoordinator,
+        entry_id: str,
+    ) -> None:
+        """
+        Initialize the reconciler.
+
+        Args:
+            hass: Home Assistant instance
+            coordinator: Data update coordinator of the device
+            entry_id: Config entry ID, used for the persisted state
+
+        """
+        self._hass = hass
+        self._coordinator = coordinator
+        self._offline_gap = max(
+            MIN_OFFLINE_GAP, OFFLINE_INTERVALS * coordinator.sample_interval
+        )
+        self._store: Store[dict[str, dict[str, Any]]] = Store(
+            hass, STORAGE_VERSION, f"{DOMAIN}.desired.{entry_id}"
+        )
+        # Key to desired value, whether the device confirmed it, and the
+        # reconciling writes since it was last set or confirmed
+        self._desired: dict[str, dict[str, Any]] = {}
+        self._unsubs: list[CALLBACK_TYPE] = []
+        self._last_sample: datetime | None = None
+        self._last_attempt: datetime | None = None
+        # Payloads of the reconciling writes in flight, told apart from other
+        # writes by identity since the coordinator hands listeners the same dict
+        self._reconciling: list[dict[str, int | str]] = []
+
+        self.reconcile_count = 0
+        self.adopt_count = 0
+
+    async def async_start(self) -> None:
+        """Load the desired state and start following writes and samples."""
+        self._desired = await self._store.async_load() or {}
+        self._unsubs.append(
+            self._coordinator.async_add_write_listener(self._async_written)
+        )
+        self._unsubs.append(
+            self._coordinator.async_add_sample_listener(self._async_sample)
+        )
+
+    @callback
+    def async_stop(self) -> None:
+        """Stop following writes and samples."""
+        for unsub in self._unsubs:
+            unsub()
+        self._unsubs.clear()
+
+    def _data_to_save(self) -> dict[str, dict[str, Any]]:
+        """
+        Get the persisted state.
+
+        Returns:
+            Desired state of every key
+
+        """
+        return self._desired
+
+    @callback
+    def _async_written(
+        self,
+        values: dict[str, Any],
+        _success: bool,  # noqa: FBT001
+        control: bool,  # noqa: FBT001
+    ) -> None:
+        """
+        Record the values of a write attempt as the desired state.
+
+        The reconciler's own writes only repeat the desired state and are
+        skipped; writes made concurrently by anything else are recorded. Keys
+        written by the timeline or a control loop are dropped from the desired
+        state instead, so an older value is not enforced against them.
+
+        Args:
+            values: Values that were written
+            _success: Whether the write succeeded
+            control: Whether the timeline or a control loop wrote the values
+
+        """
+        if any(values is payload for payload in self._reconciling):
+            return
+        changed = False
+        for key, value in values.items():
+            if key not in PROFILE_KEYS:
+                continue
+            if control:
+                changed |= self._desired.pop(key, None) is not None
+                continue
+            self._desired[key] = {"value": value, "confirmed": False, "attempts": 0}
+            changed = True
+        if changed:
+            self._store.async_delay_save(self._data_to_save, SAVE_DELAY)
+
+    @callback
+    def _async_sample(self, reported: dict[str, Any], sampled_at: datetime) -> None:
+        """
+        Compare a sample with the desired state and reconcile drifted keys.
+
+        Args:
+            reported: Raw reported data
+            sampled_at: Time the sample was taken
+
+        """
+        was_offline = (
+            self._last_sample is None
+            or sampled_at - self._last_sample > self._offline_gap
+        )
+        self._last_sample = sampled_at
+
+        drifted: dict[str, int | str] = {}
+        changed = False
+        for key, entry in list(self._desired.items()):
+            if key not in reported:
+                continue
+            value = entry["value"]
+            if _matches(reported[key], value):
+                if not entry["confirmed"] or entry["attempts"]:
+                    entry.update(confirmed=True, attempts=0)
+                    changed = True
+                continue
+
+            if (
+                entry["confirmed"]
+                and not was_offline
+                and CONFLICT_POLICIES.get(key, ENFORCE) == ADOPT
+            ):
+                _LOGGER.info(
+                    "%s changed on the device from %s to %s, adopting it",
+                    key,
+                    value,
+                    reported[key],
+                )
+                entry["value"] = (
+                    str(reported[key]) if isinstance(value, str) else reported[key]
+                )
+                self.adopt_count += 1
+                changed = True
+                continue
+            if entry["attempts"] >= MAX_ATTEMPTS:
+                _LOGGER.warning(
+                    "Device keeps reporting %s=%s instead of %s, giving up",
+                    key,
+                    reported[key],
+                    value,
+                )
+                del self._desired[key]
+                changed = True
+                continue
+            drifted[key] = value
+
+        if changed:
+            self._store.async_delay_save(self._data_to_save, SAVE_DELAY)
+        if drifted and (
+            self._last_attempt is None
+            or sampled_at - self._last_attempt >= RETRY_INTERVAL
+        ):
+            self._last_attempt = sampled_at
+            self._hass.async_create_task(
+                self._async_reconcile(drifted), f"sunenergyxt reconcile {drifted}"
+            )
+
+    async def _async_reconcile(self, drifted: dict[str, int | str]) -> None:
+        """
+        Write the drifted keys in one request.
+
+        Args:
+            drifted: Desired values of the drifted keys
+
+        """
+        _LOGGER.debug("Reconciling %s", drifted)
+        for key in drifted:
+            if key in self._desired:
+                self._desired[key]["attempts"] += 1
+        self._reconciling.append(drifted)
+        try:
+            await self._coordinator.async_write(drifted)
+        except Exception as err:  # noqa: BLE001
+            _LOGGER.debug("Error reconciling %s: %s", drifted, err)
+            return
+        finally:
+            self._reconciling.remove(drifted)
+        self.reconcile_count += 1
+        self._coordinator.async_publish()
+
+    def get_diagnostics(self) -> dict[str, Any]:
+        """
+        Get reconciler state for diagnostics.
+
+        Returns:
+            Dictionary describing the desired state
+
+        """
+        return {
+            "desired": self._desired,
+            "reconcile_count": self.reconcile_count,
+            "adopt_count": self.adopt_count,
+        }
@@ -0,0 +1,119 @@
+"""
+Cached mDNS host name resolution for SunEnergyXT 500 Series integration.
+
+Every device announces itself as SunEnergyXT_AIO_<SN>.local. This module
+resolves that name through Home Assistant's shared zeroconf instance, whose
+record cache usually answers without a network request, so a device that got
+a new address from DHCP is found again without reloading its config entry.
+
+Classes:
+- HostResolver: Resolves and caches the address of one device
+"""
+
+from __future__ import annotations
+
+import logging
+from time import monotonic
+from typing import TYPE_CHECKING, Any
+
+from .const import HOST_PREFIX, HOST_SUFFIX
+
+if TYPE_CHECKING:
+    from homeassistant.config_entries import ConfigEntry
+    from homeassistant.core import HomeAssistant
+
+_LOGGER = logging.getLogger(__name__)
+
+# Seconds a resolved address is trusted before the name is resolved again
+RESOLVE_INTERVAL = 60
+# Milliseconds allowed for a resolution that is not answered from the cache
+RESOLVE_TIMEOUT = 3000
+
+
+class HostResolver:
+    """
+    Cached resolver of the mDNS host name of one device.
+
+    A lookup is made at most once per RESOLVE_INTERVAL; in between, the last
+    address is returned. When the name resolves to a new address, the config
+    entry data is updated, which the integration applies in place.
+    """
+
+    def __init__(self, hass: HomeAssistant, entry: ConfigEntry) -> None:
+        """
+        Initialize the resolver.
+
+        Args:
+            hass: Home Assistant instance
+            entry: Config entry of the device
+
+        """
+        self._hass = hass
+        self._entry = entry
+        self.hostname = f"{HOST_PREFIX}{entry.data.get('sn')}{HOST_SUFFIX}"
+        self._resolved_at: float | None = None
+
+        self.resolve_count = 0
+        self.change_count = 0
+
+    async def _async_lookup(self) -> str | None:
+        """
+        Resolve the host name to an IPv4 address.
+
+        Returns:
+            Address of the device, or None if the name did not resolve
+
+        """
+        # Zeroconf is only used once a device cannot be reached
+        from homeassistant.components import zeroconf  # noqa: PLC0415
+        from zeroconf import AddressResolver, IPVersion  # noqa: PLC0415
+
+        aiozc = await zeroconf.async_get_async_instance(self._hass)
+        resolver = AddressResolver(f"{self.hostname}.")
+        if not await resolver.async_request(aiozc.zeroconf, RESOLVE_TIMEOUT):
+            return None
+        addresses = resolver.parsed_addresses(IPVersion.V4Only)
+        return addresses[0] if addresses else None
+
+    async def async_refresh(self) -> str | None:
+        """
+        Resolve the host name again unless it was resolved recently.
+
+        Returns:
+            New address of the device, or None if it did not change, was
+            resolved recently or could not be resolved
+
+        """
+        now = monotonic()
+        if self._resolved_at is not None and now - self._resolved_at < RESOLVE_INTERVAL:
+            return None
+        self._resolved_at = now
+        self.resolve_count += 1
+        try:
+            address = await self._async_lookup()
+        except Exception as err:  # noqa: BLE001
+            _LOGGER.debug("Cannot resolve %s: %s", self.hostname, err)
+            return None
+        if address is None or address == (previous := self._entry.data.get("ip")):
+            return None
+
+        _LOGGER.info("%s moved from %s to %s", self.hostname, previous, address)
+        self.change_count += 1
+        self._hass.config_entries.async_update_entry(
+            self._entry, data={**self._entry.data, "ip": address}
+        )
+        return address
+
+    def get_diagnostics(self) -> dict[str, Any]:
+        """
+        Get resolver state for diagnostics.
+
+        Returns:
+            Dictionary describing the resolver
+
+        """
+        return {
+            "hostname": self.hostname,
+            "resolve_count": self.resolve_count,
+            "change_count": self.change_count,
+        }
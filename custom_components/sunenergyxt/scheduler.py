@@ -0,0 +1,331 @@
+"""
+Setpoint timeline scheduler for SunEnergyXT 500 Series integration.
+
+This module implements a per-device daily timeline of setpoint changes, stored
+in the config entry options, driven by a single timer that only fires at the
+next transition.
+
+Classes:
+- SetpointScheduler: Applies a daily timeline of setpoint changes to a device
+
+Functions:
+- validate_timeline: Validates a timeline against the limits of a device model
+
+Constants:
+- TIMELINE_KEYS: Parameter keys a timeline transition may change
+"""
+
+from __future__ import annotations
+
+import logging
+from datetime import datetime, time, timedelta
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.exceptions import ServiceValidationError
+from homeassistant.helpers.event import async_track_point_in_time
+from homeassistant.helpers.storage import Store
+from homeassistant.util import dt as dt_util
+
+from .const import DOMAIN
+from .profiles import validate_settings
+
+if TYPE_CHECKING:
+    from .coordinator import SunlitDataUpdateCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+STORAGE_VERSION = 1
+# Failed writes after which a transition is given up
+MAX_ATTEMPTS = 5
+
+TIMELINE_KEYS = ("GS", "IS", "SO", "SA")
+
+
+def validate_timeline(
+    timeline: list[dict[str, Any]], model: str | None
+) -> list[dict[str, Any]]:
+    """
+    Validate a timeline and normalise it for storage.
+
+    Args:
+        timeline: Transitions with a time of day and the settings to apply
+        model: Device model, used for the setpoint limits
+
+    Returns:
+        Transitions sorted by time, with times as ISO strings
+
+    Raises:
+        ServiceValidationError: If a transition is malformed or out of range
+
+    """
+    normalised: dict[str, dict[str, Any]] = {}
+    for transition in timeline:
+        at = transition["time"]
+        if not isinstance(at, time):
+            try:
+                at = time.fromisoformat(str(at))
+            except ValueError as err:
+                msg = f"Invalid transition time {at}"
+                raise ServiceValidationError(msg) from err
+
+        settings = validate_settings(transition["settings"], model)
+        if unsupported := set(settings) - set(TIMELINE_KEYS):
+            msg = f"Unsupported timeline settings {', '.join(sorted(unsupported))}"
+            raise ServiceValidationError(msg)
+        normalised[at.replace(microsecond=0).isoformat()] = settings
+
+    return [
+        {"time": at, "settings": settings}
+        for at, settings in sorted(normalised.items())
+    ]
+
+
+class SetpointScheduler:
+    """
+    Daily setpoint timeline for one device.
+
+    Only one timer is armed at a time, for the next transition. The time of the
+    last applied transition is persisted, so a transition missed while Home
+    Assistant was down is applied on start, and one that failed because the
+    device was unreachable is retried when the device reports again, up to
+    MAX_ATTEMPTS times. A new timeline applies its active transition at once.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        coordinator: SunlitDataUpdateCoordinator,
+        entry_id: str,
+        timeline: list[dict[str, Any]],
+    ) -> None:
+        """
+        Initialize the scheduler.
+
+        Args:
+            hass: Home Assistant instance
+            coordinator: Data update coordinator of the device
+            entry_id: Config entry ID, used for the persisted state
+            timeline: Validated timeline from the config entry options
+
+        """
+        self._hass = hass
+        self._coordinator = coordinator
+        self._store: Store[dict[str, Any]] = Store(
+            hass, STORAGE_VERSION, f"{DOMAIN}.schedule.{entry_id}"
+        )
+        self._timeline: list[tuple[time, dict[str, Any]]] = []
+        self._last_applied: datetime | None = None
+        self._pending: tuple[datetime, dict[str, Any]] | None = None
+        self._attempts = 0
+        self._applying = False
+        self._unsub_timer: CALLBACK_TYPE | None = None
+        self._unsub_coordinator: CALLBACK_TYPE | None = None
+        self._set_timeline(timeline)
+
+    def _set_timeline(self, timeline: list[dict[str, Any]]) -> None:
+        """
+        Replace the timeline.
+
+        Args:
+            timeline: Validated timeline
+
+        """
+        self._timeline = [
+            (time.fromisoformat(transition["time"]), transition["settings"])
+            for transition in timeline
+        ]
+
+    async def async_start(self) -> None:
+        """Apply any missed transition and arm the timer for the next one."""
+        stored = await self._store.async_load() or {}
+        if last_applied := stored.get("last_applied"):
+            self._last_applied = dt_util.parse_datetime(last_applied)
+
+        self._unsub_coordinator = self._coordinator.async_add_listener(
+            self._async_coordinator_updated
+        )
+        self._async_catch_up()
+        self._async_schedule_next()
+
+    @callback
+    def async_stop(self) -> None:
+        """Cancel the timer and stop following the coordinator."""
+        if self._unsub_timer is not None:
+            self._unsub_timer()
+            self._unsub_timer = None
+        if self._unsub_coordinator is not None:
+            self._unsub_coordinator()
+            self._unsub_coordinator = None
+
+    def controls(self, key: str) -> bool:
+        """
+        Check whether the timeline sets a parameter.
+
+        Args:
+            key: Parameter key
+
+        Returns:
+            True if any transition of the timeline sets the key
+
+        """
+        return any(key in settings for _, settings in self._timeline)
+
+    @callback
+    def async_update_timeline(self, timeline: list[dict[str, Any]]) -> None:
+        """
+        Replace the timeline in place and apply its active transition.
+
+        Args:
+            timeline: Validated timeline
+
+        """
+        self._set_timeline(timeline)
+        self._pending = None
+        self._last_applied = None
+        self._async_catch_up()
+        self._async_schedule_next()
+
+    def _occurrence(self, at: time, day: datetime) -> datetime:
+        """
+        Get the local datetime of a transition time on a given day.
+
+        Args:
+            at: Transition time of day
+            day: Any datetime on the wanted day
+
+        Returns:
+            Timezone-aware datetime of the transition
+
+        """
+        return datetime.combine(day.date(), at, tzinfo=dt_util.get_default_time_zone())
+
+    @callback
+    def _async_catch_up(self) -> None:
+        """Apply the active transition if it has not been applied yet."""
+        if not self._timeline:
+            return
+        now = dt_util.now()
+        candidates = [
+            self._occurrence(at, now - timedelta(days=offset))
+            for offset in (0, 1)
+            for at, _ in self._timeline
+        ]
+        past = [(when, i) for i, when in enumerate(candidates) if when <= now]
+        if not past:
+            return
+        when, index = max(past)
+        if self._last_applied is not None and when <= self._last_applied:
+            return
+        settings = self._timeline[index % len(self._timeline)][1]
+        self._async_set_pending(when, settings)
+
+    @callback
+    def _async_schedule_next(self) -> None:
+        """Arm the timer for the next transition."""
+        if self._unsub_timer is not None:
+            self._unsub_timer()
+            self._unsub_timer = None
+        if not self._timeline:
+            return
+
+        now = dt_util.now()
+        upcoming = [
+            (self._occurrence(at, now + timedelta(days=offset)), settings)
+            for offset in (0, 1)
+            for at, settings in self._timeline
+        ]
+        when, settings = min(
+            ((w, s) for w, s in upcoming if w > now), key=lambda item: item[0]
+        )
+
+        @callback
+        def _async_fire(_now: datetime) -> None:
+            self._unsub_timer = None
+            self._async_set_pending(when, settings)
+            self._async_schedule_next()
+
+        self._unsub_timer = async_track_point_in_time(self._hass, _async_fire, when)
+
+    @callback
+    def _async_set_pending(self, when: datetime, settings: dict[str, Any]) -> None:
+        """
+        Make a transition the pending one, replacing any other, and apply it.
+
+        Args:
+            when: Time of the transition
+            settings: Settings of the transition
+
+        """
+        self._pending = (when, settings)
+        self._attempts = 0
+        self._hass.async_create_task(
+            self._async_apply_pending(), "sunenergyxt timeline transition"
+        )
+
+    @callback
+    def _async_coordinator_updated(self) -> None:
+        """Retry a pending transition once the device reports again."""
+        if (
+            self._pending is not None
+            and self._coordinator.last_update_success
+            and not self._coordinator.stale
+        ):
+            self._hass.async_create_task(
+                self._async_apply_pending(), "sunenergyxt timeline retry"
+            )
+
+    async def _async_apply_pending(self) -> None:
+        """Write the pending transition's changed settings to the device."""
+        if self._pending is None or self._applying:
+            return
+        when, settings = self._pending
+        reported = self._coordinator.data or {}
+        changed = {
+            key: value for key, value in settings.items() if reported.get(key) != value
+        }
+        if changed:
+            self._applying = True
+            try:
+                await self._coordinator.async_write(changed, control=True)
+            except Exception as err:  # noqa: BLE001
+                self._attempts += 1
+                if self._attempts < MAX_ATTEMPTS:
+                    _LOGGER.debug(
+                        "Error applying timeline transition of %s, will retry: %s",
+                        when.time().isoformat(),
+                        err,
+                    )
+                    return
+                _LOGGER.warning(
+                    "Giving up timeline transition of %s after %d attempts: %s",
+                    when.time().isoformat(),
+                    self._attempts,
+                    err,
+                )
+            else:
+                self._coordinator.async_publish()
+            finally:
+                self._applying = False
+
+        if self._pending is not None and self._pending[0] == when:
+            self._pending = None
+            self._attempts = 0
+        self._last_applied = when
+        await self._store.async_save({"last_applied": when.isoformat()})
+
+    def get_diagnostics(self) -> dict[str, Any]:
+        """
+        Get scheduler state for diagnostics.
+
+        Returns:
+            Dictionary describing the scheduler
+
+        """
+        return {
+            "transitions": len(self._timeline),
+            "last_applied": (
+                self._last_applied.isoformat() if self._last_applied else None
+            ),
+            "pending": self._pending[0].isoformat() if self._pending else None,
+        }
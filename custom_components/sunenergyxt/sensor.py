@@ -6,23 +6,39 @@ providing monitoring of various device parameters such as power, energy, and sta
 
 Classes:
 - SunlitSensor: Represents a sensor entity for monitoring SunEnergyXT device parameters
+- SunlitDerivedSensor: Represents a sensor entity for a derived value
 
 Constants:
 - SENSOR_META: Metadata configuration for sensor entities, including units,
-  state classes, and scaling factors
+  state classes, display precision, and publishing deadbands
+- DERIVED_META: Metadata configuration for the derived sensors, including the
+  runtime object providing each value (default "analytics")
 """
 
 import logging
+from time import monotonic
 from typing import Any
 
-from homeassistant.components.sensor import SensorEntity, SensorStateClass
+from homeassistant.components.sensor import (
+    SensorDeviceClass,
+    SensorEntity,
+    SensorStateClass,
+)
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity import DeviceInfo, EntityCategory
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
-from .const import DOMAIN
+from .analytics import BatteryEstimator, PackAnalytics
+from .anomaly import AnomalyDetector
+from .api import scale_value
+from .const import (
+    CONF_DEADBAND_MAX_AGE,
+    CONF_DEADBANDS,
+    DEFAULT_DEADBAND_MAX_AGE,
+    DOMAIN,
+)
 from .coordinator import SunlitDataUpdateCoordinator
 
 _LOGGER = logging.getLogger(__name__)
@@ -63,105 +79,110 @@ SENSOR_META: dict[str, dict[str, Any]] = {
         "unit": "W",
         "entity_category": EntityCategory.DIAGNOSTIC,
         "state_class": SensorStateClass.MEASUREMENT,
+        "deadband_rel": 0.02,
         "icon": "mdi:solar-panel",
     },
     "PV2": {
         "unit": "W",
         "entity_category": EntityCategory.DIAGNOSTIC,
         "state_class": SensorStateClass.MEASUREMENT,
+        "deadband_rel": 0.02,
         "icon": "mdi:solar-panel",
     },
     "PV3": {
         "unit": "W",
         "entity_category": EntityCategory.DIAGNOSTIC,
         "state_class": SensorStateClass.MEASUREMENT,
+        "deadband_rel": 0.02,
         "icon": "mdi:solar-panel",
     },
     "PV4": {
         "unit": "W",
         "entity_category": EntityCategory.DIAGNOSTIC,
         "state_class": SensorStateClass.MEASUREMENT,
+        "deadband_rel": 0.02,
         "icon": "mdi:solar-panel",
     },
     "II1": {
         "unit": "A",
-        "scale": 0.1,
         "precision": 1,
         "entity_category": EntityCategory.DIAGNOSTIC,
         "state_class": SensorStateClass.MEASUREMENT,
+        "deadband": 0.2,
         "icon": "mdi:current-dc",
     },
     "II2": {
         "unit": "A",
-        "scale": 0.1,
         "precision": 1,
         "entity_category": EntityCategory.DIAGNOSTIC,
         "state_class": SensorStateClass.MEASUREMENT,
+        "deadband": 0.2,
         "icon": "mdi:current-dc",
     },
     "II3": {
         "unit": "A",
-        "scale": 0.1,
         "precision": 1,
         "entity_category": EntityCategory.DIAGNOSTIC,
         "state_class": SensorStateClass.MEASUREMENT,
+        "deadband": 0.2,
         "icon": "mdi:current-dc",
     },
     "II4": {
         "unit": "A",
-        "scale": 0.1,
         "precision": 1,
         "entity_category": EntityCategory.DIAGNOSTIC,
         "state_class": SensorStateClass.MEASUREMENT,
+        "deadband": 0.2,
         "icon": "mdi:current-dc",
     },
     "VP1": {
         "unit": "V",
-        "scale": 0.1,
         "precision": 1,
         "entity_category": EntityCategory.DIAGNOSTIC,
         "state_class": SensorStateClass.MEASUREMENT,
+        "deadband": 1.0,
         "icon": "mdi:sine-wave",
     },
     "VP2": {
         "unit": "V",
-        "scale": 0.1,
         "precision": 1,
         "entity_category": EntityCategory.DIAGNOSTIC,
         "state_class": SensorStateClass.MEASUREMENT,
+        "deadband": 1.0,
         "icon": "mdi:sine-wave",
     },
     "VP3": {
         "unit": "V",
-        "scale": 0.1,
         "precision": 1,
         "entity_category": EntityCategory.DIAGNOSTIC,
         "state_class": SensorStateClass.MEASUREMENT,
+        "deadband": 1.0,
         "icon": "mdi:sine-wave",
     },
     "VP4": {
         "unit": "V",
-        "scale": 0.1,
         "precision": 1,
         "entity_category": EntityCategory.DIAGNOSTIC,
         "state_class": SensorStateClass.MEASUREMENT,
+        "deadband": 1.0,
         "icon": "mdi:sine-wave",
     },
     "GP": {
         "unit": "W",
         "entity_category": EntityCategory.DIAGNOSTIC,
         "state_class": SensorStateClass.MEASUREMENT,
+        "deadband": 10,
         "icon": "mdi:transmission-tower",
     },
     "LP": {
         "unit": "W",
         "entity_category": EntityCategory.DIAGNOSTIC,
         "state_class": SensorStateClass.MEASUREMENT,
+        "deadband": 10,
         "icon": "mdi:home-lightning-bolt",
     },
     "GD1": {
         "unit": "kwh",
-        "scale": 0.001,
         "precision": 3,
         "entity_category": EntityCategory.DIAGNOSTIC,
         "state_class": SensorStateClass.TOTAL,
@@ -169,7 +190,6 @@ SENSOR_META: dict[str, dict[str, Any]] = {
     },
     "GD2": {
         "unit": "kwh",
-        "scale": 0.001,
         "precision": 3,
         "entity_category": EntityCategory.DIAGNOSTIC,
         "state_class": SensorStateClass.TOTAL,
@@ -177,7 +197,6 @@ SENSOR_META: dict[str, dict[str, Any]] = {
     },
     "LD": {
         "unit": "kwh",
-        "scale": 0.001,
         "precision": 3,
         "entity_category": EntityCategory.DIAGNOSTIC,
         "state_class": SensorStateClass.TOTAL,
@@ -277,6 +296,85 @@ SENSOR_META: dict[str, dict[str, Any]] = {
 }
 
 
+DERIVED_META: dict[str, dict[str, Any]] = {
+    "pack_soc_average": {
+        "unit": "%",
+        "precision": 1,
+        "state_class": SensorStateClass.MEASUREMENT,
+        "icon": "mdi:battery-50",
+    },
+    "pack_soc_min": {
+        "unit": "%",
+        "state_class": SensorStateClass.MEASUREMENT,
+        "icon": "mdi:battery-low",
+    },
+    "pack_imbalance": {
+        "unit": "%",
+        "state_class": SensorStateClass.MEASUREMENT,
+        "icon": "mdi:scale-unbalanced",
+    },
+    "weakest_pack": {
+        "icon": "mdi:battery-alert-variant-outline",
+    },
+    "pv_string_mismatch": {
+        "unit": "%",
+        "precision": 1,
+        "state_class": SensorStateClass.MEASUREMENT,
+        "deadband": 1.0,
+        "icon": "mdi:solar-panel-large",
+    },
+    "pv1_efficiency": {
+        "unit": "%",
+        "precision": 1,
+        "state_class": SensorStateClass.MEASUREMENT,
+        "deadband": 1.0,
+        "icon": "mdi:solar-power-variant",
+    },
+    "pv2_efficiency": {
+        "unit": "%",
+        "precision": 1,
+        "state_class": SensorStateClass.MEASUREMENT,
+        "deadband": 1.0,
+        "icon": "mdi:solar-power-variant",
+    },
+    "pv3_efficiency": {
+        "unit": "%",
+        "precision": 1,
+        "state_class": SensorStateClass.MEASUREMENT,
+        "deadband": 1.0,
+        "icon": "mdi:solar-power-variant",
+    },
+    "pv4_efficiency": {
+        "unit": "%",
+        "precision": 1,
+        "state_class": SensorStateClass.MEASUREMENT,
+        "deadband": 1.0,
+        "icon": "mdi:solar-power-variant",
+    },
+    "time_to_full": {
+        "source": "estimator",
+        "unit": "min",
+        "device_class": SensorDeviceClass.DURATION,
+        "state_class": SensorStateClass.MEASUREMENT,
+        "deadband_rel": 0.05,
+        "icon": "mdi:battery-clock",
+    },
+    "anomalies": {
+        "source": "anomaly",
+        "state_class": SensorStateClass.MEASUREMENT,
+        "icon": "mdi:alert-circle-outline",
+    },
+    "time_to_empty": {
+        "source": "estimator",
+        "unit": "min",
+        "device_class": SensorDeviceClass.DURATION,
+        "state_class": SensorStateClass.MEASUREMENT,
+        "deadband_rel": 0.05,
+        "icon": "mdi:battery-clock-outline",
+    },
+}
+
+
 async def async_setup_entry(
     hass: HomeAssistant,
     entry: ConfigEntry,
@@ -295,6 +393,8 @@ async def async_setup_entry(
     sn = config["sn"]
     model = config["model"]
     coordinator = config["coordinator"]
+    deadbands = entry.options.get(CONF_DEADBANDS, {})
+    max_age = entry.options.get(CONF_DEADBAND_MAX_AGE, DEFAULT_DEADBAND_MAX_AGE)
 
     device_info = DeviceInfo(
         identifiers={(DOMAIN, entry.entry_id)},
@@ -358,9 +458,24 @@ async def async_setup_entry(
                 entry_id=entry.entry_id,
                 key=key,
                 device_info=device_info,
+                deadband=deadbands.get(key),
+                max_age=max_age,
             )
         )
 
+    entities.extend(
+        SunlitDerivedSensor(
+            coordinator=coordinator,
+            source=config[meta.get("source", "analytics")],
+            entry_id=entry.entry_id,
+            key=key,
+            device_info=device_info,
+            deadband=deadbands.get(key.upper()),
+            max_age=max_age,
+        )
+        for key, meta in DERIVED_META.items()
+    )
+
     async_add_entities(entities, True)  # noqa: FBT003
 
 
@@ -373,10 +488,15 @@ class SunlitSensor(
 
     Represents a sensor entity that monitors various device parameters
     such as power, energy, and status.
+
+    Numeric sensors with a deadband only publish a new state when the value
+    moves further than the deadband from the last published value, or when
+    the last publish is older than the max-age timer.
     """
 
     _attr_has_entity_name = True
     _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _meta_table: dict[str, dict[str, Any]] = SENSOR_META
 
     def __init__(
         self,
@@ -384,6 +504,8 @@ class SunlitSensor(
         entry_id: str,
         key: str,
         device_info: DeviceInfo,
+        deadband: dict[str, float] | None = None,
+        max_age: int = DEFAULT_DEADBAND_MAX_AGE,
     ) -> None:
         """
         Initialize the sensor entity.
@@ -393,14 +515,22 @@ class SunlitSensor(
             entry_id: Config entry ID
             key: Parameter key
             device_info: Device information
+            deadband: Deadband override replacing the SENSOR_META defaults
+            max_age: Seconds after which a state is published regardless of deadband
 
         """
         super().__init__(coordinator)
 
         self._key = key
-        meta = SENSOR_META.get(key, {})
-        self._scale: float | None = meta.get("scale")
-        self._precision: int | None = meta.get("precision")
+        meta = self._meta_table.get(key, {})
+
+        if deadband is None:
+            deadband = meta
+        self._deadband: float | None = deadband.get("deadband")
+        self._deadband_rel: float | None = deadband.get("deadband_rel")
+        self._max_age = max_age
+        self._published: tuple[Any, bool, bool] | None = None
+        self._published_at = 0.0
 
         self._attr_unique_id = f"{DOMAIN}_{entry_id}_{key}"
         self._attr_translation_key = key.lower()
@@ -410,6 +540,10 @@ class SunlitSensor(
         if state_class:
             self._attr_state_class = state_class
 
+        device_class = meta.get("device_class")
+        if device_class:
+            self._attr_device_class = device_class
+
         precision = meta.get("precision")
         if precision:
             self._attr_suggested_display_precision = precision
@@ -435,14 +569,50 @@ class SunlitSensor(
         if raw is None:
             return None
 
-        if self._scale is None:
-            return raw
+        return scale_value(self._key, raw)
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Publish the new state unless the change is within the deadband."""
+        now = monotonic()
+        current = (self.native_value, self.available, self.coordinator.stale)
+        if (
+            self._published is not None
+            and now - self._published_at < self._max_age
+            and current[1:] == self._published[1:]
+            and self._within_deadband(current[0], self._published[0])
+        ):
+            return
+
+        self._published = current
+        self._published_at = now
+        self.async_write_ha_state()
+
+    def _within_deadband(self, value: Any, published: Any) -> bool:
+        """
+        Check whether a value is too close to the published one to publish.
 
+        Args:
+            value: Current value
+            published: Last published value
+
+        Returns:
+            True if the change does not exceed the deadband
+
+        """
+        if self._deadband is None and self._deadband_rel is None:
+            return False
         try:
-            val = float(raw) * self._scale
-            return round(val, self._precision) if self._precision is not None else val
+            delta = abs(float(value) - float(published))
         except (TypeError, ValueError):
-            return raw
+            return False
+
+        if self._deadband is not None and delta > self._deadband:
+            return False
+        return not (
+            self._deadband_rel is not None
+            and delta > abs(float(published)) * self._deadband_rel
+        )
 
     @property
     def extra_state_attributes(self) -> Any:
@@ -456,4 +626,54 @@ class SunlitSensor(
         attrs = {}
         if self.coordinator.last_success_time:
             attrs["last_report_time"] = self.coordinator.last_success_time.isoformat()
+        attrs["stale"] = self.coordinator.stale
         return attrs
+
+
+class SunlitDerivedSensor(SunlitSensor):
+    """
+    Sensor entity for a derived value.
+
+    The value is taken from a runtime object of the device, such as its
+    PackAnalytics, which recomputes its values from the samples; publishing
+    follows the same deadband and max-age rules as the reported sensors.
+    """
+
+    _meta_table = DERIVED_META
+
+    def __init__(
+        self,
+        coordinator: SunlitDataUpdateCoordinator,
+        source: PackAnalytics | BatteryEstimator | AnomalyDetector,
+        entry_id: str,
+        key: str,
+        device_info: DeviceInfo,
+        deadband: dict[str, float] | None = None,
+        max_age: int = DEFAULT_DEADBAND_MAX_AGE,
+    ) -> None:
+        """
+        Initialize the derived sensor entity.
+
+        Args:
+            coordinator: Data update coordinator
+            source: Runtime object providing the derived values
+            entry_id: Config entry ID
+            key: Derived value key
+            device_info: Device information
+            deadband: Deadband override replacing the DERIVED_META defaults
+            max_age: Seconds after which a state is published regardless of deadband
+
+        """
+        super().__init__(coordinator, entry_id, key, device_info, deadband, max_age)
+        self._source = source
+
+    @property
+    def native_value(self) -> Any:
+        """
+        Get the current derived value.
+
+        Returns:
+            Derived value, or None if it cannot be derived
+
+        """
+        return self._source.values.get(self._key)
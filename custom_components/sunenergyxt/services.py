@@ -0,0 +1,377 @@
+"""
+Services for SunEnergyXT 500 Series integration.
+
+This module registers the domain-level services of the SunEnergyXT integration.
+
+Services:
+- save_profile: Saves a named settings profile
+- delete_profile: Deletes a named settings profile
+- apply_profile: Writes the changed settings of a profile to devices in one request
+- broadcast_settings: Writes the same settings to many devices concurrently
+- set_timeline: Replaces the daily setpoint timeline of devices
+- query_history: Returns the stored full-resolution samples of a device
+
+Functions:
+- async_setup_services: Registers the integration services
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from typing import TYPE_CHECKING, Any
+
+import voluptuous as vol
+from homeassistant.core import HomeAssistant, ServiceCall, SupportsResponse
+from homeassistant.exceptions import HomeAssistantError, ServiceValidationError
+from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers import device_registry as dr
+from homeassistant.util import dt as dt_util
+
+from .const import CONF_TIMELINE, DOMAIN
+from .profiles import ProfileStore, validate_settings
+from .scheduler import validate_timeline
+
+if TYPE_CHECKING:
+    from homeassistant.core import ServiceResponse
+
+_LOGGER = logging.getLogger(__name__)
+
+SERVICE_SAVE_PROFILE = "save_profile"
+SERVICE_DELETE_PROFILE = "delete_profile"
+SERVICE_APPLY_PROFILE = "apply_profile"
+SERVICE_BROADCAST_SETTINGS = "broadcast_settings"
+SERVICE_SET_TIMELINE = "set_timeline"
+SERVICE_QUERY_HISTORY = "query_history"
+
+ATTR_DEVICE_ID = "device_id"
+ATTR_NAME = "name"
+ATTR_SETTINGS = "settings"
+ATTR_MAX_CONCURRENCY = "max_concurrency"
+ATTR_TIMEOUT = "timeout"
+ATTR_TIMELINE = "timeline"
+ATTR_TIME = "time"
+ATTR_START = "start"
+ATTR_END = "end"
+ATTR_KEYS = "keys"
+
+DEFAULT_MAX_CONCURRENCY = 10
+DEFAULT_TIMEOUT = 10
+
+SAVE_PROFILE_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_NAME): cv.string,
+        vol.Required(ATTR_SETTINGS): dict,
+    }
+)
+DELETE_PROFILE_SCHEMA = vol.Schema({vol.Required(ATTR_NAME): cv.string})
+APPLY_PROFILE_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_DEVICE_ID): vol.All(cv.ensure_list, [cv.string]),
+        vol.Required(ATTR_NAME): cv.string,
+    }
+)
+BROADCAST_SETTINGS_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_DEVICE_ID): vol.All(cv.ensure_list, [cv.string]),
+        vol.Required(ATTR_SETTINGS): dict,
+        vol.Optional(ATTR_MAX_CONCURRENCY, default=DEFAULT_MAX_CONCURRENCY): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=100)
+        ),
+        vol.Optional(ATTR_TIMEOUT, default=DEFAULT_TIMEOUT): vol.All(
+            vol.Coerce(float), vol.Range(min=1, max=120)
+        ),
+    }
+)
+
+SET_TIMELINE_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_DEVICE_ID): vol.All(cv.ensure_list, [cv.string]),
+        vol.Required(ATTR_TIMELINE): vol.All(
+            cv.ensure_list,
+            [
+                vol.Schema(
+                    {
+                        vol.Required(ATTR_TIME): cv.time,
+                        vol.Required(ATTR_SETTINGS): dict,
+                    }
+                )
+            ],
+        ),
+    }
+)
+
+QUERY_HISTORY_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_DEVICE_ID): cv.string,
+        vol.Required(ATTR_START): cv.datetime,
+        vol.Optional(ATTR_END): cv.datetime,
+        vol.Optional(ATTR_KEYS): vol.All(cv.ensure_list, [cv.string]),
+    }
+)
+
+
+def _get_device_configs(
+    hass: HomeAssistant, device_ids: list[str]
+) -> dict[str, dict[str, Any]]:
+    """
+    Resolve device IDs to the runtime data of their config entries.
+
+    Args:
+        hass: Home Assistant instance
+        device_ids: Device registry IDs
+
+    Returns:
+        Dictionary mapping device IDs to the runtime data of their entries
+
+    Raises:
+        ServiceValidationError: If a device is not a loaded SunEnergyXT device
+
+    """
+    device_registry = dr.async_get(hass)
+    loaded = hass.data.get(DOMAIN, {})
+    configs: dict[str, dict[str, Any]] = {}
+    for device_id in device_ids:
+        device = device_registry.async_get(device_id)
+        entry_ids = [
+            entry_id
+            for entry_id in (device.config_entries if device else ())
+            if entry_id in loaded
+        ]
+        if not entry_ids:
+            msg = f"Device {device_id} is not a loaded SunEnergyXT device"
+            raise ServiceValidationError(msg)
+        configs[device_id] = loaded[entry_ids[0]]
+    return configs
+
+
+def _diff_settings(
+    reported: dict[str, Any] | None, settings: dict[str, int | str]
+) -> dict[str, int | str]:
+    """
+    Get the settings that differ from the reported snapshot.
+
+    Args:
+        reported: Latest reported device data
+        settings: Validated settings to apply
+
+    Returns:
+        Dictionary containing only the changed settings
+
+    """
+    reported = reported or {}
+    changed: dict[str, int | str] = {}
+    for key, value in settings.items():
+        try:
+            current = reported[key]
+            if isinstance(value, str):
+                if str(current) == value:
+                    continue
+            elif int(float(current)) == value:
+                continue
+        except (KeyError, TypeError, ValueError):
+            pass
+        changed[key] = value
+    return changed
+
+
+async def _async_broadcast_to_device(
+    config: dict[str, Any],
+    settings: dict[str, Any],
+    semaphore: asyncio.Semaphore,
+    write_timeout: float,
+) -> dict[str, Any]:
+    """
+    Write settings to one device as part of a broadcast.
+
+    Failures are reported in the result instead of raised, so one unreachable
+    or incompatible device does not affect the others.
+
+    Args:
+        config: Runtime data of the device's config entry
+        settings: Settings to write
+        semaphore: Semaphore bounding the number of concurrent writes
+        write_timeout: Seconds allowed for the write, excluding time spent queued
+
+    Returns:
+        Dictionary describing the outcome for the device
+
+    """
+    result: dict[str, Any] = {"sn": config["sn"]}
+    coordinator = config["coordinator"]
+    try:
+        changed = _diff_settings(
+            coordinator.data, validate_settings(settings, config["model"])
+        )
+    except ServiceValidationError as err:
+        return {**result, "status": "invalid", "error": str(err)}
+    if not changed:
+        return {**result, "status": "unchanged", "written": {}}
+
+    async with semaphore:
+        try:
+            async with asyncio.timeout(write_timeout):
+                await coordinator.async_write(changed)
+        except TimeoutError:
+            return {**result, "status": "timeout"}
+        except Exception as err:  # noqa: BLE001
+            _LOGGER.warning("Error broadcasting settings to %s: %s", config["sn"], err)
+            return {**result, "status": "error", "error": str(err)}
+
+    coordinator.async_publish()
+    return {**result, "status": "ok", "written": changed}
+
+
+async def _async_query_device_history(
+    hass: HomeAssistant, data: dict[str, Any]
+) -> dict[str, Any]:
+    """
+    Query the sample history of one device.
+
+    Args:
+        hass: Home Assistant instance
+        data: Validated service call data
+
+    Returns:
+        Sample times and the values of each key aligned with them
+
+    Raises:
+        ServiceValidationError: If the device has no sample history or the
+            range is empty
+
+    """
+    device_id = data[ATTR_DEVICE_ID]
+    config = _get_device_configs(hass, [device_id])[device_id]
+    if (history := config["history"]) is None:
+        msg = f"Sample history is not enabled for {config['sn']}"
+        raise ServiceValidationError(msg)
+    start = dt_util.as_utc(data[ATTR_START])
+    end = dt_util.as_utc(data.get(ATTR_END) or dt_util.utcnow())
+    if end < start:
+        msg = "The end of the range is before its start"
+        raise ServiceValidationError(msg)
+    return await history.async_query(start, end, data.get(ATTR_KEYS))
+
+
+async def async_setup_services(hass: HomeAssistant) -> None:
+    """
+    Register the SunEnergyXT services.
+
+    Args:
+        hass: Home Assistant instance
+
+    """
+    profiles = ProfileStore(hass)
+
+    async def _async_save_profile(call: ServiceCall) -> None:
+        await profiles.async_save(call.data[ATTR_NAME], call.data[ATTR_SETTINGS])
+
+    async def _async_delete_profile(call: ServiceCall) -> None:
+        await profiles.async_delete(call.data[ATTR_NAME])
+
+    async def _async_apply_profile(call: ServiceCall) -> ServiceResponse:
+        settings = await profiles.async_get(call.data[ATTR_NAME])
+        configs = _get_device_configs(hass, call.data[ATTR_DEVICE_ID])
+
+        validated = {
+            device_id: validate_settings(settings, config["model"])
+            for device_id, config in configs.items()
+        }
+
+        results: dict[str, Any] = {}
+        for device_id, config in configs.items():
+            coordinator = config["coordinator"]
+            changed = _diff_settings(coordinator.data, validated[device_id])
+            if changed:
+                try:
+                    await coordinator.async_write(changed)
+                except Exception as err:
+                    _LOGGER.exception("Error applying profile to %s", config["sn"])
+                    msg = f"Error applying profile to {config['sn']}: {err}"
+                    raise HomeAssistantError(msg) from err
+                coordinator.async_publish()
+            results[device_id] = {"sn": config["sn"], "written": changed}
+
+        return results if call.return_response else None
+
+    async def _async_broadcast_settings(call: ServiceCall) -> ServiceResponse:
+        if ATTR_DEVICE_ID in call.data:
+            configs = _get_device_configs(hass, call.data[ATTR_DEVICE_ID])
+        else:
+            configs = dict(hass.data.get(DOMAIN, {}))
+        validate_settings(call.data[ATTR_SETTINGS], None)
+
+        semaphore = asyncio.Semaphore(call.data[ATTR_MAX_CONCURRENCY])
+        outcomes = await asyncio.gather(
+            *(
+                _async_broadcast_to_device(
+                    config, call.data[ATTR_SETTINGS], semaphore, call.data[ATTR_TIMEOUT]
+                )
+                for config in configs.values()
+            )
+        )
+        counts = {
+            status: sum(1 for outcome in outcomes if outcome["status"] == status)
+            for status in ("ok", "unchanged", "invalid", "timeout", "error")
+        }
+        failed = [o["sn"] for o in outcomes if o["status"] not in ("ok", "unchanged")]
+        if failed:
+            _LOGGER.warning("Broadcast failed for %s", ", ".join(failed))
+
+        results = {**counts, "devices": {o.pop("sn"): o for o in outcomes}}
+        return results if call.return_response else None
+
+    async def _async_set_timeline(call: ServiceCall) -> None:
+        configs = _get_device_configs(hass, call.data[ATTR_DEVICE_ID])
+        timelines = {
+            device_id: validate_timeline(call.data[ATTR_TIMELINE], config["model"])
+            for device_id, config in configs.items()
+        }
+        for device_id, config in configs.items():
+            entry = hass.config_entries.async_get_entry(config["entry_id"])
+            hass.config_entries.async_update_entry(
+                entry, options={**entry.options, CONF_TIMELINE: timelines[device_id]}
+            )
+
+    async def _async_query_history(call: ServiceCall) -> ServiceResponse:
+        return await _async_query_device_history(hass, call.data)
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_SAVE_PROFILE,
+        _async_save_profile,
+        schema=SAVE_PROFILE_SCHEMA,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_DELETE_PROFILE,
+        _async_delete_profile,
+        schema=DELETE_PROFILE_SCHEMA,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_APPLY_PROFILE,
+        _async_apply_profile,
+        schema=APPLY_PROFILE_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_BROADCAST_SETTINGS,
+        _async_broadcast_settings,
+        schema=BROADCAST_SETTINGS_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_SET_TIMELINE,
+        _async_set_timeline,
+        schema=SET_TIMELINE_SCHEMA,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_QUERY_HISTORY,
+        _async_query_history,
+        schema=QUERY_HISTORY_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
@@ -0,0 +1,365 @@
+"""
+Direct long-term statistics import for SunEnergyXT 500 Series integration.
+
+This module implements an optional mode where the integration aggregates the
+power and energy values of every sample itself and imports the results into
+the recorder's statistics tables, so the high-rate sensors can be excluded
+from recording while their history stays accurate.
+
+Classes:
+- StatisticsImporter: Aggregates samples per period and imports the results
+
+Constants:
+- MEAN_KEYS: Power keys imported with mean, minimum and maximum
+- SUM_KEYS: Energy counters imported with state and sum
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from functools import partial
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.const import ATTR_UNIT_OF_MEASUREMENT
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers import entity_registry as er
+from homeassistant.helpers.event import async_call_later
+
+from .analytics import scaled_number
+from .const import DOMAIN
+
+if TYPE_CHECKING:
+    from .coordinator import SunlitDataUpdateCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+MEAN_KEYS = ("IW", "OP", "PV", "PV1", "PV2", "PV3", "PV4", "GP", "LP")
+SUM_KEYS = ("GD1", "GD2", "LD")
+
+SHORT_TERM = timedelta(minutes=5)
+HOUR = timedelta(hours=1)
+# Time after an hour ends before the recorder has compiled it from the
+# short-term statistics and it can be overwritten
+COMPILE_DELAY = timedelta(minutes=1)
+
+
+@dataclass
+class _Accumulator:
+    """Aggregate of one key over one period."""
+
+    count: int = 0
+    total: float = 0.0
+    minimum: float = float("inf")
+    maximum: float = float("-inf")
+    last: float = 0.0
+
+    def add(self, value: float) -> None:
+        """
+        Add a sample value.
+
+        Args:
+            value: Sample value
+
+        """
+        self.count += 1
+        self.total += value
+        self.minimum = min(self.minimum, value)
+        self.maximum = max(self.maximum, value)
+        self.last = value
+
+
+@dataclass
+class _Period:
+    """Accumulators of all keys over one period."""
+
+    start: datetime
+    keys: dict[str, _Accumulator] = field(default_factory=dict)
+
+
+def _period_start(moment: datetime, length: timedelta) -> datetime:
+    """
+    Get the start of the period containing a moment.
+
+    Args:
+        moment: Time zone aware time
+        length: Period length, a whole number of minutes dividing an hour
+
+    Returns:
+        Start of the period
+
+    """
+    minutes = int(length.total_seconds() // 60)
+    return moment.replace(
+        minute=moment.minute - moment.minute % minutes, second=0, microsecond=0
+    )
+
+
+class StatisticsImporter:
+    """
+    Statistics importer for one device.
+
+    Every sample is added to a 5-minute and an hourly accumulator per key. When
+    a sample starts a new 5-minute period, the finished one is imported into
+    the short-term statistics in one bulk import per key, and the recorder
+    compiles the hour from these as usual. Shortly after each hour is
+    compiled, the hourly row is overwritten with the aggregate of every sample
+    of the hour. Energy sums continue from the latest statistics of each
+    counter. Entities the recorder still records are left to the recorder, so
+    the two never write the same statistics. A period in progress when the
+    importer stops is not imported.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        coordinator: SunlitDataUpdateCoordinator,
+        entry_id: str,
+    ) -> None:
+        """
+        Initialize the importer.
+
+        Args:
+            hass: Home Assistant instance
+            coordinator: Data update coordinator of the device
+            entry_id: Config entry ID, used to find the sensor entities
+
+        """
+        self._hass = hass
+        self._coordinator = coordinator
+        self._entry_id = entry_id
+        self._unsub: CALLBACK_TYPE | None = None
+        self._short_term: _Period | None = None
+        self._hour: _Period | None = None
+        # State and sum of each energy counter at the end of the last import
+        self._sums: dict[str, tuple[float, float]] = {}
+        self._lock = asyncio.Lock()
+        self._pending: dict[datetime, CALLBACK_TYPE] = {}
+
+        self.short_term_count = 0
+        self.hour_count = 0
+        self.skipped: set[str] = set()
+
+    @callback
+    def async_start(self) -> None:
+        """Start aggregating the samples of the device."""
+        self._unsub = self._coordinator.async_add_sample_listener(self._async_sample)
+
+    @callback
+    def async_stop(self) -> None:
+        """Stop aggregating and cancel pending hourly imports."""
+        if self._unsub is not None:
+            self._unsub()
+            self._unsub = None
+        for unsub in self._pending.values():
+            unsub()
+        self._pending.clear()
+
+    @callback
+    def _async_sample(self, reported: dict[str, Any], sampled_at: datetime) -> None:
+        """
+        Add a sample to the accumulators and import finished periods.
+
+        Args:
+            reported: Raw reported data
+            sampled_at: Time the sample was taken
+
+        """
+        short_term_start = _period_start(sampled_at, SHORT_TERM)
+        if self._short_term is None or self._short_term.start != short_term_start:
+            if self._short_term is not None and self._short_term.keys:
+                self._hass.async_create_task(
+                    self._async_import_short_term(self._short_term),
+                    f"sunenergyxt statistics {self._entry_id}",
+                )
+            self._short_term = _Period(short_term_start)
+
+        hour_start = _period_start(sampled_at, HOUR)
+        if self._hour is None or self._hour.start != hour_start:
+            if self._hour is not None and self._hour.keys:
+                period = self._hour
+                delay = period.start + HOUR + COMPILE_DELAY - sampled_at
+                self._pending[period.start] = async_call_later(
+                    self._hass,
+                    max(0.0, delay.total_seconds()),
+                    partial(self._async_import_hour, period),
+                )
+            self._hour = _Period(hour_start)
+
+        for key in (*MEAN_KEYS, *SUM_KEYS):
+            value = scaled_number(reported, key)
+            if value is None:
+                continue
+            for period in (self._short_term, self._hour):
+                period.keys.setdefault(key, _Accumulator()).add(value)
+
+    def _metadata(self, key: str) -> tuple[str, dict[str, Any]] | None:
+        """
+        Get the statistics metadata of a key.
+
+        Args:
+            key: Parameter key
+
+        Returns:
+            Entity ID and statistics metadata, or None if the sensor entity
+            does not exist or is recorded by the recorder
+
+        """
+        # The recorder is only loaded when this mode is used
+        from homeassistant.components.recorder import (  # noqa: PLC0415
+            is_entity_recorded,
+        )
+
+        entity_id = er.async_get(self._hass).async_get_entity_id(
+            "sensor", DOMAIN, f"{DOMAIN}_{self._entry_id}_{key}"
+        )
+        if entity_id is None or (state := self._hass.states.get(entity_id)) is None:
+            return None
+        if is_entity_recorded(self._hass, entity_id):
+            self.skipped.add(entity_id)
+            return None
+        self.skipped.discard(entity_id)
+        return entity_id, {
+            "has_mean": key in MEAN_KEYS,
+            "has_sum": key in SUM_KEYS,
+            "name": None,
+            "source": "recorder",
+            "statistic_id": entity_id,
+            "unit_of_measurement": state.attributes.get(ATTR_UNIT_OF_MEASUREMENT),
+        }
+
+    async def _async_load_sum(self, key: str, entity_id: str, value: float) -> None:
+        """
+        Load the latest state and sum of an energy counter.
+
+        Args:
+            key: Parameter key
+            entity_id: Entity ID of the counter
+            value: First value of the counter, used as zero point when the
+                counter has no statistics yet
+
+        """
+        from homeassistant.components.recorder import get_instance  # noqa: PLC0415
+        from homeassistant.components.recorder.statistics import (  # noqa: PLC0415
+            get_last_short_term_statistics,
+        )
+
+        last = await get_instance(self._hass).async_add_executor_job(
+            partial(
+                get_last_short_term_statistics,
+                self._hass,
+                1,
+                entity_id,
+                convert_units=False,
+                types={"state", "sum"},
+            )
+        )
+        row = (last.get(entity_id) or [{}])[0]
+        state = row.get("state")
+        total = row.get("sum")
+        if state is None or total is None:
+            self._sums[key] = (value, 0.0)
+        else:
+            self._sums[key] = (state, total)
+
+    def _row(self, key: str, start: datetime, acc: _Accumulator) -> dict[str, Any]:
+        """
+        Build the statistics row of a key.
+
+        Args:
+            key: Parameter key
+            start: Start of the period
+            acc: Aggregate of the key over the period
+
+        Returns:
+            Statistics row
+
+        """
+        if key in MEAN_KEYS:
+            return {
+                "start": start,
+                "mean": acc.total / acc.count,
+                "min": acc.minimum,
+                "max": acc.maximum,
+            }
+        state, total = self._sums[key]
+        return {"start": start, "state": state, "sum": total}
+
+    async def _async_import_short_term(self, period: _Period) -> None:
+        """
+        Import a finished 5-minute period into the short-term statistics.
+
+        Args:
+            period: Finished period
+
+        """
+        if "recorder" not in self._hass.config.components:
+            return
+        from homeassistant.components.recorder import get_instance  # noqa: PLC0415
+        from homeassistant.components.recorder.db_schema import (  # noqa: PLC0415
+            StatisticsShortTerm,
+        )
+
+        async with self._lock:
+            for key, acc in period.keys.items():
+                if (found := self._metadata(key)) is None:
+                    continue
+                entity_id, metadata = found
+                if key in SUM_KEYS:
+                    if key not in self._sums:
+                        await self._async_load_sum(key, entity_id, acc.last)
+                    state, total = self._sums[key]
+                    self._sums[key] = (acc.last, total + acc.last - state)
+                get_instance(self._hass).async_import_statistics(
+                    metadata, [self._row(key, period.start, acc)], StatisticsShortTerm
+                )
+            self.short_term_count += 1
+
+    async def _async_import_hour(self, period: _Period, _now: datetime) -> None:
+        """
+        Overwrite a compiled hour with the aggregate of all its samples.
+
+        Args:
+            period: Finished hour
+            _now: Time the import was triggered
+
+        """
+        self._pending.pop(period.start, None)
+        if "recorder" not in self._hass.config.components:
+            return
+        from homeassistant.components.recorder.statistics import (  # noqa: PLC0415
+            async_import_statistics,
+        )
+
+        async with self._lock:
+            for key, acc in period.keys.items():
+                if (found := self._metadata(key)) is None or (
+                    key in SUM_KEYS and key not in self._sums
+                ):
+                    continue
+                _, metadata = found
+                row = self._row(key, period.start, acc)
+                if key in SUM_KEYS:
+                    # The sum at the end of the hour, not the latest one
+                    state, total = self._sums[key]
+                    row["sum"] = total - state + acc.last
+                    row["state"] = acc.last
+                async_import_statistics(self._hass, metadata, [row])
+            self.hour_count += 1
+
+    def get_diagnostics(self) -> dict[str, Any]:
+        """
+        Get importer state for diagnostics.
+
+        Returns:
+            Dictionary describing the importer
+
+        """
+        return {
+            "short_term_count": self.short_term_count,
+            "hour_count": self.hour_count,
+            "pending_hours": len(self._pending),
+            "recorded_entities": sorted(self.skipped),
+        }
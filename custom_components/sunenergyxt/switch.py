@@ -12,14 +12,11 @@ Constants:
 """
 
 import logging
-from http import HTTPStatus
 from typing import Any
 
-import async_timeout
 from homeassistant.components.switch import SwitchDeviceClass, SwitchEntity
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
-from homeassistant.helpers.aiohttp_client import async_get_clientsession
 from homeassistant.helpers.entity import DeviceInfo
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
@@ -90,7 +87,6 @@ async def async_setup_entry(
                 sn=sn,
                 ip=ip,
                 device_info=device_info,
-                hass=hass,
             )
         )
 
@@ -114,7 +110,6 @@ class SunlitSwitch(CoordinatorEntity[SunlitDataUpdateCoordinator], SwitchEntity)
         sn: str,
         ip: str,
         device_info: DeviceInfo,
-        hass: HomeAssistant,
     ) -> None:
         """
         Initialize the switch entity.
@@ -126,14 +121,12 @@ class SunlitSwitch(CoordinatorEntity[SunlitDataUpdateCoordinator], SwitchEntity)
             sn: Device serial number
             ip: Device IP address
             device_info: Device information
-            hass: Home Assistant instance
 
         """
         super().__init__(coordinator)
         self._key = key
         self._sn = sn
         self._ip = ip
-        self._session = async_get_clientsession(hass)
 
         meta = SWITCH_META.get(key, {})
 
@@ -194,23 +187,11 @@ class SunlitSwitch(CoordinatorEntity[SunlitDataUpdateCoordinator], SwitchEntity)
 
         """
         value = 1 if is_on else 0
-        payload = {"state": {self._key: value}}
+        values = {self._key: value}
         try:
-            async with (
-                async_timeout.timeout(5),
-                self._session.post(
-                    f"http://{self._ip}/write",
-                    json=payload,
-                ) as resp,
-            ):
-                if resp.status != HTTPStatus.OK:
-                    text = await resp.text()
-                    msg = f"HTTP {resp.status}: {text}"
-                    raise RuntimeError(msg)
+            await self.coordinator.async_write(values)
         except Exception as err:
             _LOGGER.exception("Error writing switch %s: %s", self._key, err)
             raise
 
-        if isinstance(self.coordinator.data, dict):
-            self.coordinator.data[self._key] = value
         self.async_write_ha_state()
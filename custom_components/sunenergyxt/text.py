@@ -12,16 +12,13 @@ Constants:
 """
 
 import logging
-from http import HTTPStatus
 from typing import Any
 
-import async_timeout
 from homeassistant.components.text import (
     TextEntity,
 )
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
-from homeassistant.helpers.aiohttp_client import async_get_clientsession
 from homeassistant.helpers.entity import DeviceInfo
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
@@ -85,7 +82,6 @@ async def async_setup_entry(
                 sn=sn,
                 ip=ip,
                 device_info=device_info,
-                hass=hass,
             )
         )
 
@@ -110,7 +106,6 @@ class SunlitText(CoordinatorEntity[SunlitDataUpdateCoordinator], TextEntity):
         sn: str,
         ip: str,
         device_info: DeviceInfo,
-        hass: HomeAssistant,
     ) -> None:
         """
         Initialize the text entity.
@@ -122,14 +117,12 @@ class SunlitText(CoordinatorEntity[SunlitDataUpdateCoordinator], TextEntity):
             sn: Device serial number
             ip: Device IP address
             device_info: Device information
-            hass: Home Assistant instance
 
         """
         super().__init__(coordinator)
         self._key = key
         self._sn = sn
         self._ip = ip
-        self._session = async_get_clientsession(hass)
 
         meta = TEXT_META.get(key, {})
 
@@ -176,27 +169,13 @@ class SunlitText(CoordinatorEntity[SunlitDataUpdateCoordinator], TextEntity):
         """
         if self._key == "MD":
             mm_value = 0 if value.strip() == "" else 1
-            payload = {"state": {"MM": mm_value, "MD": value}}
+            values = {"MM": mm_value, "MD": value}
         else:
-            payload = {"state": {self._key: value}}
+            values = {self._key: value}
         try:
-            async with (
-                async_timeout.timeout(5),
-                self._session.post(
-                    f"http://{self._ip}/write",
-                    json=payload,
-                ) as resp,
-            ):
-                if resp.status != HTTPStatus.OK:
-                    text = await resp.text()
-                    msg = f"HTTP {resp.status}: {text}"
-                    raise RuntimeError(msg)
+            await self.coordinator.async_write(values)
         except Exception as err:
             _LOGGER.exception("Error writing switch %s: %s", self._key, err)
             raise
 
-        if isinstance(self.coordinator.data, dict):
-            self.coordinator.data[self._key] = value
-            if self._key == "MD":
-                self.coordinator.data["MM"] = 0 if value.strip() == "" else 1
         self.async_write_ha_state()
@@ -0,0 +1,269 @@
+"""
+Zero-export control loop for SunEnergyXT 500 Series integration.
+
+This module implements a native, event-driven controller that keeps the power
+measured by an external grid meter near a target by adjusting the device's grid
+port power setpoint (GS). The meter power is expected to be positive while
+importing from the grid and negative while exporting.
+
+Classes:
+- ZeroExportController: PI controller driving GS from a meter entity
+"""
+
+from __future__ import annotations
+
+import logging
+from time import monotonic
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.const import STATE_UNAVAILABLE, STATE_UNKNOWN
+from homeassistant.core import Event, EventStateChangedData, HomeAssistant, callback
+from homeassistant.helpers.event import async_track_state_change_event
+
+from .limits import NUMBER_META, get_number_range
+
+if TYPE_CHECKING:
+    import asyncio
+
+    from .coordinator import SunlitDataUpdateCoordinator
+    from .scheduler import SetpointScheduler
+
+_LOGGER = logging.getLogger(__name__)
+
+MAX_STEP_INTERVAL = 5.0
+
+
+class ZeroExportController:
+    """
+    Event-driven PI controller for the GS setpoint.
+
+    Every meter update runs one controller step: errors inside the deadband are
+    ignored, larger ones are integrated by a velocity-form PI controller,
+    slew-rate limited, clamped to the model limits and rounded to the GS step.
+    GS is only written when the result differs from the last written value by
+    at least one step, and never while a previous write is still in flight.
+
+    When the device reports a GS the loop did not write, such as one set by the
+    number entity or the reconciler, the controller output restarts from it.
+    The loop is paused while the timeline, written by hand or by the
+    optimiser, sets GS.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        coordinator: SunlitDataUpdateCoordinator,
+        scheduler: SetpointScheduler,
+        model: str | None,
+        meter_entity_id: str,
+        target: float,
+        kp: float,
+        ki: float,
+        deadband: float,
+        slew_rate: float,
+    ) -> None:
+        """
+        Initialize the controller.
+
+        Args:
+            hass: Home Assistant instance
+            coordinator: Data update coordinator of the device
+            scheduler: Setpoint scheduler of the device, which owns GS while its
+                timeline sets it
+            model: Device model, used for the GS limits
+            meter_entity_id: Entity reporting grid power in W, positive on import
+            target: Grid power to regulate to in W
+            kp: Proportional gain
+            ki: Integral gain per second
+            deadband: Error in W below which the setpoint is left alone
+            slew_rate: Maximum setpoint change in W per second
+
+        """
+        self._hass = hass
+        self._coordinator = coordinator
+        self._scheduler = scheduler
+        self._meter_entity_id = meter_entity_id
+        self._target = target
+        self._kp = kp
+        self._ki = ki
+        self._deadband = deadband
+        self._slew_rate = slew_rate
+        self._min_value, self._max_value = get_number_range("GS", model)
+        self._step = NUMBER_META["GS"]["step"]
+
+        self._output: float | None = None
+        self._written: float | None = None
+        self._last_error = 0.0
+        self._last_step: float | None = None
+        self._writing = False
+        self._task: asyncio.Task[None] | None = None
+        self._paused = False
+        self._unsub: Any = None
+
+        self.write_count = 0
+        self.skipped_count = 0
+        self.error_count = 0
+        self.last_latency: float | None = None
+        self.max_latency = 0.0
+        self._latency_total = 0.0
+
+    @callback
+    def async_start(self) -> None:
+        """Subscribe to the meter entity."""
+        self._unsub = async_track_state_change_event(
+            self._hass, [self._meter_entity_id], self._async_meter_changed
+        )
+
+    @callback
+    def async_stop(self) -> None:
+        """Unsubscribe from the meter entity and cancel a write in flight."""
+        if self._unsub is not None:
+            self._unsub()
+            self._unsub = None
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    @callback
+    def _async_meter_changed(self, event: Event[EventStateChangedData]) -> None:
+        """
+        Run one controller step for a meter update.
+
+        Args:
+            event: State changed event of the meter entity
+
+        """
+        received = monotonic()
+        state = event.data["new_state"]
+        if state is None or state.state in (STATE_UNAVAILABLE, STATE_UNKNOWN):
+            return
+        try:
+            meter = float(state.state)
+        except ValueError:
+            return
+
+        if self._writing:
+            self.skipped_count += 1
+            return
+
+        paused = self._scheduler.controls("GS")
+        if paused != self._paused:
+            self._paused = paused
+            _LOGGER.info(
+                "Zero export %s, the timeline %s GS",
+                "paused" if paused else "resumed",
+                "sets" if paused else "no longer sets",
+            )
+        if paused:
+            # Restart from the reported GS when resuming
+            self._output = None
+            return
+
+        setpoint = self._step_controller(meter, received)
+        if setpoint is None:
+            return
+
+        self._writing = True
+        self._task = self._hass.async_create_task(
+            self._async_write_setpoint(setpoint, received),
+            f"sunenergyxt zero export {self._meter_entity_id}",
+        )
+
+    def _step_controller(self, meter: float, now: float) -> float | None:
+        """
+        Compute the next GS setpoint.
+
+        Args:
+            meter: Measured grid power in W
+            now: Monotonic time of the measurement
+
+        Returns:
+            Setpoint to write, or None if the change is not significant
+
+        """
+        try:
+            current = float((self._coordinator.data or {}).get("GS"))
+        except (TypeError, ValueError):
+            current = None
+        if self._output is None or (
+            current is not None
+            and self._written is not None
+            and abs(current - self._written) >= self._step
+        ):
+            # First step, or GS was written by something else
+            if current is None:
+                return None
+            self._output = current
+            self._written = current
+            self._last_error = meter - self._target
+
+        dt = 1.0 if self._last_step is None else now - self._last_step
+        dt = min(dt, MAX_STEP_INTERVAL)
+        self._last_step = now
+
+        error = meter - self._target
+        if abs(error) < self._deadband:
+            self._last_error = error
+            return None
+
+        delta = self._kp * (error - self._last_error) + self._ki * error * dt
+        self._last_error = error
+
+        max_delta = self._slew_rate * dt
+        delta = max(-max_delta, min(max_delta, delta))
+        self._output = max(self._min_value, min(self._max_value, self._output + delta))
+
+        setpoint = round(self._output / self._step) * self._step
+        if self._written is not None and abs(setpoint - self._written) < self._step:
+            return None
+        return setpoint
+
+    async def _async_write_setpoint(self, setpoint: float, received: float) -> None:
+        """
+        Write a GS setpoint and record the loop latency.
+
+        Args:
+            setpoint: Setpoint to write in W
+            received: Monotonic time the triggering meter update was received
+
+        """
+        try:
+            await self._coordinator.async_write({"GS": int(setpoint)}, control=True)
+        except Exception as err:  # noqa: BLE001
+            self.error_count += 1
+            _LOGGER.warning("Error writing zero export setpoint: %s", err)
+            return
+        finally:
+            self._writing = False
+            self._task = None
+
+        self._written = setpoint
+        latency = monotonic() - received
+        self.write_count += 1
+        self.last_latency = latency
+        self.max_latency = max(self.max_latency, latency)
+        self._latency_total += latency
+
+    def get_diagnostics(self) -> dict[str, Any]:
+        """
+        Get controller state and loop latency metrics for diagnostics.
+
+        Returns:
+            Dictionary describing the controller
+
+        """
+        return {
+            "meter_entity_id": self._meter_entity_id,
+            "target": self._target,
+            "paused": self._paused,
+            "output": self._output,
+            "written": self._written,
+            "write_count": self.write_count,
+            "skipped_count": self.skipped_count,
+            "error_count": self.error_count,
+            "last_latency": self.last_latency,
+            "avg_latency": (
+                self._latency_total / self.write_count if self.write_count else None
+            ),
+            "max_latency": self.max_latency,
+        }
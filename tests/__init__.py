@@ -0,0 +1 @@
+"""Tests for the SunEnergyXT 500 Series integration."""
@@ -0,0 +1,13 @@
+"""Fixtures for SunEnergyXT 500 Series integration tests."""
+
+from collections.abc import Generator
+
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def auto_enable_custom_integrations(
+    enable_custom_integrations: None,  # noqa: ARG001
+) -> Generator[None]:
+    """Enable loading the integration from custom_components."""
+    yield  # noqa: PT022
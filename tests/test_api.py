@@ -0,0 +1,42 @@
+"""Tests for the SunEnergyXT local HTTP API client."""
+
+from custom_components.sunenergyxt.api import (
+    LATENCY_FACTOR,
+    LATENCY_MIN_SAMPLES,
+    READ_TIMEOUT,
+    _LatencyWindow,
+)
+
+
+def test_latency_window_outage() -> None:
+    """Test timeouts during an outage and a recovery keep the budget."""
+    window = _LatencyWindow(READ_TIMEOUT)
+    for _ in range(LATENCY_MIN_SAMPLES):
+        window.add_timeout(READ_TIMEOUT)
+    assert window.percentile(0.99) is None
+    assert window.timeout() == READ_TIMEOUT
+
+    for _ in range(LATENCY_MIN_SAMPLES):
+        window.add(0.2)
+    budget = window.timeout()
+    assert budget == 0.2 * LATENCY_FACTOR
+
+    for _ in range(100):
+        window.add_timeout(window.timeout())
+        assert window.timeout() == budget
+
+    for _ in range(10):
+        window.add(0.2)
+    assert window.timeout() == budget
+    assert window.stats()["timeouts"] == LATENCY_MIN_SAMPLES + 100
+
+
+def test_latency_window_slower_link() -> None:
+    """Test responses slower than the 99th percentile raise the budget."""
+    window = _LatencyWindow(READ_TIMEOUT)
+    for _ in range(LATENCY_MIN_SAMPLES):
+        window.add(0.2)
+    for _ in range(LATENCY_MIN_SAMPLES):
+        window.add(0.5)
+
+    assert window.timeout() == 0.5 * LATENCY_FACTOR
@@ -0,0 +1,73 @@
+"""Tests for the SunEnergyXT data update coordinator."""
+
+from datetime import timedelta
+from unittest.mock import AsyncMock, Mock, patch
+
+import pytest
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+from pytest_homeassistant_custom_component.common import async_fire_time_changed
+
+from custom_components.sunenergyxt.coordinator import SunlitDataUpdateCoordinator
+
+SAMPLE_INTERVAL = 3
+
+
+@pytest.mark.parametrize(
+    ("publish_interval", "publishes"),
+    [(SAMPLE_INTERVAL, 2), (10 * SAMPLE_INTERVAL, 1)],
+)
+async def test_publish_interval(
+    hass: HomeAssistant, publish_interval: int, publishes: int
+) -> None:
+    """Test a sample finishing slightly early is published when it is due."""
+    coordinator = SunlitDataUpdateCoordinator(
+        hass,
+        "SN123",
+        "192.0.2.1",
+        sample_interval=SAMPLE_INTERVAL,
+        publish_interval=publish_interval,
+    )
+    listener = Mock()
+    unsub = coordinator.async_add_listener(listener)
+
+    with patch(
+        "custom_components.sunenergyxt.coordinator.monotonic",
+        side_effect=[100.0, 100.0 + SAMPLE_INTERVAL - 0.01],
+    ):
+        coordinator.async_update_listeners()
+        coordinator.async_update_listeners()
+
+    assert listener.call_count == publishes
+    unsub()
+    await coordinator.async_shutdown()
+
+
+async def test_aligned_refresh(hass: HomeAssistant) -> None:
+    """Test an aligned poll runs on its grid tick and schedules the next one."""
+    coordinator = SunlitDataUpdateCoordinator(
+        hass, "SN123", "192.0.2.1", sample_interval=SAMPLE_INTERVAL, aligned=True
+    )
+    read = AsyncMock(return_value={"SN": "SN123", "GS": 100})
+
+    with patch.object(coordinator.client, "async_read", read):
+        unsub = coordinator.async_add_listener(lambda: None)
+        first_tick = coordinator._next_tick
+        assert first_tick is not None
+        assert first_tick % SAMPLE_INTERVAL == 0
+        read.assert_not_called()
+
+        async_fire_time_changed(
+            hass, dt_util.utcnow() + timedelta(seconds=SAMPLE_INTERVAL + 1)
+        )
+        await hass.async_block_till_done()
+
+        read.assert_awaited_once()
+        assert coordinator.data == {"SN": "SN123", "GS": 100}
+        assert coordinator.sample_count == 1
+        assert coordinator._next_tick is not None
+        assert coordinator._next_tick > first_tick
+        assert coordinator._next_tick % SAMPLE_INTERVAL == 0
+
+        unsub()
+        await coordinator.async_shutdown()
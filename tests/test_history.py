@@ -0,0 +1,72 @@
+"""Tests for the SunEnergyXT compact sample history store."""
+
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+from unittest.mock import Mock
+
+from homeassistant.core import HomeAssistant
+
+from custom_components.sunenergyxt.history import (
+    HistoryStore,
+    decode_chunks,
+    encode_chunk,
+)
+
+START_MS = 1_700_000_000_000
+SAMPLES = [
+    (START_MS, {"GS": 400, "SC": 55, "LD": 123456}),
+    (START_MS + 3000, {"GS": -800, "SC": 54, "LD": 123400}),
+    (START_MS + 6000, {"GS": 0, "SC": 54, "LD": -(2**40)}),
+    (START_MS + 8999, {"GS": 800, "SC": 100, "LD": 2**40}),
+]
+
+
+def _columns(samples: list) -> tuple[list[int], dict[str, list[int]]]:
+    """Get the times and value columns of samples sharing the same keys."""
+    return (
+        [at for at, _ in samples],
+        {key: [values[key] for _, values in samples] for key in samples[0][1]},
+    )
+
+
+def test_round_trip() -> None:
+    """Test samples with positive and negative deltas decode unchanged."""
+    chunks = list(decode_chunks(encode_chunk(SAMPLES)))
+
+    assert chunks == [_columns(SAMPLES)]
+
+
+def test_damaged_chunks_skipped() -> None:
+    """Test a corrupted or truncated chunk only loses that chunk."""
+    first = encode_chunk(SAMPLES[:2])
+    second = bytearray(encode_chunk(SAMPLES[2:]))
+    second[-6] ^= 0xFF
+    third = encode_chunk(SAMPLES[1:3])
+
+    chunks = list(decode_chunks(first + bytes(second) + third + third[:-3]))
+
+    assert chunks == [_columns(SAMPLES[:2]), _columns(SAMPLES[1:3])]
+
+
+async def test_changing_keys(hass: HomeAssistant, tmp_path: Path) -> None:
+    """Test keys appearing and disappearing start new chunks and read back."""
+    store = HistoryStore(hass, Mock(), "SN123", str(tmp_path), 7)
+    now = datetime.now(UTC).replace(hour=12, minute=0, second=0, microsecond=0)
+    at = int(now.timestamp() * 1000)
+    samples = [
+        (at, {"GS": 100, "SC": 50}),
+        (at + 3000, {"GS": 110, "SC": 51}),
+        (at + 6000, {"GS": 120}),
+        (at + 9000, {"GS": 130, "SA": 90}),
+    ]
+
+    await hass.async_add_executor_job(store._write, samples)
+    result = await store.async_query(now, now + timedelta(seconds=10))
+
+    assert store.chunk_count == len({frozenset(values) for _, values in samples})
+    assert len(result["time"]) == len(samples)
+    assert result["values"] == {
+        "GS": [100, 110, 120, 130],
+        "SA": [None, None, None, 90],
+        "SC": [50, 51, None, None],
+    }
@@ -0,0 +1,75 @@
+"""Tests for the SunEnergyXT time-of-use dispatch optimiser."""
+
+import math
+
+import pytest
+
+from custom_components.sunenergyxt.optimizer import EFFICIENCY, plan_dispatch
+
+CAPACITY_WH = 2000
+GS_MIN = -1200
+GS_MAX = 800
+GS_FLOOR = 100
+LOAD = 400
+
+
+def _plan(
+    prices: list[float], soc: float, soc_min: float, soc_max: float, pv: float = 0
+) -> tuple[list[float], float]:
+    """Plan a day with a constant load and PV power."""
+    hours = len(prices)
+    return plan_dispatch(
+        prices,
+        [pv] * hours,
+        [LOAD] * hours,
+        CAPACITY_WH,
+        soc,
+        soc_min,
+        soc_max,
+        GS_MIN,
+        GS_MAX,
+        -GS_MIN,
+        GS_MAX,
+    )
+
+
+def test_plan_price_curve() -> None:
+    """Test the battery charges while cheap and discharges while expensive."""
+    prices = [0.1] * 4 + [0.5] * 4
+    setpoints, cost = _plan(prices, soc=10, soc_min=10, soc_max=100)
+
+    assert sum(setpoints[:4]) < 0
+    assert all(gs > 0 for gs in setpoints[4:])
+    idle_cost = sum(LOAD * price for price in prices) / 1000
+    assert cost < idle_cost
+
+
+def test_plan_soc_limits() -> None:
+    """Test the plan keeps the state of charge within SO and SA."""
+    setpoints, _ = _plan([0.1] * 4 + [0.5] * 4, soc=10, soc_min=10, soc_max=20)
+
+    charged_wh = -sum(gs for gs in setpoints if gs < 0) * EFFICIENCY
+    assert charged_wh == pytest.approx(CAPACITY_WH * 0.1)
+
+    setpoints, _ = _plan([0.1] * 4 + [0.5] * 4, soc=50, soc_min=50, soc_max=50, pv=300)
+    assert setpoints == [300] * 8
+
+
+def test_plan_infeasible() -> None:
+    """Test an infeasible plan has an infinite cost and setpoints in range."""
+    setpoints, cost = plan_dispatch(
+        [0.3] * 4,
+        [0] * 4,
+        [LOAD] * 4,
+        CAPACITY_WH,
+        50,
+        50,
+        50,
+        GS_FLOOR,
+        GS_MAX,
+        -GS_MIN,
+        GS_MAX,
+    )
+
+    assert math.isinf(cost)
+    assert all(GS_FLOOR <= gs <= GS_MAX for gs in setpoints)
@@ -0,0 +1,21 @@
+"""Tests for the SunEnergyXT settings profiles."""
+
+import pytest
+from homeassistant.exceptions import ServiceValidationError
+
+from custom_components.sunenergyxt.profiles import validate_settings
+
+
+def test_validate_settings() -> None:
+    """Test integral multiples of the step are accepted."""
+    assert validate_settings({"gs": "-390", "SA": 95.0}, None) == {
+        "GS": -390,
+        "SA": 95,
+    }
+
+
+@pytest.mark.parametrize("settings", [{"SA": 94.9}, {"GS": 395}, {"GS": 2410}])
+def test_validate_settings_rejected(settings: dict[str, float]) -> None:
+    """Test fractional, off-step and out of range values are rejected."""
+    with pytest.raises(ServiceValidationError):
+        validate_settings(settings, None)
@@ -0,0 +1,76 @@
+"""Tests for the SunEnergyXT desired-state reconciler."""
+
+import asyncio
+from typing import Any
+from unittest.mock import patch
+
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+
+from custom_components.sunenergyxt.coordinator import SunlitDataUpdateCoordinator
+from custom_components.sunenergyxt.reconciler import DesiredStateReconciler
+
+
+async def test_write_during_reconcile(hass: HomeAssistant) -> None:
+    """Test a write made while a reconciling write is in flight is recorded."""
+    coordinator = SunlitDataUpdateCoordinator(hass, "SN123", "192.0.2.1")
+    reconciler = DesiredStateReconciler(hass, coordinator, "entry")
+    started = asyncio.Event()
+    release = asyncio.Event()
+    written: list[dict[str, Any]] = []
+
+    async def write(values: dict[str, Any]) -> None:
+        written.append(values)
+        if len(written) == 1:
+            started.set()
+            await release.wait()
+
+    with (
+        patch(
+            "custom_components.sunenergyxt.reconciler.Store.async_load",
+            return_value={"GS": {"value": 100, "confirmed": True, "attempts": 0}},
+        ),
+        patch("custom_components.sunenergyxt.reconciler.Store.async_delay_save"),
+        patch.object(coordinator.client, "async_write", write),
+    ):
+        await reconciler.async_start()
+        reconciler._async_sample({"GS": 50}, dt_util.utcnow())
+        await started.wait()
+
+        await coordinator.async_write({"GS": 200})
+        release.set()
+        await hass.async_block_till_done()
+
+        assert written == [{"GS": 100}, {"GS": 200}]
+        desired = reconciler.get_diagnostics()["desired"]
+        assert desired["GS"] == {"value": 200, "confirmed": False, "attempts": 0}
+        assert reconciler.reconcile_count == 1
+
+        reconciler.async_stop()
+        await coordinator.async_shutdown()
+
+
+async def test_control_write_not_desired(hass: HomeAssistant) -> None:
+    """Test a control loop write drops the key instead of recording it."""
+    coordinator = SunlitDataUpdateCoordinator(hass, "SN123", "192.0.2.1")
+    reconciler = DesiredStateReconciler(hass, coordinator, "entry")
+
+    with (
+        patch(
+            "custom_components.sunenergyxt.reconciler.Store.async_load",
+            return_value={"GS": {"value": 100, "confirmed": True, "attempts": 0}},
+        ),
+        patch(
+            "custom_components.sunenergyxt.reconciler.Store.async_delay_save"
+        ) as save,
+        patch.object(coordinator.client, "async_write"),
+    ):
+        await reconciler.async_start()
+        await coordinator.async_write({"GS": 150}, control=True)
+        await coordinator.async_write({"GS": 160}, control=True)
+
+        assert reconciler.get_diagnostics()["desired"] == {}
+        assert save.call_count == 1
+
+        reconciler.async_stop()
+        await coordinator.async_shutdown()